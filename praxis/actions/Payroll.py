@@ -7,11 +7,14 @@
 
 
 # externals
-import csv
+import bisect
+import concurrent.futures
 import datetime
+import io
 import itertools
 import re
 import operator
+import os
 # get the package
 import praxis
 
@@ -51,6 +54,25 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
     log = praxis.properties.istream(default="mispunch.csv")
     log.doc = 'the file with the mispunch log entries'
 
+    cache = praxis.properties.str(default=None)
+    cache.doc = 'the folder with the cache of parsed timecards; leave blank to disable caching'
+
+    jobs = praxis.properties.int(default=1)
+    jobs.doc = 'the number of processes to use when parsing timecards or building reports'
+
+    store = praxis.properties.str(default=None)
+    store.doc = 'the file with the columnar punch store; leave blank to read the timecards'
+
+    archive = praxis.properties.str(default=None)
+    archive.doc = 'the file with the binary punch archive to export to or restore from'
+
+    split = praxis.properties.bool(default=False)
+    split.doc = 'generate a separate punch clock detail document for each employee'
+
+
+    # private data
+    mapped = None # the columnar punch store, once mapped
+
 
     # behaviors
     @praxis.export(tip='classify the hours worked in a given pay period')
@@ -77,13 +99,15 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
         # initialize the event piles
         errors = [] # parsing errors
         warnings = [] # parsing warnings
-        # make a punch parser
-        parser = praxis.vendors.ecrs.reports.punches()
-        # open the timecards
-        with node.open() as stream:
-            # parse the input stream
-            parser.parse(stream=stream, names=employees, punches=punches,
-                         warnings=warnings, errors=errors)
+        # get the cache of parsed timecards
+        cache = self.timecardCache()
+        # load the timecards
+        self.readTimecard(node=node, cache=cache, names=employees, punches=punches,
+                          warnings=warnings, errors=errors)
+        # if we used the cache
+        if cache is not None:
+            # show me how it did
+            plexus.info.log('timecard cache: {0.hits} hits, {0.misses} misses'.format(cache))
         # if there were any errors
         if errors:
             # check in
@@ -145,27 +169,12 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
             # get the punches
             timecard = punches[eid]
 
-            # classify the hours worked
-            hours = self.jurisdiction.overtime(start=start, workweeks=2, timecard=timecard)
-            # tally them
-            rawRegular, rawSesqui, rawDouble = map(sum, zip(*hours))
-
-            # repeat the calculation with the new streaming method used by the attendance
-            # detail generator
-            new = self.jurisdiction.overtime2(start=start, workweeks=2, timecard=timecard)
-            # tally them; this looks different from the reduction above because {overtime2}
-            # injects the work day in the stream as well, so we have to peel that off
-            newRegular, newSesqui, newDouble = map(sum, zip(*(r[1] for r in new)))
-
-            # compare the two to make sure we have no bugs
-            assert (rawRegular - newRegular) < 1/3600
-            assert (rawSesqui - newSesqui) < 1/3600
-            assert (rawDouble - newDouble) < 1/3600
-
-            # repeat while enforcing the legally mandated breaks
-            breaks = self.jurisdiction.breaks(start=start, workweeks=2, timecard=timecard)
+            # classify the hours worked, both as recorded and while enforcing the legally
+            # mandated breaks, in a single pass through the timecard
+            weeks = tuple(self.jurisdiction.timesheet(start=start, workweeks=2, timecard=timecard))
             # tally them
-            brkRegular, brkSesqui, brkDouble = map(sum, zip(*breaks))
+            rawRegular, rawSesqui, rawDouble = map(sum, zip(*(raw for raw, _, _ in weeks)))
+            brkRegular, brkSesqui, brkDouble = map(sum, zip(*(brk for _, brk, _ in weeks)))
 
             # compute the discrepancy to get a feel for the cost of missing breaks
             dRegular  = rawRegular - brkRegular
@@ -224,17 +233,12 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
         plexus.info.log('parsing clock punches from {!r}'.format(str(node.uri)))
         plexus.info.log('placing filtered output in {!r}'.format(ofile))
 
-        # create the output stream
-        ostream = open(ofile, mode="w")
-        # make a writer
-        writer = csv.writer(ostream)
-
         # make a punch parser
         parser = praxis.vendors.ecrs.reports.punches()
         # open the timecards
         with node.open() as stream:
             # clean up the input stream and save it
-            writer.writerows(parser.filter(stream=stream))
+            praxis.support.output.csv(uri=ofile, rows=parser.filter(stream=stream))
 
         # all done
         return 0
@@ -245,85 +249,29 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
         """
         Compute the impact of missing/short half hour breaks
         """
-        # units
-        day = datetime.timedelta(1)
-        # get the jurisdiction
-        js = self.jurisdiction
-        # get the time data
-        dataset = self.punches(plexus=plexus, latest=True)
-        # go through the time cards
-        for eid, (last, first), punches in dataset:
-            # initialize the instance count
-            instances = 0
-            # assemble the name of the output file
-            outfile = ''.join(''.join((last, first)).split()) + '-pay.csv'
-            # open it
-            writer = csv.writer(open(outfile, 'w'))
-            # leave behind the employee name
-            writer.writerow(("Employee:", last, first))
-
-            # write my headers
-            writer.writerow(("Pay Period", "", "Raw", "", "Breaks", "", "Difference", ""))
-            writer.writerow(("Start", "End",
-                             "Regular", "Overtime", "Regular", "Overtime", "Regular", "Overtime"))
-
-            # my accumulators
-            rawRegular, rawSesqui, rawDouble = 0,0,0
-            brkRegular, brkSesqui, brkDouble = 0,0,0
-            # and for each available time card
-            for payday in sorted(punches, reverse=True):
-                # get the tasks
-                tasks = punches[payday]
-                # compute the start of the pay period
-                start = payday - 13*day
-                # initialize the row
-                record = [start,payday]
-                # compute the raw hours worked this date
-                raw = js.overtime(start=start, workweeks=2, timecard=tasks)
-                # sum up
-                regularR, sesquiR, doubleR = map(sum, zip(*raw))
-                # save in the current row
-                record += ["{:.2f}".format(regularR), "{:.2f}".format(sesquiR)]
-                # and update the raw accumulators
-                rawRegular += regularR
-                rawSesqui += sesquiR
-                rawDouble += doubleR
-
-                # repeat for hours adjusted for the missing breaks
-                breaks = js.breaks(start=start, workweeks=2, timecard=tasks)
-                # sum up
-                regularB, sesquiB, doubleB = map(sum, zip(*breaks))
-                # save in the current row
-                record += ["{:.2f}".format(regularB), "{:.2f}".format(sesquiB)]
-                # and update the raw accumulators
-                brkRegular += regularB
-                brkSesqui += sesquiB
-                brkDouble += doubleB
-
-                # compute the deltas
-                regularD = regularR - regularB
-                sesquiD = sesquiR - sesquiB
-                doubleD = doubleR - doubleB
-
-                # save the difference
-                record += ["{:.2f}".format(regularD), "{:.2f}".format(sesquiD)]
-
-                # update the instance count
-                if regularD > 0.1 or sesquiD > 0.1: instances += 1
-
-                # and record
-                writer.writerow(record)
-
-            # show me
-            print(
-                "{name:25}: {instances:3d}: {reg:6.2f} {ovr:6.2f} {dbl:6.2f}".format(
-                    name = '{}, {}'.format(last, first),
-                    instances = instances,
-                    reg = rawRegular - brkRegular,
-                    ovr = rawSesqui - brkSesqui,
-                    dbl = rawDouble - brkDouble))
+        # attempt to
+        try:
+            # the files are written in the background
+            with praxis.support.spool(workers=self.WRITERS) as spool:
+                # go through the reports of the selected employees, in order
+                for eid, (last, first), outfile, rows, summary in self.fanout(
+                        plexus=plexus, report='breaks', latest=True):
+                    # hand the file off to the writers
+                    spool.csv(uri=outfile, rows=rows)
+                    # unpack the summary
+                    instances, reg, ovr, dbl = summary
+                    # show me
+                    print(
+                        "{name:25}: {instances:3d}: {reg:6.2f} {ovr:6.2f} {dbl:6.2f}".format(
+                            name = '{}, {}'.format(last, first),
+                            instances = instances, reg = reg, ovr = ovr, dbl = dbl))
 
-        return 0
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
 
 
     @praxis.export(tip='collect the clock punches of select employees')
@@ -331,411 +279,510 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
         """
         Collect all the clock punches of select employees in separate files
         """
-        # get the data set
-        dataset = self.punches(plexus=plexus, latest=False)
-        # get the selected employees and their timecards
-        for eid, (last, first), punches in dataset:
-            # assemble the name of the output file
-            name = ''.join(''.join((last, first)).split()) + '-time.csv'
-            # make a CSV writer
-            writer = csv.writer(open(name, 'w'))
-            # leave behind the employee name in the first row
-            writer.writerow((last, first))
-
-            # focus on the paydays that are relevant for this employee
-            for payday in sorted(punches, reverse=True):
-                # get the days worked during this pay period
-                entries = punches[payday]
-                # and go through them in order
-                for date in sorted(entries, reverse=True):
-                    # go through each task
-                    for task in entries[date]:
-                        # compute the difference and convert into hours
-                        delta = (task.finish - task.start).total_seconds() / 3600
-                        # write a line in the file
-                        writer.writerow((date, task.start, task.finish, "{:.2f}".format(delta)))
+        # attempt to
+        try:
+            # the files are written in the background
+            with praxis.support.spool(workers=self.WRITERS) as spool:
+                # go through the reports of the selected employees, in order
+                for eid, name, outfile, rows, _ in self.fanout(
+                        plexus=plexus, report='record', latest=False):
+                    # hand the file off to the writers
+                    spool.csv(uri=outfile, rows=rows)
+
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
+
 
+    @praxis.export(tip='build the columnar punch store out of the timecard archive')
+    def index(self, plexus, **kwds):
+        """
+        Parse the timecards in the range specified by the user and save them in the columnar
+        punch store
+        """
+        # if there is no store
+        if not self.store:
+            # complain
+            raise plexus.error.log('please specify the location of the punch store')
+        # get the data set; always from the timecards
+        dataset = self.punches(plexus=plexus, latest=False)
+        # build the store
+        store = praxis.vendors.ecrs.archive.store.build(dataset=dataset)
+        # save it
+        store.save(uri=self.store)
+        # show me
+        plexus.info.log('{!r}: {} punches of {} employees'.format(
+            self.store, store.rows, len(store.people)))
         # all done
         return 0
 
 
-    @praxis.export(tip='generate a document with punch clock detail for a given pay period')
-    def detail(self, plexus, **kwds):
+    @praxis.export(tip='merge newly arrived timecards into the columnar punch store')
+    def ingest(self, plexus, **kwds):
         """
-        Generate a LaTeX document with the punch clock details for a given pay period
+        Parse the timecards that arrived since the last ingestion and merge them into the
+        columnar punch store
         """
-        # grab the folder with my data store; it's guaranteed to be there by the application
-        # boot process
-        etc = plexus.pfs["etc"]
-        # grab the level below
-        etc.discover(levels=1)
-        # get the folder with the timecards
-        tex = etc["tex"].discover()
-        # get the include and graphics folders
-        include = str(tex["include"].uri)
-        graphics = str(tex["graphics"].uri)
-
-        # get the timecards
+        # if there is no store
+        if not self.store:
+            # complain
+            raise plexus.error.log('please specify the location of the punch store')
+        # access the archive support
+        archive = praxis.vendors.ecrs.archive
+        # get the available timecards
         timecards = self.timecards(plexus=plexus)
-        # resolve the time period
-        paystart, payend = self.resolveInterval(plexus=plexus, timecards=timecards, latest=True)
-        # get the time card dataset
-        dataset = self.punches(plexus=plexus, timecards=timecards, latest=True)
-
-        # create the file
-        doc = open("{:%Y%m%d}-detail.tex".format(payend), "w")
-
-        # the preamble
-        preamble = [
-            "% -*- LaTeX -*-",
-            "% -*- coding: utf-8 -*-",
-            "%",
-            "% michael a.g. aïvázis",
-            "% urban radish",
-            "% (c) 1998-2019 all rights reserved",
-            "%",
-            "% adjust the include path",
-            "\makeatletter",
-            "\providecommand*{\input@path}{}",
-            "\edef\input@path{{{{{include}/}}\input@path}}".format(include=include),
-            "\makeatother",
-            "",
-            "% document support",
-            "\\documentclass{praxis}",
-            "",
-            "% adjust the graphics path",
-            "\graphicspath{{{{{graphics}/}}}}".format(graphics=graphics),
-            "",
-            "% setup",
-            "\\meta{",
-              "% pay period",
-              "payperiodStart = {{{:%B %d, %Y}}},".format(paystart),
-              "payperiodEnd = {{{:%B %d, %Y}}},".format(payend),
-              "}",
-            "",
-            "% the document",
-            "\\begin{document}",
-            "",
-            "% the table of contents",
-            "\\tableofcontents\\newpage",
-            "",
-        ]
-        print('\n'.join(preamble), file=doc)
+        # index them by file name
+        nodes = { str(node.uri): (payday, node) for payday, node in timecards }
+        # the watermark lives next to the store
+        mark = self.store + self.WATERMARK
+        # load it
+        watermark = archive.watermark.load(uri=mark)
+        # identify the timecards that have not been ingested yet
+        pending = tuple(watermark.pending(
+            timecards=((payday, str(node.uri)) for payday, node in timecards)))
+        # if there aren't any
+        if not pending:
+            # show me
+            plexus.info.log('{!r}: up to date as of {}'.format(self.store, watermark.payday))
+            # and bail
+            return 0
 
-        # for each employee
-        for eid, (last, first), punches in dataset:
-            # the attendance header
-            header = [
-                "",
-                "% attendance for {first} {last}".format(first=first, last=last),
-                "\\begin{{attendance}}{{{first} {last}}}".format(first=first, last=last),
-                ]
-            # inject it
-            print('\n'.join(header), file=doc)
+        # build the employee index
+        employees = {}
+        # and the punch data
+        index = praxis.patterns.vivify(levels=1, atom=dict)
+        # initialize the event piles
+        warnings, errors = [], []
+        # go through the contents of the new timecards
+        for payday, punches in self.loadTimecards(
+                plexus=plexus, timecards=[ nodes[uri] for _, uri, _ in pending ],
+                names=employees, warnings=warnings, errors=errors):
+            # transfer the data for each employee
+            for eid in punches:
+                # by injecting the pay period between the employee and the punches
+                index[eid][payday] = punches[eid]
+        # report the parsing events
+        self.reportEvents(plexus=plexus, warnings=warnings, errors=errors)
+
+        # package the new punches
+        fresh = archive.store.build(
+            dataset=((eid, employees[eid], index[eid]) for eid in index))
+        # if there is a store already
+        if os.path.exists(self.store):
+            # map it
+            current = archive.store.load(uri=self.store)
+            # merge the new punches, replacing any pay periods that were exported again
+            store = current.merge(other=fresh, paydays=[ payday for payday, _, _ in pending ])
+            # done with the old store
+            current.close()
+        # otherwise
+        else:
+            # the new punches are all there is
+            store = fresh
+        # save the store
+        store.save(uri=self.store)
+        # and only then, move the watermark
+        watermark.advance(ingested=pending)
+        watermark.save(uri=mark)
 
-            # get the punches
-            timecard = punches[payend]
-            # prime the streaming overtime calculator
-            overtime = self.jurisdiction.overtime2(start=paystart, workweeks=2, timecard=timecard)
-            # initialize the counter of work days
-            workdays = 0
-            # go through them
-            for date, (reg, ovr, dbl) in overtime:
-                # increment the workday counter
-                workdays += 1
-                # get the tasks
-                tasks = timecard[date]
-                # build date args
-                datearg = "{{{0.day}}}{{{0.month}}}{{{0.year}}}".format(date)
-                # initialize the content
-                line = []
-
-                # colorize even rows
-                if workdays % 2 == 0:
-                    line += [
-                        "% colorize",
-                        "\\rowcolor[gray]{.95}",
-                        ]
-
-                # colorize dates where we cannot show the full in/out detail because there are
-                # too many punches
-                marker = '\\color{praxis@multi}' if len(tasks) > 2 else ''
-
-                # prime the line
-                line += [
-                    "  % punches",
-                    "  \\simpledate\\formatdate{} &".format(datearg),
-                    "  {{{}\\shortdayofweekname{}}} &".format(marker, datearg),
-                ]
+        # show me
+        plexus.info.log('{!r}: ingested {} timecard{}, {} punches; up to date as of {}'.format(
+            self.store, len(pending), '' if len(pending) == 1 else 's', fresh.rows,
+            watermark.payday))
+        # all done
+        return 0
 
-                # if there are no tasks
-                if not tasks:
-                    # wrap up this day
-                    line += [
-                        " & & & & & & \\\\" + ("\\midrule " if workdays % 7 == 0 else "")
-                    ]
-                    # inject
-                    print('\n'.join(line), file=doc)
-                    # and move on
-                    continue
-
-                # if there are two tasks
-                if len(tasks) == 2:
-                    # unpack
-                    ein = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].start)
-                    lin = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].finish)
-                    lout = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[1].start)
-                    eout = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[1].finish)
-
-                    # adjust
-                    line += [
-                        "  \\formattime{} &".format(ein),
-                        "  \\formattime{} &".format(lin),
-                        "  \\formattime{} &".format(lout),
-                        "  \\formattime{} &".format(eout),
-                        ]
-                # if there is only one task
-                elif len(tasks) == 1:
-                    # unpack
-                    ein = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].start)
-                    eout = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].finish)
-
-                    # adjust
-                    line += [
-                        "  \\formattime{} &".format(ein),
-                        "  &",
-                        "  &",
-                        "  \\formattime{} &".format(eout),
-                        ]
-                # if there are more than 2
-                elif len(tasks) > 2:
-                    # report an error
-                    plexus.warning.log(
-                        "{1} {2} has more than two tasks on {0}".format(date, first, last))
-                    # unpack the first and the last
-                    ein = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].start)
-                    lin = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[0].finish)
-                    lout = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[-1].start)
-                    eout = "{{{0.hour}}}{{{0.minute}}}{{{0.second}}}".format(tasks[-1].finish)
-                    # adjust
-                    line += [
-                        "  \\formattime{} &".format(ein),
-                        "  \\formattime{} &".format(lin),
-                        "  \\formattime{} &".format(lout),
-                        "  \\formattime{} &".format(eout),
-                        ]
-
-                # format the hours
-                reg = "{:.2f}".format(reg) if reg else ''
-                ovr = "{:.2f}".format(ovr) if ovr else ''
-                dbl = "{:.2f}".format(dbl) if dbl else ''
-                # render the hour classifications
-                line += [
-                    "{} & {} & {}".format(reg, ovr, dbl)
-                    ]
-
-                # wrap up this day
-                line += [
-                    "\\\\" + ("\\midrule " if workdays % 7 == 0 else "")
-                    ]
-                # inject
-                print('\n'.join(line), file=doc)
-
-            # classify the hours worked
-            hours = self.jurisdiction.overtime(start=paystart, workweeks=2, timecard=timecard)
-            # and add them up
-            reg, ovr, dbl = map(sum, zip(*hours))
-            # format them
-            reg = "{:.2f}".format(reg) if reg else ""
-            ovr = "{:.2f}".format(ovr) if ovr else ""
-            dbl = "{:.2f}".format(dbl) if dbl else ""
-
-            # create the summary
-            summary = [
-                "\\multicolumn{5}{c}{} & ",
-                "\\bfseries{{Total}}: & {} & {} & {}".format(reg, ovr, dbl)
-                ]
-            # inject it
-            print('\n'.join(summary), file=doc)
 
-            # the attendance footer
-            footer = [
-                "\\end{attendance}",
-                "",
-                ]
-            # inject it
-            print('\n'.join(footer), file=doc)
+    @praxis.export(tip='load clock punches into the database')
+    def load(self, plexus, **kwds):
+        """
+        Save the clock punches in the range specified by the user in the punch table; they
+        replace any punches in the range that were loaded before, or just those of the selected
+        employees if the user filtered them by name
+        """
+        # attempt to
+        try:
+            # units
+            day = datetime.timedelta(1)
+            # get the time cards
+            timecards = self.catalog(plexus=plexus)
+            # resolve the time period
+            start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=False)
+            # the relevant paydays are the ones {selectRange} would pick
+            first, last = start, end + 13*day
+            # get the data set
+            dataset = self.dataset(plexus=plexus, timecards=timecards, latest=False)
+
+            # get the punch table
+            punch = plexus.schema.hr.punch
+            # and the record factory
+            factory = punch.pyre_immutable
+            # get the server
+            server = plexus.datastore.server
+            # the condition that selects the punches in the range; the dates are rendered as
+            # strings, so they get quoted
+            period = (punch.payday >= first.isoformat()) & (punch.payday <= last.isoformat())
+            # if the user is not filtering by name, the range is replaced wholesale, so that the
+            # employees who were dropped from a timecard lose their punches as well; otherwise,
+            # only the punches of the selected employees are replaced
+            selective = self.nameFilter()
+
+            # initialize the counters
+            employees = 0
+            punches = 0
+            # the pending records
+            batch = []
+            # everything happens in a single transaction, so that a failure leaves the table
+            # untouched
+            server.execute('BEGIN')
+            # attempt to
+            try:
+                # if we are replacing the whole range
+                if not selective:
+                    # remove the punches that were loaded before
+                    server.delete(table=punch, condition=period)
+                # go through the employees
+                for eid, _, timecards in dataset:
+                    # if we are replacing one employee at a time
+                    if selective:
+                        # remove the punches of this one that were loaded before
+                        server.delete(table=punch, condition=(punch.employee == eid) & period)
+                    # go through the timecards
+                    for payday, dates in timecards.items():
+                        # the days
+                        for tasks in dates.values():
+                            # and the tasks
+                            for task in tasks:
+                                # build a record
+                                batch.append(factory(employee=eid, payday=payday,
+                                                     clockin=task.clockin,
+                                                     clockout=task.clockout,
+                                                     kind=task.name))
+                                # if the batch is full
+                                if len(batch) >= self.BATCH:
+                                    # save it
+                                    server.insert(*batch)
+                                    # update the counter
+                                    punches += len(batch)
+                                    # and start a new one
+                                    batch = []
+                    # update the counter
+                    employees += 1
+                # if there are any leftovers
+                if batch:
+                    # save them
+                    server.insert(*batch)
+                    # and update the counter
+                    punches += len(batch)
+            # if anything goes wrong
+            except BaseException:
+                # undo
+                server.execute('ROLLBACK')
+                # and complain
+                raise
+            # if all went well, make it stick
+            server.execute('COMMIT')
 
+            # show me
+            plexus.info.log('loaded {} punches of {} employees, paydays {} to {}'.format(
+                punches, employees, first, last))
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
 
-        # wrap up
-        postamble = [
-            "% all done",
-            "\\end {document}",
-            "",
-            "% end of file",
-            ]
-        print('\n'.join(postamble), file=doc)
 
+    @praxis.export(tip='save clock punches in a binary punch archive')
+    def export(self, plexus, **kwds):
+        """
+        Save the clock punches in the range specified by the user in a binary punch archive
+        """
+        # attempt to
+        try:
+            # if there is no archive
+            if not self.archive:
+                # complain
+                raise plexus.error.log('please specify the location of the punch archive')
+            # get the data set, from the punch store if there is one
+            dataset = self.dataset(plexus=plexus, latest=False)
+            # collect it
+            store = praxis.vendors.ecrs.archive.store.build(dataset=dataset)
+            # and save it
+            praxis.vendors.ecrs.archive.archive.save(uri=self.archive, store=store)
+            # show me
+            plexus.info.log('{!r}: {} punches of {} employees'.format(
+                self.archive, store.rows, len(store.people)))
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
+
+
+    @praxis.export(tip='rebuild the columnar punch store from a binary punch archive')
+    def restore(self, plexus, **kwds):
+        """
+        Load a binary punch archive and save its contents in the columnar punch store
+        """
+        # if there is no archive
+        if not self.archive:
+            # complain
+            raise plexus.error.log('please specify the location of the punch archive')
+        # if there is no store
+        if not self.store:
+            # complain
+            raise plexus.error.log('please specify the location of the punch store')
+        # map the archive
+        archive = praxis.vendors.ecrs.archive.archive.load(uri=self.archive)
+        # convert it
+        store = archive.restore()
+        # done with the archive
+        archive.close()
+        # save the store
+        store.save(uri=self.store)
+        # show me
+        plexus.info.log('{!r}: {} punches of {} employees'.format(
+            self.store, store.rows, len(store.people)))
         # all done
         return 0
 
 
+    @praxis.export(tip='generate a document with punch clock detail for a range of pay periods')
+    def detail(self, plexus, **kwds):
+        """
+        Generate a LaTeX document with the punch clock details for the latest pay period, or
+        the pay periods in the range specified by the user; with {split}, each employee gets a
+        document of their own
+        """
+        # attempt to
+        try:
+            # grab the folder with my data store; it's guaranteed to be there by the application
+            # boot process
+            etc = plexus.pfs["etc"]
+            # grab the level below
+            etc.discover(levels=1)
+            # get the folder with the timecards
+            tex = etc["tex"].discover()
+            # get the include and graphics folders
+            include = str(tex["include"].uri)
+            graphics = str(tex["graphics"].uri)
+
+            # get the timecards
+            timecards = self.catalog(plexus=plexus)
+            # unless the user specified a range, render the latest pay period
+            latest = self.start is None and self.end is None
+            # resolve the time period
+            start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=latest)
+            # render the attendance tables of the selected employees
+            tables = self.fanout(
+                plexus=plexus, report='packet' if self.split else 'attendance',
+                timecards=timecards, latest=latest,
+                factory=praxis.vendors.ecrs.reports.detail, include=include, graphics=graphics)
+
+            # if the user wants a document per employee
+            if self.split:
+                # the files are written in the background
+                with praxis.support.spool(workers=self.WRITERS) as spool:
+                    # go through the documents
+                    for eid, (last, first), outfile, document, crowded in tables:
+                        # complain about the days with too many punches
+                        self.crowded(plexus=plexus, first=first, last=last, dates=crowded)
+                        # and hand the document off to the writers
+                        spool.text(uri=outfile, text=document)
+                # all done
+                return 0
+
+            # otherwise, build the document in memory
+            doc = io.StringIO()
+            # make a renderer for the preamble and postamble
+            renderer = praxis.vendors.ecrs.reports.detail(
+                jurisdiction=self.jurisdiction, start=start, end=end,
+                include=include, graphics=graphics)
+            # the attendance tables
+            attendance = []
+            # go through them
+            for eid, (last, first), _, table, crowded in tables:
+                # complain about the days with too many punches
+                self.crowded(plexus=plexus, first=first, last=last, dates=crowded)
+                # and add it to the pile
+                attendance.append(table)
+            # assemble the document
+            renderer.document(stream=doc, attendance=attendance)
+            # and save it
+            praxis.support.output.text(uri="{:%Y%m%d}-detail.tex".format(end), text=doc.getvalue())
+
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
+
+
     @praxis.export(tip='perform an EDD benefits audit')
     def edd(self, plexus, **kwds):
         """
         Perform an EDD benefits audit for the named employee
         """
-        # units
-        day = datetime.timedelta(1)
-        # get the time cards
-        timecards = self.timecards(plexus=plexus)
-        # resolve the time period
-        start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=False)
-        # get the data set
-        dataset = self.punches(plexus=plexus, timecards=timecards, latest=False)
-        # figure out how many overtime tiers in this jurisdiction, hence the size of the tuple
-        # returned by the overtime calculator
-        tiers = self.jurisdiction.overtimeTiers
-        # build a zero-hour tuple for the missing days
-        zero = (0,)*len(tiers)
-
-        # check that we were given correct EDD weeks
-        assert end > start
-        assert start.weekday() == 6
-        assert end.weekday() == 5
-
-        # go through the requested employees
-        for eid, (last, first), punches in dataset:
-            # show me
-            plexus.info.log('employee: {first} {last}'.format(first=first, last=last))
-            plexus.info.log('date range: {start} to {end}'.format(start=start, end=end))
-
-            # initialize the record
-            attendance = {}
-
-            # go through the timecards
-            for payday in sorted(punches):
-                # back up to the first day of the period
-                paystart = payday - 13*day
-                # prime the hour classifier
-                worked = self.jurisdiction.overtime2(start=paystart,
-                                                   workweeks=2,
-                                                   timecard=punches[payday])
-                # go through the record
-                for date, (reg, ovr, dbl) in worked:
-                    # and save it
-                    attendance[date] = (reg, ovr, dbl)
-            # the headers for the CSV file
-            headers = [
-                "week start", "week end",
-                "reg", "ovr", "dbl", "effective",
-                "pay rate", "gross"
-            ]
-            # initialize the audit record for this employee
-            audit = [headers]
-            # go through the period of interest
-            while start < end:
-                # mark the beginning of the week
-                wkstart = start
-                # and the end
-                wkend = start + 6*day
-                # accumulate the hours worked this week
-                worked = (attendance.get(start+dt*day, zero) for dt in range(7))
-                # add them up
-                total = tuple(map(sum, zip(*worked)))
-                # project onto the overtime tiers to get the total effective hours worked
-                effective = sum(hours*tier for hours, tier in zip(total, tiers))
-                # build a record
-                record = (
-                    (wkstart, wkend)
-                    + tuple('{:.2f}'.format(category) for category in total)
-                    + ('{:.2f}'.format(effective),)
-                    )
-                # and add it to the audit
-                audit.append(record)
-                # move on to the next week in range
-                start += 7*day
-
-            # smoosh the name of the employee
-            name = '{}{}'.format(''.join(first.split()), ''.join(last.split()))
-            # make a csv writer
-            out = csv.writer(open(name + '-edd.csv', 'w'))
-            # dump the record
-            out.writerows(audit)
+        # attempt to
+        try:
+            # get the time cards
+            timecards = self.catalog(plexus=plexus)
+            # resolve the time period
+            start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=False)
+
+            # check that we were given correct EDD weeks
+            assert end > start
+            assert start.weekday() == 6
+            assert end.weekday() == 5
+
+            # the files are written in the background
+            with praxis.support.spool(workers=self.WRITERS) as spool:
+                # go through the audits of the requested employees, in order
+                for eid, (last, first), outfile, audit, _ in self.fanout(
+                        plexus=plexus, report='edd', timecards=timecards, latest=False):
+                    # show me
+                    plexus.info.log('employee: {first} {last}'.format(first=first, last=last))
+                    plexus.info.log('date range: {start} to {end}'.format(start=start, end=end))
+                    # hand the record off to the writers
+                    spool.csv(uri=outfile, rows=audit)
 
-        # all done
-        return 0
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            self.releaseStore()
 
 
     @praxis.export(tip='merge information from the mispunch log')
     def mispunch(self, plexus, **kwds):
         """
         Load data from a mispunch log and merge it with the existing clock punches
+
+        With no {start} or {end}, only the pay period of {payday} is corrected; otherwise, the
+        corrections are merged into every timecard in the range, reading the log only once
         """
         # make a channel
         channel = plexus.info
-        # find the data set for the requested pay period
-        payday, node = self.selectPayday(plexus=plexus)
-        # check
-        if node is None:
-            # we were unable to locate a matching pay date
-            plexus.error.log("unable to locate time cards for payday {.payday}".format(self))
-            # all done
-            return 1
+        # units
+        day = datetime.timedelta(1)
+        # if the user did not specify a range
+        if self.start is None and self.end is None:
+            # find the data set for the requested pay period
+            payday, node = self.selectPayday(plexus=plexus)
+            # check
+            if node is None:
+                # we were unable to locate a matching pay date
+                plexus.error.log("unable to locate time cards for payday {.payday}".format(self))
+                # all done
+                return 1
+            # this is the only timecard to correct
+            timecards = [ (payday, node) ]
+        # otherwise
+        else:
+            # collect all the timecards in range
+            timecards = list(self.selectRange(
+                plexus=plexus, timecards=self.timecards(plexus=plexus), latest=False))
+            # if there aren't any
+            if not timecards:
+                # complain
+                plexus.error.log("unable to locate time cards between {0.start} and {0.end}"
+                                 .format(self))
+                # all done
+                return 1
+
+        # read the log and sort the corrections by pay period
+        buckets = self.mispunches(plexus=plexus, paydays=[ payday for payday, _ in timecards ])
+        # the corrected timecards go in the current directory, with the same name as the originals
+        work = [
+            (str(node.uri), buckets[payday], node.uri.name) for payday, node in timecards ]
+        # get the reconciler
+        reconcile = praxis.vendors.ecrs.reports.reconciler.reconcile
+
+        # if the user asked for parallel processing and there is more than one timecard
+        if self.jobs > 1 and len(work) > 1:
+            # make a pool
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                # the results come back in the order they were submitted, so the report below
+                # is the same as the one from a serial run
+                outcomes = list(pool.map(reconcile, *zip(*work)))
+        # otherwise
+        else:
+            # do them one at a time
+            outcomes = [ reconcile(*spec) for spec in work ]
 
-        # build the employee index
-        employees = {}
-        # build the punch table
-        punches = praxis.patterns.vivify(levels=2, atom=praxis.vendors.ecrs.model.punchlist)
-        # initialize the event piles
-        errors = [] # parsing errors
-        warnings = [] # parsing warnings
-        # make a punch parser
-        parser = praxis.vendors.ecrs.reports.punches()
-        # open the timecards
-        with node.open() as stream:
-            # parse the input stream
-            parser.parse(stream=stream, names=employees, punches=punches,
-                         warnings=warnings, errors=errors)
-        # if there were any errors
-        if errors:
-            # check in
-            plexus.error.line('while parsing the clock punches:')
-            # go through them
-            for error in errors:
-                # and print them out
-                plexus.error.line(str(error))
-            # get the count
-            count = len(errors)
-            # flush
-            plexus.error.log('{} error{} total'.format(count, '' if count == 1 else 's'))
+        # the overall status
+        status = 0
+        # go through the outcomes
+        for (payday, node), outcome in zip(timecards, outcomes):
+            # show me
+            channel.log(f"payday: {payday}")
+            channel.log(f"first day: {payday - 13*day}")
+            # report the parsing events
+            errors, warnings = outcome.parsing
+            self.reportEvents(plexus=plexus, warnings=warnings, errors=errors)
+            # get the names
+            names = outcome.names
+            # go through the changes
+            for change in outcome.changes:
+                # get the name
+                last, first = names[change[0]]
+                # and show me
+                channel.line(f"{first} {last}: {outcome.render(change)}")
+            # if there were any
+            if outcome.changes:
+                # flush
+                channel.log()
+            # if there were corrections we couldn't apply cleanly
+            for eid, date, description in outcome.warnings:
+                # get the name
+                last, first = names[eid]
+                # and complain
+                plexus.warning.log(f"{first} {last} on {date}: {description}")
+            # if the corrections left tasks that overlap
+            for eid, one, two in outcome.conflicts:
+                # get the name
+                last, first = names[eid]
+                # and complain
+                plexus.warning.log(
+                    f"{first} {last}: overlapping tasks "
+                    f"{outcome.stamp(one[1])} - {outcome.stamp(one[2])} and "
+                    f"{outcome.stamp(two[1])} - {outcome.stamp(two[2])}")
+            # if there were corrections for people we couldn't identify
+            for first, last in outcome.missing:
+                # complain
+                plexus.error.log(f"no employee id for {first} {last}")
+            # if the timecard was not saved
+            if not outcome.saved:
+                # say so
+                plexus.error.log(f"{node.uri.name}: not saved")
+                # and mark the failure
+                status = 1
 
-        # if there were any warnings
-        if warnings:
-            # check in
-            plexus.warning.line('while parsing the clock punches:')
-            # go through them
-            for warning in warnings:
-                # and print them out
-                plexus.warning.line(str(warning))
-            # get the count
-            count = len(warnings)
-            # flush
-            plexus.warning.log('{} warning{} total'.format(count, '' if count == 1 else 's'))
+        # all done
+        return status
 
-        # invert the employee index
-        names = { (last, first): eid for eid, (last, first) in employees.items() }
 
+    # implementation details
+    def mispunches(self, plexus, paydays):
+        """
+        Read the mispunch log and sort the corrections that have not been processed yet into the
+        pay periods that end on {paydays}; returns a map from the paydays to their corrections,
+        as (employee id, first, last, date, start, lunch out, lunch in, end) tuples
+        """
         # units
         day = datetime.timedelta(1)
-        # find the beginning of this payperiod
-        earliest = payday - 13*day
-        # show me
-        channel.log(f"payday: {payday}")
-        channel.log(f"first day: {earliest}")
-
-        # get task factory
-        newTask = praxis.vendors.ecrs.model.task
+        # sort the paydays, so we can bisect them
+        paydays = sorted(paydays)
+        # make a pile for each one
+        buckets = { payday: [] for payday in paydays }
 
         # make a mispunch parser
         mispunch = praxis.ingest.mispunch()
@@ -752,171 +799,24 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
             # if it's not known
             if not date:
                 # skip this correction; it's incomplete
-                channel = plexus.warning
-                # show me
-                channel.log(f"record {idx}: missing date")
+                plexus.warning.log(f"record {idx}: missing date")
                 # and skip it
                 continue
-            # check whether it falls within this pay period
-            if date < earliest or date > payday:
-                # and if not, skip it too
-                continue
-
-            # get the person's first and last name
-            first = correction.first
-            last = correction.last
-
-            # attempt to
-            try:
-                # retrieve the employee id from the time records
-                eid = names[(last,first)]
-            # if this fails
-            except KeyError:
-                # there had better be a value in the mispunch log
-                eid = correction.id
-                # if not
-                if not eid:
-                    # complain
-                    raise plexus.error.log(f"no employee id for {first} {last}")
-                # add this employee to the employee index
-                employees[eid] = (last, first)
-
-            # unpack the times
-            start = correction.start
-            lunchOut = correction.lunchOut
-            lunchIn = correction.lunchIn
-            end = correction.end
-
-            # turn them into date times
-            start = datetime.datetime.combine(date, start) if start else start
-            lunchOut = datetime.datetime.combine(date, lunchOut) if lunchOut else lunchOut
-            lunchIn = datetime.datetime.combine(date, lunchIn) if lunchIn else lunchIn
-            end = datetime.datetime.combine(date, end) if end else end
-
-            # find the punch
-            punch = punches[eid][date]
-            # if it's empty
-            if not punch:
-                # initialize the pile
-                additions = []
-                # this is a new entry
-                if start and lunchOut:
-                    additions.append(newTask(name='addition', start=start, finish=lunchOut))
-                if lunchIn and end:
-                    additions.append(newTask(name='addition', start=lunchIn, finish=end))
-                if start and end and not lunchIn and not lunchOut:
-                    additions.append(newTask(name='addition', start=start, finish=end))
-                # show me
-                channel.log(f"{first} {last} on {date}: {len(additions)} new tasks")
-                # add them to the pile
-                punches[eid][date].extend(additions)
-                # all done
-                continue
-
-            # if there is exactly one task
-            if len(punch) == 1:
-                # get it
-                task = punch[0]
-                # mark it as corrected
-                task.name = "correction"
-                # valid cases are
-
-                # if i have a start
-                if start:
-                    # adjust the start time
-                    task.start = start
-                    channel.log(f"{first} {last} on {date}: adjusting start time")
-                # if i have a lunch out
-                if lunchOut:
-                    # adjust the end time
-                    task.finish = lunchOut
-                    channel.log(f"{first} {last} on {date}: adjusting lunch out")
-                    # now, if i have a lunch in and an end
-                    if lunchIn and end:
-                        # make a new task
-                        newT = newTask(name="addition", start=lunchIn, finish=end)
-                        # and add it to the pile
-                        punch.append(newT)
-                        channel.log(f"{first} {last} on {date}: new task for missing lunch")
-                    # all done with this one
-                    continue
-                # if i have an end
-                if end:
-                    # adjust the end time
-                    task.finish = end
-                    channel.log(f"{first} {last} on {date}: adjusting end time")
-                # all done
+            # find the first payday on or after the date of the correction
+            slot = bisect.bisect_left(paydays, date)
+            # if there isn't one, or the correction is before its pay period
+            if slot == len(paydays) or date < paydays[slot] - 13*day:
+                # the correction is out of range
                 continue
-
-            # if there is more than two tasks
-            if len(punch) > 2:
-                # complain
-                channel.log(f"{first} {last} on {date}: mispunch on date with more than 2 tasks")
-
-            # get the first and last tasks
-            t0 = punch[0]
-            t1 = punch[-1]
-            # if i have a start
-            if start:
-                # adjust
-                t0.name = "correction"
-                t0.start = start
-                channel.log(f"{first} {last} on {date}: adjusting start time")
-            # if I have a lunch out
-            if lunchOut:
-                # adjust
-                t0.name = "correction"
-                t0.finish = lunchOut
-                channel.log(f"{first} {last} on {date}: adjusting lunch out")
-            # if i have a lunch in
-            if lunchIn:
-                # adjust
-                t1.name = "correction"
-                t1.start = lunchIn
-                channel.log(f"{first} {last} on {date}: adjusting lunch in")
-            # if a finish
-            if end:
-                # adjust
-                t1.name = "correction"
-                t1.finish = end
-                channel.log(f"{first} {last} on {date}: adjusting end time")
-
-        # all done with processing; build the output file by creating a file in the current
-        # directory with the same name as the timecard file
-        with open(node.uri.name, mode="w") as stream:
-            # make a writer
-            writer = csv.writer(stream)
-            # make a record prototype
-            row = ['']*18
-            # go through all the employee ids
-            for eid in sorted(punches.keys()):
-                # get the dates
-                dates = punches[eid]
-                # and all dates
-                for date in sorted(dates.keys()):
-                    # go through the tasks
-                    for task in dates[date]:
-                        # adjust the row
-                        if task.name == "correction":
-                            row[0] = '!'
-                        elif task.name == "addition":
-                            row[0] = '+'
-                        else:
-                            row[0] = ''
-                        # generate the employee info
-                        last, first = employees[eid]
-                        row[self.OFFSET_EMPLOYEE] = f"{int(eid):,}   {last},  {first}"
-                        # render the punch
-                        row[self.OFFSET_CLOCKIN] = task.start.strftime(self.TIME_FORMAT)
-                        row[self.OFFSET_CLOCKOUT] = task.finish.strftime(self.TIME_FORMAT)
-                        # save the row
-                        writer.writerow(row)
+            # otherwise, add it to the pile
+            buckets[paydays[slot]].append((
+                correction.id, correction.first, correction.last, date,
+                correction.start, correction.lunchOut, correction.lunchIn, correction.end))
 
         # all done
-        return 0
+        return buckets
 
 
-    # implementation details
     def payperiod(self, data):
         """
         Compute the time span over which we are tabulating hours worked
@@ -1040,24 +940,74 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
         errors = [] if errors is None else errors # parsing errors
         warnings = [] if warnings is None else warnings # parsing warnings
 
-        # make a punch parser
-        parser = praxis.vendors.ecrs.reports.punches()
-
-        # go through the timecard specs
-        for payperiod, node in self.selectRange(plexus=plexus, timecards=timecards, latest=latest):
-            # build the punch table
-            punches = praxis.patterns.vivify(levels=2, atom=praxis.vendors.ecrs.model.punchlist)
-            # open the file
-            with node.open() as stream:
-                # parse
-                parser.parse(stream = stream,
-                             names = employees, punches = punches,
-                             warnings = warnings, errors = errors)
+        # select the timecards in range
+        selected = tuple(self.selectRange(plexus=plexus, timecards=timecards, latest=latest))
+        # go through their contents
+        for payperiod, punches in self.loadTimecards(plexus=plexus, timecards=selected,
+                                 names=employees, warnings=warnings, errors=errors):
             # transfer the data for each employee
             for eid in punches:
                 # by injecting the pay period between the employee and the punches
                 index[eid][payperiod] = punches[eid]
 
+        # report the parsing events
+        self.reportEvents(plexus=plexus, warnings=warnings, errors=errors)
+
+        # for each employee in the target group
+        for eid in self.selectEmployees(employees=employees):
+            # send off the employee id, name and time cards
+            yield eid, employees[eid], index[eid]
+
+        # all done
+        return
+
+
+    def loadTimecards(self, plexus, timecards, names, warnings, errors):
+        """
+        Extract the clock punches from the sequence of {date, vnode} pairs in {timecards} and
+        generate (payday, punches) pairs, with the punches in the two level table employee id ->
+        date -> punch list
+        """
+        # get the cache of parsed timecards
+        cache = self.timecardCache()
+        # if the user asked for parallel parsing and there is more than one file
+        if self.jobs > 1 and len(timecards) > 1:
+            # parse the timecards ahead of time
+            snapshots = self.parseTimecards(nodes=(node for _, node in timecards), cache=cache)
+        # otherwise
+        else:
+            # they get parsed in the loop below
+            snapshots = itertools.repeat(None)
+
+        # go through the timecard specs
+        for (payperiod, node), timecard in zip(timecards, snapshots):
+            # build the punch table
+            punches = praxis.patterns.vivify(levels=2, atom=praxis.vendors.ecrs.model.punchlist)
+            # if the timecard was not parsed already
+            if timecard is None:
+                # load it
+                self.readTimecard(node=node, cache=cache, names=names, punches=punches,
+                                  warnings=warnings, errors=errors)
+            # otherwise
+            else:
+                # replay its contents
+                timecard.merge(names=names, punches=punches, warnings=warnings, errors=errors)
+            # send it off
+            yield payperiod, punches
+
+        # if we used the cache
+        if cache is not None:
+            # show me how it did
+            plexus.info.log('timecard cache: {0.hits} hits, {0.misses} misses'.format(cache))
+
+        # all done
+        return
+
+
+    def reportEvents(self, plexus, warnings, errors):
+        """
+        Show the {warnings} and {errors} that were encountered while parsing the timecards
+        """
         # if there were any errors
         if errors:
             # check in
@@ -1084,24 +1034,287 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
             # flush
             plexus.warning.log('{} warning{} total'.format(count, '' if count == 1 else 's'))
 
-        # now, build the employee name filter
+        # all done
+        return
+
+
+    def nameFilter(self):
+        """
+        Check whether the user asked for a subset of the employees
+        """
+        # the default filter matches everybody
+        return any(name != '.*' for name in self.name)
+
+
+    def selectEmployees(self, employees):
+        """
+        Identify the employees in the {employees} name index that match the user's name filter,
+        sorted by name
+        """
+        # build the employee name filter
         namefilter = re.compile('|'.join(name.lower() for name in self.name))
         # identify the employees of interest
-        eids = tuple(
+        return tuple(
             eid
             for eid, name in sorted(employees.items(), key=operator.itemgetter(1))
             if namefilter.search("{first} {last}".format(last=name[0], first=name[1]).lower())
             )
 
-        # for each employee in the target group
-        for eid in eids:
-            # send off the employee id, name and time cards
-            yield eid, employees[eid], index[eid]
 
+    def catalog(self, plexus):
+        """
+        Build the sorted list of (payday, node) pairs of the available timecards, either from the
+        punch store or from the timecard archive
+        """
+        # get the punch store
+        store = self.punchStore()
+        # if there isn't one
+        if store is None:
+            # search the archive
+            return self.timecards(plexus=plexus)
+        # otherwise, get the paydays in the store; there are no files to go with them
+        timecards = [ (payday, None) for payday in store.paydays() ]
+        # if there aren't any
+        if not timecards:
+            # complain
+            raise plexus.error.log('could not find any time cards in {!r}'.format(self.store))
+        # otherwise, return them
+        return timecards
+
+
+    def dataset(self, plexus, timecards=None, latest=True):
+        """
+        Generate the (employee id, name, timecards) triples of the selected employees, from the
+        punch store if there is one or by parsing the timecards otherwise
+        """
+        # get the punch store
+        store = self.punchStore()
+        # if there isn't one
+        if store is None:
+            # parse the timecards
+            return self.punches(plexus=plexus, timecards=timecards, latest=latest)
+
+        # units
+        day = datetime.timedelta(1)
+        # force initialization of the timecards
+        if timecards is None: timecards = self.catalog(plexus=plexus)
+        # resolve the time interval of interest
+        start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=latest)
+        # identify the employees of interest
+        eids = self.selectEmployees(employees=dict(store.people))
+        # the relevant paydays are the ones {selectRange} would pick
+        return store.dataset(eids=eids, first=start, last=end + 13*day)
+
+
+    def crowded(self, plexus, first, last, dates):
+        """
+        Complain about the {dates} when employee {first} {last} has more punches than the
+        detail document can show
+        """
+        # go through the dates
+        for date in dates:
+            # and complain
+            plexus.warning.log("{1} {2} has more than two tasks on {0}".format(date, first, last))
         # all done
         return
 
 
+    def fanout(self, plexus, report, timecards=None, latest=True, factory=None, **kwds):
+        """
+        Run the per employee {report} of an {audit} on the selected employees and generate
+        (employee id, name, file name, rows, summary) tuples, in the order of the employee names;
+        if the user asked for more than one job, the employees are spread over a pool of
+        processes. A different kind of auditor may be supplied as {factory}, along with any
+        additional {kwds} it needs
+        """
+        # force initialization of the timecards
+        if timecards is None: timecards = self.catalog(plexus=plexus)
+        # resolve the time interval of interest
+        start, end = self.resolveInterval(plexus=plexus, timecards=timecards, latest=latest)
+        # use the default auditor, unless the caller has a better idea
+        if factory is None: factory = praxis.vendors.ecrs.reports.audit
+        # build it
+        auditor = factory(
+            jurisdiction=self.jurisdiction, store=self.store, start=start, end=end, **kwds)
+        # and get the report
+        work = getattr(auditor, report)
+
+        # if the user did not ask for parallel processing
+        if self.jobs < 2:
+            # go through the data set
+            for eid, name, punches in self.dataset(
+                    plexus=plexus, timecards=timecards, latest=latest):
+                # and run the report
+                yield (eid, name) + work(eid=eid, name=name, timecards=punches)
+            # all done
+            return
+
+        # otherwise, get the punch store
+        store = self.punchStore()
+        # if there isn't one
+        if store is None:
+            # parse the timecards; the tables of each employee travel to the workers, minus
+            # the level of autovivification at the top that can't be pickled
+            jobs = [
+                (eid, name, dict(punches))
+                for eid, name, punches in self.punches(
+                    plexus=plexus, timecards=timecards, latest=latest)
+                ]
+        # otherwise
+        else:
+            # the workers map the store on their own, so all they need is the employee id
+            names = dict(store.people)
+            # the relevant paydays are the ones {selectRange} would pick
+            first, last = start, end + 13*datetime.timedelta(1)
+            # identify the employees of interest with punches in range
+            jobs = [
+                (eid, names[eid], None) for eid in self.selectEmployees(employees=names)
+                if store.employs(eid=eid, first=first, last=last)
+                ]
+
+        # if there is nothing to do
+        if not jobs:
+            # bail
+            return
+        # hand each process a few employees at a time, so the auditor is not shipped with every
+        # one of them and the punch store is mapped once per batch
+        size = max(1, len(jobs) // (self.CHUNKS * self.jobs))
+        # split the employees into batches
+        batches = [ jobs[idx:idx+size] for idx in range(0, len(jobs), size) ]
+        # spread them over a pool of processes
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            # the results come back in the order they were submitted
+            outcomes = pool.map(auditor.batch, itertools.repeat(report), batches)
+            # go through them
+            for (eid, name, _), outcome in zip(jobs, itertools.chain.from_iterable(outcomes)):
+                # send them off
+                yield (eid, name) + outcome
+
+        # all done
+        return
+
+
+    def punchStore(self):
+        """
+        Map the columnar punch store into memory, if the user specified one
+        """
+        # if there is no store
+        if not self.store:
+            # no store
+            return None
+        # if it's not mapped yet
+        if self.mapped is None:
+            # map it; it is shared by everything the action does, and released when it's done
+            self.mapped = praxis.vendors.ecrs.archive.store.load(uri=self.store)
+        # and return it
+        return self.mapped
+
+
+    def releaseStore(self):
+        """
+        Release the columnar punch store, if it is mapped
+        """
+        # if it is
+        if self.mapped is not None:
+            # release it
+            self.mapped.close()
+            # and forget it
+            self.mapped = None
+        # all done
+        return
+
+
+    def timecardCache(self):
+        """
+        Build the cache of parsed timecards, if the user asked for one
+        """
+        # if there is no cache folder
+        if not self.cache:
+            # no cache
+            return None
+        # otherwise, build one and return it
+        return praxis.vendors.ecrs.archive.cache(folder=self.cache)
+
+
+    def readTimecard(self, node, cache, names, punches, warnings, errors):
+        """
+        Extract the clock punches from the timecard file in {node}, going through the {cache}
+        of parsed timecards when there is one
+        """
+        # if there is no cache
+        if cache is None:
+            # make a punch parser
+            parser = praxis.vendors.ecrs.reports.punches()
+            # open the timecards
+            with node.open() as stream:
+                # parse the input stream
+                parser.parse(stream=stream, names=names, punches=punches,
+                             warnings=warnings, errors=errors, fast=True)
+            # all done
+            return
+
+        # otherwise, get the parsed contents of the file
+        timecard = cache.read(uri=str(node.uri))
+        # and replay them
+        timecard.merge(names=names, punches=punches, warnings=warnings, errors=errors)
+        # all done
+        return
+
+
+    def parseTimecards(self, nodes, cache):
+        """
+        Parse the timecard files in {nodes} on a pool of processes and return the snapshots of
+        their contents in the same order
+        """
+        # get the snapshot factory
+        timecard = praxis.vendors.ecrs.archive.timecard
+        # get the file names
+        uris = [ str(node.uri) for node in nodes ]
+        # make room for the snapshots
+        snapshots = [ None ] * len(uris)
+        # and the list of (position, fingerprint) of the ones that must be parsed
+        pending = []
+        # go through the files
+        for idx, uri in enumerate(uris):
+            # if there is no cache
+            if cache is None:
+                # this one must be parsed
+                pending.append((idx, None))
+                # move on
+                continue
+            # otherwise, look for a valid cache entry
+            fingerprint, snapshots[idx] = cache.lookup(uri=uri)
+            # if there isn't one
+            if snapshots[idx] is None:
+                # this one must be parsed
+                pending.append((idx, fingerprint))
+
+        # parse the rest on a pool of processes
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            # the results come back in the order they were submitted, so going through them
+            # keeps the parsing errors and warnings in the same order as a serial run
+            outcomes = pool.map(timecard.attempt, [ uris[idx] for idx, _ in pending ])
+            # go through them
+            for (idx, fingerprint), (snapshot, error) in zip(pending, outcomes):
+                # if this timecard could not be parsed
+                if error is not None:
+                    # unpack
+                    description, line = error
+                    # build a locator
+                    here = praxis.tracking.file(source=uris[idx], line=line)
+                    # and complain
+                    raise timecard.ParsingError(description=description, locator=here)
+                # if there is a cache
+                if cache is not None:
+                    # save the snapshot
+                    cache.save(uri=uris[idx], fingerprint=fingerprint, timecard=snapshot)
+                # and store it
+                snapshots[idx] = snapshot
+
+        # all done
+        return snapshots
+
+
     def resolveInterval(self, plexus, timecards, latest):
         """
         Compute the time interval of interest based on the user input and available time cards
@@ -1150,6 +1363,14 @@ class Payroll(praxis.command, family='praxis.actions.payroll'):
     # constants
     days = [ 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun' ]
     TIMECARDS = r"(?P<year>\d{4})(?P<month>\d{2})(?P<day>\d{2})-time.csv"
+    # the suffix of the file with the ingestion watermark of the punch store
+    WATERMARK = '.watermark'
+    # the number of records per insert when loading punches into the database
+    BATCH = 5000
+    # the number of threads that write report files
+    WRITERS = 4
+    # the number of batches of employees per process when building reports in parallel
+    CHUNKS = 4
 
     # constants -- for version 3.2.02 of the CATAPULT report
     OFFSET_EMPLOYEE = 6
@@ -6,6 +6,8 @@
 #
 
 
+# externals
+import collections, concurrent.futures, decimal, io, itertools, journal, os
 # support
 import praxis
 
@@ -21,12 +23,25 @@ class Transactions(praxis.command, family='praxis.actions.tj'):
     log = praxis.properties.strings()
     log.doc = 'the list of log files to analyze'
 
+    jobs = praxis.properties.int(default=1)
+    jobs.doc = 'the number of processes to use when parsing large journals'
+
+    tolerant = praxis.properties.bool(default=False)
+    tolerant.doc = 'skip invoices with records that cannot be parsed, instead of bailing out'
+
+    save = praxis.properties.bool(default=True)
+    save.doc = 'save the invoices and the daily sales totals in the datastore'
+
+    store = praxis.properties.str(default=None)
+    store.doc = 'the file with the columnar punch store to match the cashiers against'
+
 
     # behaviors
     @praxis.export(tip='parse and load transactions from journal logs')
     def load(self, plexus, **kwds):
         """
-        Parse an ECRS transaction journal CSV report and extract the transaction information
+        Parse an ECRS transaction journal CSV report, extract the transaction information and
+        save it in the datastore
         """
         # the fileserver
         vfs = plexus.vfs
@@ -49,30 +64,666 @@ class Transactions(praxis.command, family='praxis.actions.tj'):
         cwd = vfs[vfs.STARTUP_DIR]
 
         # initialize the piles
-        invoices = {} # actual customer transactions
         errors = [] # parsing errors
         warnings = [] # parsing warnings
-        # make a parser
-        parser = praxis.vendors.ecrs.reports.transactions()
+        # and the counters
+        count = 0 # the number of invoices
+        voided = 0 # the number of void invoices
+        training = 0 # the number of training invoices
+        sales = 0 # the total of the invoices that went through, in cents
+        saved = 0 # the number of invoices saved in the datastore
+        # the invoices waiting to be saved
+        batch = []
+        # the daily sales totals
+        rollup = praxis.vendors.ecrs.reports.rollup()
+        # the table of unrecognized metadata descriptions
+        unknown = collections.Counter()
+        # make a parser; have it represent amounts in cents, so the totals are exact
+        parser = praxis.vendors.ecrs.reports.transactions(currency='cents')
 
         # sign in
         info.log('ingesting transactions:')
         info.log('    spec: {.log}'.format(self))
         # find the matches
-        for node, match in cwd.find(pattern=pattern):
-            # extract the file path
-            name = match.group()
-            # get the contents of the file
-            with node.open() as stream:
+        journals = [ (match.group(), node) for node, match in cwd.find(pattern=pattern) ]
+        # make a progress monitor
+        progress = praxis.support.progress(
+            channel=journal.info(self.PROGRESS), title='    progress', units='invoices',
+            total=sum(os.path.getsize(str(node.uri)) for _, node in journals))
+        # attempt to
+        try:
+            # go through the invoices as they are parsed, without holding on to them
+            for invoice in self.invoices(plexus=plexus, parser=parser, journals=journals,
+                                         warnings=warnings, errors=errors, unknown=unknown,
+                                         progress=progress):
+                # count it
+                count += 1
+                # update the progress monitor
+                progress.tick()
+                # if it's from a training session
+                if invoice.training:
+                    # count it
+                    training += 1
+                # if it was voided
+                elif invoice.void:
+                    # count it
+                    voided += 1
+                # otherwise
+                else:
+                    # add it to the sales
+                    sales += invoice.total
+                # roll it up
+                rollup.add(invoice)
+                # if we are not saving the invoices
+                if not self.save:
+                    # move on
+                    continue
+                # otherwise, add it to the pile
+                batch.append(invoice)
+                # if the pile is full
+                if len(batch) >= self.BATCH:
+                    # save it
+                    saved += self.persist(plexus=plexus, invoices=batch)
+                    # and start a new one
+                    batch = []
+            # save the leftovers
+            saved += self.persist(plexus=plexus, invoices=batch)
+            # if we are saving
+            if self.save:
+                # update the daily totals of the days we touched as well
+                self.persistRollup(plexus=plexus, days=rollup.days())
+        # if the parser ran into a record it couldn't handle
+        except parser.ParsingError as error:
+            # complain
+            plexus.error.line(str(error))
+            plexus.error.log('use --tolerant to skip the invoices that cannot be parsed')
+            # and bail
+            return 1
+        # report the throughput
+        progress.done()
+
+        # if there were any unrecognized metadata lines
+        if unknown:
+            # get the channel
+            channel = plexus.warning
+            # sign in
+            channel.line('unrecognized metadata:')
+            # go through them, most frequent first
+            for description, hits in unknown.most_common():
+                # and show me
+                channel.line('  {:5} {!r}'.format(hits, description))
+            # flush
+            channel.log()
+        # if any invoices were skipped
+        if errors:
+            # get the channel
+            channel = plexus.error
+            # go through the errors
+            for error in errors:
                 # show me
-                info.log('  processing {}'.format(name))
-                # pull in the data
-                parser.parse(stream=stream, invoices=invoices, warnings=warnings, errors=errors)
+                channel.line(str(error))
+            # and summarize
+            channel.log('skipped {} invoice{}'.format(len(errors), '' if len(errors)==1 else 's'))
 
-        info.log('{:5} transactions'.format(len(invoices)))
+        # show me
+        info.line('{:5} transactions'.format(count))
+        info.line('{:5} void'.format(voided))
+        info.line('{:5} training'.format(training))
+        info.line('{:5} saved'.format(saved))
+        info.line('sales: {:.2f}'.format(decimal.Decimal(sales).scaleb(-2)))
+        # go through the small dimensions of the rollup
+        for dimension in ('terminal', 'cashier'):
+            # sign in
+            info.line('by {}:'.format(dimension))
+            # get the totals
+            summary = rollup.summary(dimension=dimension)
+            # go through them
+            for key, (invoices, items, total) in sorted(summary.items()):
+                # and show me
+                info.line('  {:20}: {:6} invoices, {:7} items, {:12.2f}'.format(
+                    key, invoices, items, self.dollars(total)))
+        # flush
+        info.log()
 
         # all done
         return 0
 
 
+    @praxis.export(tip='compute cashier and lane throughput from journal logs and punches')
+    def throughput(self, plexus, **kwds):
+        """
+        Match the invoices in an ECRS transaction journal against the shifts in the punch store,
+        and report the throughput of each cashier and each lane
+        """
+        # get the journal channel
+        info = plexus.info
+        # get the uri fragments
+        log = self.log
+
+        # require the user to supply a transaction log explicitly
+        if not log:
+            # complain
+            plexus.error.log('please specify the transaction log to analyze')
+            # and get some help
+            return self.help(plexus=plexus)
+        # and the punch store
+        if not self.store:
+            # complain
+            plexus.error.log('please specify the location of the punch store')
+            # and get some help
+            return self.help(plexus=plexus)
+
+        # get the vfs
+        vfs = plexus.vfs
+        # assemble the spec in a search pattern
+        pattern = r'(?P<name>{})-tj.csv'.format('|'.join(log))
+        # get the {cwd}
+        cwd = vfs[vfs.STARTUP_DIR]
+        # find the matches
+        journals = [ (match.group(), node) for node, match in cwd.find(pattern=pattern) ]
+
+        # initialize the piles
+        errors = [] # parsing errors
+        warnings = [] # parsing warnings
+        # and the table of unrecognized metadata descriptions
+        unknown = collections.Counter()
+        # make a parser
+        parser = praxis.vendors.ecrs.reports.transactions(currency='cents')
+        # map the punch store
+        store = praxis.vendors.ecrs.archive.store.load(uri=self.store)
+        # attempt to
+        try:
+            # make the accumulator
+            throughput = praxis.vendors.ecrs.reports.throughput(store=store)
+
+            # sign in
+            info.log('computing throughput:')
+            info.log('    spec: {.log}'.format(self))
+            info.log('    store: {.store}'.format(self))
+            # make a progress monitor
+            progress = praxis.support.progress(
+                channel=journal.info(self.PROGRESS), title='    progress', units='invoices',
+                total=sum(os.path.getsize(str(node.uri)) for _, node in journals))
+            # attempt to
+            try:
+                # go through the invoices as they are parsed, without holding on to them
+                for invoice in self.invoices(plexus=plexus, parser=parser, journals=journals,
+                                             warnings=warnings, errors=errors, unknown=unknown,
+                                             progress=progress):
+                    # update the progress monitor
+                    progress.tick()
+                    # and account for the invoice
+                    throughput.add(invoice)
+            # if the parser ran into a record it couldn't handle
+            except parser.ParsingError as error:
+                # complain
+                plexus.error.line(str(error))
+                plexus.error.log('use --tolerant to skip the invoices that cannot be parsed')
+                # and bail
+                return 1
+            # report the throughput of the parser
+            progress.done()
+            # if any invoices were skipped
+            if errors:
+                # say so
+                plexus.error.log('skipped {} invoice{}'.format(
+                    len(errors), '' if len(errors)==1 else 's'))
+
+            # get the cell renderer
+            show = self.cell
+            # the cashiers
+            info.line('by cashier:')
+            info.line('  {:20}  {:>8} {:>8} {:>8} {:>8} {:>8} {:>9} {:>9} {:>8}'.format(
+                'cashier', 'invoices', 'items', 'labor', 'busy', 'idle', 'items/hr', 'inv/hr',
+                'off'))
+            # go through them
+            for cashier, invoices, items, labor, busy, idle, itemRate, invoiceRate, offclock in (
+                    throughput.cashierTable()):
+                # and show me
+                info.line('  {:20}  {:8} {:8} {} {:8.1f} {} {} {} {:8}'.format(
+                    cashier, invoices, items, show(labor, '8.1f'), busy, show(idle, '8.1f'),
+                    show(itemRate, '9.1f'), show(invoiceRate, '9.1f'), offclock))
+            # the lanes
+            info.line('by lane:')
+            info.line('  {:20}  {:>8} {:>8} {:>8} {:>8} {:>8} {:>9} {:>9}'.format(
+                'terminal', 'invoices', 'items', 'open', 'busy', 'idle', 'items/hr', 'busy'))
+            # go through them
+            for terminal, invoices, items, opened, busy, idle, itemRate, utilization in (
+                    throughput.laneTable()):
+                # and show me
+                info.line('  {:20}  {:8} {:8} {:8.1f} {:8.1f} {:8.1f} {} {}'.format(
+                    terminal, invoices, items, opened, busy, idle, show(itemRate, '9.1f'),
+                    show(utilization, '9.0%')))
+            # flush
+            info.log()
+
+            # if there are cashiers we couldn't find in the punch store
+            unmatched = throughput.unmatched()
+            # let the user know
+            if unmatched:
+                # sign in
+                plexus.warning.line('cashiers without punches:')
+                # go through them
+                for cashier in unmatched:
+                    # and show me
+                    plexus.warning.line('  {}'.format(cashier))
+                # flush
+                plexus.warning.log()
+
+            # all done
+            return 0
+        # no matter what
+        finally:
+            # release the punch store
+            store.close()
+
+
+    # implementation details
+    def persist(self, plexus, invoices):
+        """
+        Save {invoices} in the datastore in a single transaction; invoices are keyed on their
+        ECRS transaction id, so any earlier copies of them are replaced
+        """
+        # if there is nothing to do
+        if not invoices:
+            # bail
+            return 0
+        # get the sales tables
+        sales = plexus.schema.sales
+        # get the server
+        server = plexus.datastore.server
+        # the invoice ids
+        ids = [ invoice.tid for invoice in invoices ]
+        # build the records, grouped by table so that each one is inserted by a single statement
+        tables = self.records(sales=sales, invoices=invoices)
+
+        # start a transaction
+        server.execute('BEGIN')
+        # attempt to
+        try:
+            # remove the earlier copies of the invoice contents
+            for table in (sales.invoiceTender, sales.invoiceItem):
+                # by invoice
+                server.delete(table=table, condition=self.anyOf(field=table.invoice, values=ids))
+            # and of the invoices themselves
+            server.delete(
+                table=sales.invoice, condition=self.anyOf(field=sales.invoice.id, values=ids))
+            # save the new ones; invoices go first, since their contents refer to them
+            for records in tables:
+                # one table at a time
+                server.insert(*records)
+        # if anything goes wrong
+        except BaseException:
+            # undo
+            server.execute('ROLLBACK')
+            # and complain
+            raise
+        # if all went well, make it stick
+        server.execute('COMMIT')
+        # all done
+        return len(invoices)
+
+
+    def persistRollup(self, plexus, days):
+        """
+        Recompute the sales totals of {days} from the invoices in the datastore and save them,
+        in a single transaction
+
+        The totals of each day are rebuilt from every invoice saved for it, not just the ones in
+        the journals at hand, so loading journals that cover part of a day, or overlap journals
+        that were loaded before, leaves the correct totals behind; invoices are keyed on their
+        ECRS transaction id, so each one is counted once
+        """
+        # if there aren't any days
+        if not days:
+            # bail
+            return
+        # get the sales tables
+        sales = plexus.schema.sales
+        invoice, table = sales.invoice, sales.salesRollup
+        # and the record factory
+        factory = table.pyre_immutable
+        # get the server
+        server = plexus.datastore.server
+        # the days, rendered as strings so they get quoted
+        days = [ date.isoformat() for date in days ]
+        # the invoices that went through on those days
+        restriction = self.anyOf(field=invoice.day, values=days)
+        # and the queries that retrieve them along with the items they sold
+        saleQ = plexus.queries.sale(restriction=restriction)
+        itemQ = plexus.queries.saleItem(restriction=restriction)
+        # the condition that selects the days we are about to replace
+        clear = self.anyOf(field=table.day, values=days)
+        # get the timestamp converter
+        timestamp = praxis.vendors.ecrs.model.task.timestamp
+
+        # start a transaction
+        server.execute('BEGIN')
+        # attempt to
+        try:
+            # count the items sold on each invoice
+            counts = collections.Counter(row.invoice for row in server.select(itemQ))
+            # make a rollup
+            rollup = praxis.vendors.ecrs.reports.rollup()
+            # go through the invoices
+            for row in server.select(saleQ):
+                # and add them to it, in cents, so the totals are exact
+                rollup.record(start=timestamp(row.opened), terminal=row.terminal,
+                              cashier=row.cashier, items=counts[row.id],
+                              sales=self.cents(row.total))
+            # build the records
+            records = [
+                factory(day=date, dimension=dimension, label=key,
+                        invoices=invoices, items=items, sales=self.dollars(sales))
+                for date, dimension, key, invoices, items, sales in rollup.rows()
+                ]
+            # remove the earlier totals
+            server.delete(table=table, condition=clear)
+            # if there is anything left
+            if records:
+                # save the new ones
+                server.insert(*records)
+        # if anything goes wrong
+        except BaseException:
+            # undo
+            server.execute('ROLLBACK')
+            # and complain
+            raise
+        # if all went well, make it stick
+        server.execute('COMMIT')
+        # all done
+        return
+
+
+    def anyOf(self, field, values):
+        """
+        Build the condition that matches the rows whose {field} is any of {values}; the
+        comparisons are combined pairwise, so the expression stays shallow no matter how many
+        values there are, and the values are quoted by the SQL renderer
+        """
+        # build the comparisons
+        terms = [ field == value for value in values ]
+        # combine them pairwise until there is only one left
+        while len(terms) > 1:
+            # pair them up
+            pairs = [ terms[idx] | terms[idx+1] for idx in range(0, len(terms)-1, 2) ]
+            # and carry the odd one over
+            terms = pairs + terms[len(pairs)*2:]
+        # all done
+        return terms[0]
+
+
+    def records(self, sales, invoices):
+        """
+        Map {invoices} onto the {sales} tables; returns the lists of invoice, line item and
+        tender records
+        """
+        # get the invoice model
+        model = praxis.vendors.ecrs.model
+        # missing values
+        null = praxis.db.null
+        # the timestamp converter
+        seconds = model.task.seconds
+        # get the record factories
+        newInvoice = sales.invoice.pyre_immutable
+        newItem = sales.invoiceItem.pyre_immutable
+        newTender = sales.invoiceTender.pyre_immutable
+        # the piles
+        headers = []
+        items = []
+        tenders = []
+
+        # go through the invoices
+        for invoice in invoices:
+            # get the id
+            tid = invoice.tid
+            # and the end of the transaction
+            finish = invoice.finish
+            # build the invoice record
+            headers.append(newInvoice(
+                id=tid, kind=self.invoiceKind(invoice=invoice),
+                description='register {0.terminal}, receipt {0.receipt}'.format(invoice),
+                payer=null, payee=null, scribe=null,
+                opened=seconds(invoice.start), closed=null if finish is None else seconds(finish),
+                day=invoice.start.date(),
+                subtotal=self.dollars(invoice.subtotal), total=self.dollars(invoice.total),
+                terminal=invoice.terminal, receipt=invoice.receipt, cashier=invoice.cashier))
+
+            # the line items
+            line = 0
+            # go through the piles of line items
+            for kind, pile in (
+                    ('sale', invoice.transactions),
+                    ('return', invoice.returns),
+                    ('correction', invoice.corrections)):
+                # and their contents
+                for entry in pile:
+                    # corrections include removed tenders, which leave no trace
+                    if not isinstance(entry, model.transaction):
+                        # so skip them
+                        continue
+                    # make a record
+                    items.append(newItem(
+                        id='{}:{}'.format(tid, line), invoice=tid, line=line, kind=kind,
+                        item=entry.item or null, description=entry.description,
+                        quantity=entry.quantity, price=self.dollars(entry.price),
+                        amount=self.dollars(entry.amount)))
+                    # and move on
+                    line += 1
+
+            # the tenders, as (kind, description, amount) triples
+            entries = []
+            # payments and refunds are recorded by their mode of payment
+            for tender in itertools.chain(invoice.tenders, invoice.refunds):
+                # gift cards know their account
+                entries.append((tender.mode, getattr(tender, 'account', None), tender.amount))
+            # discounts reduce the amount due
+            for discount in invoice.discounts:
+                # coupons carry their charge
+                if isinstance(discount, model.coupon):
+                    # which is negative already
+                    entries.append(('discount', discount.code, discount.amount))
+                # the rest carry the amount taken off
+                else:
+                    # so flip it
+                    entries.append(('discount', discount.mode, -discount.amount))
+            # go through them
+            for line, (kind, description, amount) in enumerate(entries):
+                # make a record
+                tenders.append(newTender(
+                    id='{}:{}'.format(tid, line), invoice=tid, line=line, kind=kind,
+                    description=description or null, amount=self.dollars(amount)))
+
+        # all done
+        return headers, items, tenders
+
+
+    def invoiceKind(self, invoice):
+        """
+        Classify {invoice} as one of the {invoice_types}
+        """
+        # training sessions first, since they may be voided as well
+        if invoice.training:
+            # mark
+            return 'training'
+        # voided ones
+        if invoice.void:
+            # mark
+            return 'void'
+        # and everything else
+        return 'sale'
+
+
+    def cell(self, value, spec):
+        """
+        Render {value} in a table column with the given format {spec}; missing values are shown
+        as a dash
+        """
+        # if the value is missing
+        if value is None:
+            # right align a dash in a column of the same width
+            return '-'.rjust(len(format(0, spec)))
+        # otherwise, format it
+        return format(value, spec)
+
+
+    def dollars(self, cents):
+        """
+        Convert an amount in {cents} into dollars, exactly
+        """
+        # easy enough
+        return decimal.Decimal(cents).scaleb(-2)
+
+
+    def cents(self, dollars):
+        """
+        Convert an amount in {dollars}, as retrieved from the datastore, into cents; back ends
+        that store decimals in floating point hand back the nearest binary fraction, so round
+        """
+        # easy enough
+        return int(decimal.Decimal(dollars).scaleb(2).to_integral_value())
+
+
+    def invoices(self, plexus, parser, journals, warnings, errors, unknown, progress):
+        """
+        Generate the invoices in the sequence of (name, node) pairs in {journals}, and let
+        {progress} know how much of the input has been consumed
+        """
+        # if the user asked for parallel parsing
+        if self.jobs > 1:
+            # shard the journals and parse them on a pool of processes
+            yield from self.parallel(plexus=plexus, parser=parser, journals=journals,
+                                     warnings=warnings, errors=errors, unknown=unknown,
+                                     progress=progress)
+            # all done
+            return
+
+        # the number of bytes in the journals that are done
+        done = 0
+        # otherwise, go through the journals
+        for name, node in journals:
+            # get the file name
+            uri = str(node.uri)
+            # open the file; the byte stream underneath the text keeps track of how much of it
+            # has been consumed
+            with open(uri, mode='rb') as raw:
+                # show me
+                plexus.info.log('  processing {}'.format(name))
+                # let the progress monitor know where to look
+                progress.consumed = lambda: done + raw.tell()
+                # decode the contents
+                stream = io.TextIOWrapper(raw, encoding=parser.ENCODING, newline='')
+                # and parse them
+                yield from parser.invoices(stream=stream, warnings=warnings, errors=errors,
+                                           tolerant=self.tolerant, unknown=unknown)
+            # this one is done
+            done += os.path.getsize(uri)
+            # the file is closed now, so point the progress monitor at the final byte count
+            progress.consumed = lambda total=done: total
+
+        # all done
+        return
+
+
+    def parallel(self, plexus, parser, journals, warnings, errors, unknown, progress):
+        """
+        Split the journals in {journals} into shards at invoice boundaries, parse them on a pool
+        of processes, and generate the invoices in the order they appear in the journals
+        """
+        # the shards, as (file name, begin, end, line) tuples
+        shards = []
+        # the number of bytes in the journals before each shard
+        offsets = []
+        # and in the journals that have been split
+        done = 0
+        # go through the journals
+        for name, node in journals:
+            # get the file name
+            uri = str(node.uri)
+            # split it
+            pieces = parser.split(uri=uri, size=self.SHARD)
+            # show me
+            plexus.info.log('  processing {}: {} shard{}'.format(
+                name, len(pieces), '' if len(pieces) == 1 else 's'))
+            # and add its pieces to the pile
+            shards.extend((uri,) + piece for piece in pieces)
+            # along with their position in the input
+            offsets.extend(done + begin for begin, _, _ in pieces)
+            # this one is done
+            done += os.path.getsize(uri)
+        # the input is consumed a shard at a time
+        offsets.append(done)
+
+        # make a pool
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            # the shards in flight; a few per worker keeps them busy, without letting finished
+            # shards pile up while we are waiting on an earlier one
+            pending = collections.deque()
+            # go through the shards
+            for (uri, begin, end, line), consumed in zip(shards, offsets[1:]):
+                # if there are too many shards in flight
+                if len(pending) >= 2 * self.jobs:
+                    # wait for the oldest one and send off its contents
+                    yield from self.collect(parser=parser, pending=pending, warnings=warnings,
+                                            errors=errors, unknown=unknown, progress=progress)
+                # submit this one
+                future = pool.submit(parser.segment, uri=uri, begin=begin, end=end,
+                                     line=line, tolerant=self.tolerant)
+                # and add it to the pile
+                pending.append((uri, consumed, future))
+            # drain the rest
+            while pending:
+                # wait for the oldest one and send off its contents
+                yield from self.collect(parser=parser, pending=pending, warnings=warnings,
+                                        errors=errors, unknown=unknown, progress=progress)
+
+        # all done
+        return
+
+
+    def collect(self, parser, pending, warnings, errors, unknown, progress):
+        """
+        Wait for the oldest shard in {pending}, record its parsing events and generate its
+        invoices; if the shard stopped at a record it couldn't handle, the error is raised after
+        the invoices that preceded it
+        """
+        # get the oldest shard
+        uri, consumed, future = pending.popleft()
+        # wait for it
+        invoices, shardWarnings, shardErrors, shardUnknown, fatal = future.result()
+        # merge the unrecognized descriptions
+        unknown.update(shardUnknown)
+        # rebuild the parsing events
+        for pile, events in ((warnings, shardWarnings), (errors, shardErrors)):
+            # go through the events
+            for description, line in events:
+                # build a locator
+                here = praxis.tracking.file(source=uri, line=line)
+                # and the event
+                pile.append(parser.ParsingError(description=description, locator=here))
+        # let the progress monitor know how much of the input this shard accounts for
+        progress.consumed = lambda: consumed
+        # send off the invoices
+        yield from invoices
+        # if the shard did not make it to the end
+        if fatal is not None:
+            # unpack
+            description, line = fatal
+            # build a locator
+            here = praxis.tracking.file(source=uri, line=line)
+            # and complain
+            raise parser.ParsingError(description=description, locator=here)
+        # all done
+        return
+
+
+    # constants
+    # the size of the shards of large journals
+    SHARD = 1 << 24
+    # the number of invoices saved in each datastore transaction
+    BATCH = 1000
+    # the name of the channel with the progress reports
+    PROGRESS = 'praxis.tj.progress'
+
+
 # end of file
@@ -32,4 +32,19 @@ class Jurisdiction(pyre.protocol, family="praxis.compliance"):
         """
 
 
+    @pyre.provides
+    def timesheet(self, start, workweeks, timecard):
+        """
+        Classify the hours worked by an employee, with and without enforcing the legally
+        mandated breaks, in a single pass through the time card
+        """
+
+
+    @pyre.provides
+    def classify(self, hours, days):
+        """
+        Classify the hours worked by an entire payroll, given as a dense matrix of daily hours
+        """
+
+
 # end of file
@@ -9,6 +9,7 @@
 # access the framework
 import pyre
 # externals
+import array
 import datetime
 import itertools
 # and my protocol
@@ -62,61 +63,59 @@ class California(pyre.component, implements=jurisdiction, family="praxis.complia
         day = datetime.timedelta(days=1)
         # go through the requested number of work weeks
         for week in range(workweeks):
-            # reset my regular hours counter
-            reg = 0
-            # reset the work days in this work week
-            workdays = 0
-            # go through the days in each work week
-            for dow in range(7):
-                # compute the date
-                today = start + (week*7 + dow)*day
-                # get the hours worked today
-                worked = timecard[today].hours
-
-                # if there were no work hours today
-                if worked == 0:
-                    # yield a null result
-                    yield today, (0, 0, 0)
-                    # and move on
-                    continue
-
-                # otherwise, increment the number of work days this week
-                workdays += 1
-
-                # classify:
-                # every hour above 12 goes into double pay
-                double = max(0, worked - 12)
-
-                # get the number of hours below 12 but above 8
-                excess = min(max(0, worked - 8), 4)
-                # if this is the seventh consecutive workday this week
-                if workdays == 7 :
-                    # all overtime hours are double pay
-                    double += excess
-                    # and we have, as yet, no time-and-a-half
-                    sesqui = 0
-                # otherwise
-                else:
-                    # they are time-and-a-half
-                    sesqui = excess
+            # compute the dates in this work week
+            days = tuple(start + (week*7 + dow)*day for dow in range(7))
+            # compute the number of hours worked for each day in this work week
+            hours = tuple(timecard[today].hours for today in days)
+            # classify them one day at a time
+            yield from zip(days, self._daily(hours=hours))
 
-                # hours below 8 are candidates for regular pay
-                unclassified = min(worked, 8)
-                # the regular hours in any given work week are capped at 40
-                available = 40 - reg
-                # the regular hours are the smaller of these two
-                regular = min(available, unclassified)
-                # the rest are time-and-a-half
-                sesqui += max(0, unclassified - available)
+        # all done
+        return
 
-                # up the regular hour counter
-                reg += regular
 
-                # check the consistency to within a second
-                assert (worked - regular - sesqui - double) < (1/3600)
+    @pyre.export
+    def timesheet(self, start, workweeks, timecard):
+        """
+        Classify the hours worked by an employee given an employee's {timecard}, in a single
+        pass over each work week. This calculator assumes that the work week starts on {start},
+        a {datetime.date} object, and will clip the calculation to {workweeks} consecutive work
+        weeks.
 
-                # yield the partial calculation
-                yield today, (regular, sesqui, double)
+        For each work week, it yields the tiers computed by {overtime}, the tiers computed by
+        {breaks}, and the daily detail computed by {overtime2}
+        """
+        # units
+        day = datetime.timedelta(days=1)
+        # go through the requested number of work weeks
+        for week in range(workweeks):
+            # compute the dates in this work week
+            days = tuple(start + (week*7 + dow)*day for dow in range(7))
+            # the hours worked and the hours adjusted for the mandated breaks
+            raw = []
+            adjusted = []
+            # go through the days
+            for today in days:
+                # get the punches
+                punches = timecard[today]
+                # compute the hours worked
+                worked = punches.hours
+                # save them
+                raw.append(worked)
+                # if there was any work done
+                if worked:
+                    # enforce the breaks
+                    adjusted.append(self._enforceBreaks(worked=worked, taken=punches.breaks))
+                # otherwise
+                else:
+                    # there is nothing to enforce
+                    adjusted.append(worked)
+            # classify and send off
+            yield (
+                self._overtime(hours=raw),
+                self._overtime(hours=adjusted),
+                tuple(zip(days, self._daily(hours=raw))),
+            )
 
         # all done
         return
@@ -145,14 +144,100 @@ class California(pyre.component, implements=jurisdiction, family="praxis.complia
         return
 
 
+    @pyre.export
+    def classify(self, hours, days):
+        """
+        Classify the hours worked by an entire payroll in one call. The {hours} are a dense
+        matrix with one row of {days} daily entries per employee, flattened in row major order;
+        every row starts on the first day of a work week and {days} must be a multiple of seven.
+
+        The result is a triplet of arrays with the regular, time-and-a-half and double time
+        hours, with one row of weekly totals per employee in the same layout as {hours}
+        """
+        # make sure we have whole work weeks
+        if days % 7:
+            # and complain if not
+            raise ValueError("the number of days must be a multiple of seven, not {}".format(days))
+        # pack the hours
+        hours = array.array('d', hours)
+        # make sure the matrix is dense
+        if len(hours) % days:
+            # and complain if not
+            raise ValueError("{} entries do not fit in rows of {} days".format(len(hours), days))
+
+        # the number of employee weeks
+        weeks = len(hours) // 7
+        # allocate the tiers
+        regulars = array.array('d', bytes(8*weeks))
+        sesquis = array.array('d', bytes(8*weeks))
+        doubles = array.array('d', bytes(8*weeks))
+
+        # this is the body of {_overtime}, with the function calls and the temporaries peeled
+        # off so it can sweep through the whole matrix in one pass
+        for week in range(weeks):
+            # the slice of hours for this work week
+            base = 7 * week
+            # compute the total hours worked in the week the way {_overtime} does
+            total = sum(hours[base:base+7])
+            # reset the counters
+            workdays = 0
+            double = 0
+            sesqui = 0
+            regular = 0
+            # go through the days
+            for worked in hours[base:base+7]:
+                # count the working days
+                if worked > 0: workdays += 1
+                # every hour above 12 goes into double pay
+                if worked > 12: double += worked - 12
+                # every hour above 8 and below 12 goes into time and a half
+                if worked > 8: sesqui += worked - 8 if worked < 12 else 4
+                # all hours below 8 go into regular pay
+                regular += worked if worked < 8 else 8
+
+            # if the employee worked seven consecutive days in this work week, any overtime is
+            # double pay
+            if workdays == 7:
+                # get the hours worked on the seventh day
+                seventh = hours[base+6]
+                # if there were any sesqui hours on the seventh day
+                if seventh > 8:
+                    # move them to double pay
+                    seventh = seventh - 8 if seventh < 12 else 4
+                    sesqui -= seventh
+                    double += seventh
+
+            # the weekly overtime tally is the number of hours in excess of 40 that are not
+            # counted as double pay already
+            weekly = total - double - 40
+            # the employee is entitled to the largest of the two tallies
+            if weekly > sesqui: sesqui = weekly
+            # and the number of regular hours cannot exceed 40
+            if regular > 40: regular = 40
+
+            # record
+            regulars[week] = regular
+            sesquis[week] = sesqui
+            doubles[week] = double
+
+        # all done
+        return regulars, sesquis, doubles
+
+
     def enforceBreaks(self, date, punches):
         """
         Adjust the hours in the {punches} of a given shift to enforce the legally mandated breaks
         """
-        # compute the hours worked
-        worked = punches.hours
-        # compute the breaks taken
-        taken = punches.breaks
+        # compute the hours worked and the breaks taken, and enforce
+        return self._enforceBreaks(worked=punches.hours, taken=punches.breaks)
+
+
+    # implementation details
+    def _enforceBreaks(self, worked, taken):
+        """
+        Adjust the hours {worked} in a given shift to enforce the legally mandated breaks, given
+        the breaks {taken}
+        """
         # compute the mandated breaks
         mandated = .5 * int(worked/6)
         # compute the deficit
@@ -165,7 +250,66 @@ class California(pyre.component, implements=jurisdiction, family="praxis.complia
         return worked
 
 
-    # implementation details
+    def _daily(self, hours):
+        """
+        Classify the 7-tuple of {hours} worked in a given work week into the three pay tiers
+        provided by California law, one day at a time
+        """
+        # reset my regular hours counter
+        reg = 0
+        # reset the work days in this work week
+        workdays = 0
+        # go through the days in the work week
+        for worked in hours:
+            # if there were no work hours today
+            if worked == 0:
+                # yield a null result
+                yield (0, 0, 0)
+                # and move on
+                continue
+
+            # otherwise, increment the number of work days this week
+            workdays += 1
+
+            # classify:
+            # every hour above 12 goes into double pay
+            double = max(0, worked - 12)
+
+            # get the number of hours below 12 but above 8
+            excess = min(max(0, worked - 8), 4)
+            # if this is the seventh consecutive workday this week
+            if workdays == 7 :
+                # all overtime hours are double pay
+                double += excess
+                # and we have, as yet, no time-and-a-half
+                sesqui = 0
+            # otherwise
+            else:
+                # they are time-and-a-half
+                sesqui = excess
+
+            # hours below 8 are candidates for regular pay
+            unclassified = min(worked, 8)
+            # the regular hours in any given work week are capped at 40
+            available = 40 - reg
+            # the regular hours are the smaller of these two
+            regular = min(available, unclassified)
+            # the rest are time-and-a-half
+            sesqui += max(0, unclassified - available)
+
+            # up the regular hour counter
+            reg += regular
+
+            # check the consistency to within a second
+            assert (worked - regular - sesqui - double) < (1/3600)
+
+            # yield the partial calculation
+            yield (regular, sesqui, double)
+
+        # all done
+        return
+
+
     def _overtime(self, hours):
         """
         Classify the 7-tuple of {hours} worked in a given work week into the three pay tiers
@@ -15,6 +15,8 @@ EXPORT_PYTHON_MODULES = \
     Company.py \
     Employee.py \
     EmployeeListing.py \
+    Sale.py \
+    SaleItem.py \
     __init__.py
 
 # the standard build targets
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# pull in the required praxis parts
+from .. import db, schema
+
+
+# the query declaration
+class Sale(db.query, invoices=schema.sales.invoice):
+    """
+    Retrieve the sales invoices that satisfy a given restriction
+    """
+
+    # the fields in the resulting records
+    id = invoices.id
+    opened = invoices.opened
+    terminal = invoices.terminal
+    cashier = invoices.cashier
+    total = invoices.total
+
+    # the restriction
+    where = (invoices.kind == 'sale')
+
+
+    # meta-methods
+    def __init__(self, restriction=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # if necessary
+        if restriction is not None:
+            # add the restriction
+            self.where = type(self).where & restriction
+        # all done
+        return
+
+
+# end of file
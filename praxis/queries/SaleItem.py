@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# pull in the required praxis parts
+from .. import db, schema
+
+
+# the query declaration
+class SaleItem(db.query, invoices=schema.sales.invoice, invoice_items=schema.sales.invoiceItem):
+    """
+    Retrieve the items sold on the sales invoices that satisfy a given restriction
+    """
+
+    # the fields in the resulting records
+    id = invoice_items.id
+    invoice = invoice_items.invoice
+
+    # the restriction
+    where = (
+        (invoice_items.invoice == invoices.id) & # the item is on this invoice
+        (invoice_items.kind == 'sale') & # it was sold
+        (invoices.kind == 'sale') # on a sale
+    )
+
+
+    # meta-methods
+    def __init__(self, restriction=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # if necessary
+        if restriction is not None:
+            # add the restriction
+            self.where = type(self).where & restriction
+        # all done
+        return
+
+
+# end of file
@@ -9,6 +9,8 @@
 from .Company import Company as company
 from .Employee import Employee as employee
 from .EmployeeListing import EmployeeListing as employeeListing
+from .Sale import Sale as sale
+from .SaleItem import SaleItem as saleItem
 
 
 # end of file
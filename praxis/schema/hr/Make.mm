@@ -18,6 +18,7 @@ EXPORT_PYTHON_MODULES = \
     EmploymentType.py \
     PayType.py \
     PayFrequency.py \
+    Punch.py \
     __init__.py
 
 # the standard build targets
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# access to the framework
+import praxis
+
+
+# table declaration
+class Punch(praxis.db.table, id='punches'):
+    """
+    The clock punches of employees, as recorded by the time clock
+    """
+
+    employee = praxis.db.str().notNull()
+    employee.doc = "the employee id, as it appears in the timecards; see {employments.id}"
+
+    payday = praxis.db.date().notNull()
+    payday.doc = "the payday of the timecard with this punch"
+
+    # the timestamps are stored as seconds since the epoch, the same way {model.task} keeps
+    # them, so that they retain their date and shifts past midnight survive the round trip
+    clockin = praxis.db.int().notNull()
+    clockin.doc = "the start of the task, in seconds since the epoch"
+
+    clockout = praxis.db.int().notNull()
+    clockout.doc = "the end of the task, in seconds since the epoch"
+
+    kind = praxis.db.str().notNull()
+    kind.doc = "the name of the task; e.g. 'in' for regular time"
+
+
+# end of file
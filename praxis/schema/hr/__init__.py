@@ -15,6 +15,8 @@ from .Employee import Employee as employee
 from .Employer import Employer as employer
 # connections among atoms
 from .Employment import Employment as employment
+# time keeping
+from .Punch import Punch as punch
 
 
 # table groups
@@ -30,6 +32,8 @@ atomTables = (
 
 # attributes
 attributeTables = (
+    # time keeping
+    punch,
 )
 
 # relations
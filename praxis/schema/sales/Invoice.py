@@ -32,9 +32,33 @@ class Invoice(praxis.db.table, id='invoices'):
     # the entity recording the transaction
     scribe = praxis.db.reference(key=crm.entity.entity)
 
-    # start and stop dates
-    opened = praxis.db.time().notNull()
-    closed = praxis.db.time(default=praxis.db.null)
+    # start and stop times, in seconds since the epoch, so they retain their date
+    opened = praxis.db.int().notNull()
+    opened.doc = "the start of the transaction, in seconds since the epoch"
+
+    closed = praxis.db.int(default=praxis.db.null)
+    closed.doc = "the end of the transaction, in seconds since the epoch"
+
+    # the day the transaction was opened, for grouping
+    day = praxis.db.date().notNull()
+    day.doc = "the day of the transaction"
+
+    # the amounts
+    subtotal = praxis.db.decimal(precision=9, scale=2, default=praxis.db.null)
+    subtotal.doc = "the amount before taxes"
+
+    total = praxis.db.decimal(precision=9, scale=2, default=praxis.db.null)
+    total.doc = "the amount due, including taxes"
+
+    # for invoices recorded by a point of sale system
+    terminal = praxis.db.str(default=praxis.db.null)
+    terminal.doc = "the register that recorded the transaction"
+
+    receipt = praxis.db.str(default=praxis.db.null)
+    receipt.doc = "the receipt number"
+
+    cashier = praxis.db.str(default=praxis.db.null)
+    cashier.doc = "the name of the cashier, as it appears in the register logs"
 
 
 # end of file
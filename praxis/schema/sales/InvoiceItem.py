@@ -20,10 +20,28 @@ class InvoiceItem(praxis.db.table, id='invoice_items'):
 
     # data layout
     id = praxis.db.str().primary()
+    id.doc = "the invoice id and the line number, separated by a colon"
+
+    invoice = praxis.db.reference(key=Invoice.id).notNull()
+    invoice.doc = "the invoice this item belongs to"
+
+    line = praxis.db.int().notNull()
+    line.doc = "the position of the item on the invoice"
+
+    kind = praxis.db.str().notNull()
+    kind.doc = "one of 'sale', 'return', or 'correction'"
+
+    item = praxis.db.str(default=praxis.db.null)
+    item.doc = "the item code, as the register knows it"
+
+    description = praxis.db.str().notNull()
+    quantity = praxis.db.decimal(precision=9, scale=3).notNull()
+    price = praxis.db.decimal(precision=9, scale=2).notNull()
+    amount = praxis.db.decimal(precision=9, scale=2).notNull()
 
     # meta-methods
     def __str__(self):
-        return "{0.id}: {0.name}".format(self)
+        return "{0.id}: {0.description}".format(self)
 
 
 # end of file
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# access to the framework
+import praxis
+# referenced tables
+from .Invoice import Invoice
+from .TenderType import TenderType
+
+
+# table declaration
+class InvoiceTender(praxis.db.table, id='invoice_tenders'):
+    """
+    Payments, refunds and discounts applied to an invoice
+    """
+
+    # data layout
+    id = praxis.db.str().primary()
+    id.doc = "the invoice id and the line number, separated by a colon"
+
+    invoice = praxis.db.reference(key=Invoice.id).notNull()
+    invoice.doc = "the invoice this tender belongs to"
+
+    line = praxis.db.int().notNull()
+    line.doc = "the position of the tender on the invoice"
+
+    kind = praxis.db.reference(key=TenderType.type).notNull()
+
+    description = praxis.db.str(default=praxis.db.null)
+    description.doc = "additional information, such as the gift card account or the discount name"
+
+    amount = praxis.db.decimal(precision=9, scale=2).notNull()
+    amount.doc = "the amount; refunds and discounts are negative"
+
+    # meta-methods
+    def __str__(self):
+        return "{0.id}: {0.kind} {0.amount}".format(self)
+
+
+# end of file
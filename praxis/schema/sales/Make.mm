@@ -14,9 +14,11 @@ PACKAGE = schema/sales
 EXPORT_PYTHON_MODULES = \
     Invoice.py \
     InvoiceItem.py \
+    InvoiceTender.py \
     InvoiceType.py \
     Item.py \
     ItemType.py \
+    SalesRollup.py \
     TenderType.py \
     __init__.py
 
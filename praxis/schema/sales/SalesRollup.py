@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# access to the framework
+import praxis
+
+
+# table declaration
+class SalesRollup(praxis.db.table, id='sales_rollups'):
+    """
+    Daily sales totals along a few dimensions, derived from the register transaction journal
+    """
+
+    day = praxis.db.date().notNull()
+    day.doc = "the day of the sales"
+
+    dimension = praxis.db.str().notNull()
+    dimension.doc = "one of 'terminal', 'cashier', or 'hour'"
+
+    label = praxis.db.str().notNull()
+    label.doc = "the terminal, the name of the cashier, or the two digit hour of the day"
+
+    invoices = praxis.db.int().notNull()
+    invoices.doc = "the number of invoices that went through"
+
+    items = praxis.db.int().notNull()
+    items.doc = "the number of line items sold"
+
+    sales = praxis.db.decimal(precision=11, scale=2).notNull()
+    sales.doc = "the total of the invoices, including taxes"
+
+
+# end of file
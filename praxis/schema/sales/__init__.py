@@ -14,8 +14,12 @@ from .TenderType import TenderType as tenderType
 # atoms
 from .Invoice import Invoice as invoice
 from .InvoiceItem import InvoiceItem as invoiceItem
+from .InvoiceTender import InvoiceTender as invoiceTender
 from .Item import Item as item
 
+# aggregates
+from .SalesRollup import SalesRollup as salesRollup
+
 
 # table groups
 # types
@@ -25,11 +29,12 @@ typeTables = (
 
 # atoms
 atomTables = (
-    invoice, invoiceItem, item,
+    invoice, invoiceItem, invoiceTender, item,
 )
 
 # attributes
 attributeTables = (
+    salesRollup,
 )
 
 # relations
@@ -13,7 +13,10 @@ PACKAGE = support
 # the list of python modules
 EXPORT_PYTHON_MODULES = \
     Builder.py \
+    Output.py \
     Primer.py \
+    Progress.py \
+    Spool.py \
     TypeRegistrar.py \
     __init__.py
 
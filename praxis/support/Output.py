@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import csv, os, tempfile, threading
+
+
+# declaration
+class Output:
+    """
+    An output file that is written through a large buffer into a temporary file next to its
+    destination, and moved into place only after everything has been written
+
+    Use it as a context manager: the stream it returns is committed when the block finishes,
+    and discarded if it raises, so a crash can never leave a truncated file behind, and an
+    earlier version of the file survives intact. The {csv} and {text} factories write an entire
+    file in one call
+    """
+
+
+    # public data
+    uri = None # the destination
+    stream = None # the stream to the temporary file, while it is open
+    scratch = None # the name of the temporary file
+
+
+    # factories
+    @classmethod
+    def csv(cls, uri, rows, **kwds):
+        """
+        Write {rows} to {uri} as a CSV file; the additional {kwds} are passed to the writer
+        """
+        # open the file
+        with cls(uri=uri) as stream:
+            # and dump the rows
+            csv.writer(stream, **kwds).writerows(rows)
+        # all done
+        return uri
+
+
+    @classmethod
+    def text(cls, uri, text):
+        """
+        Write {text} to {uri}
+        """
+        # open the file
+        with cls(uri=uri) as stream:
+            # and dump the text
+            stream.write(text)
+        # all done
+        return uri
+
+
+    # interface
+    def open(self):
+        """
+        Create the temporary file and return a stream to it
+        """
+        # get the destination
+        uri = str(self.uri)
+        # split it
+        folder, name = os.path.split(os.path.abspath(uri))
+        # make a temporary file in the same folder, so the final rename does not cross devices
+        fd, self.scratch = tempfile.mkstemp(dir=folder, prefix='.' + name + '.', suffix='.tmp')
+        # temporary files are private; give it the permissions of a regular file
+        os.fchmod(fd, 0o666 & ~self.umask())
+        # wrap it in a stream
+        if self.binary:
+            # that accepts bytes
+            self.stream = os.fdopen(fd, mode='wb', buffering=self.buffering)
+        else:
+            # or text
+            self.stream = os.fdopen(fd, mode='w', buffering=self.buffering,
+                                    encoding=self.encoding, newline='')
+        # and return it
+        return self.stream
+
+
+    def commit(self):
+        """
+        Flush the stream and move the temporary file into place
+        """
+        # attempt to
+        try:
+            # close the stream; with a large buffer, this is where most of the bytes get written
+            self.stream.close()
+            # move the file into place
+            os.replace(self.scratch, str(self.uri))
+        # if anything goes wrong
+        except BaseException:
+            # throw the temporary file away
+            self.discard()
+            # and complain
+            raise
+        # forget it
+        self.stream = None
+        self.scratch = None
+        # all done
+        return
+
+
+    def discard(self):
+        """
+        Close the stream and remove the temporary file, leaving the destination alone
+        """
+        # attempt to
+        try:
+            # close the stream
+            self.stream.close()
+        # no matter what
+        finally:
+            # remove the temporary file
+            os.unlink(self.scratch)
+            # and forget it
+            self.stream = None
+            self.scratch = None
+        # all done
+        return
+
+
+    # implementation details
+    @classmethod
+    def umask(cls):
+        """
+        Retrieve the file creation mask of the process; it can only be read by setting it, so
+        this is done once, under a lock
+        """
+        # grab the lock
+        with cls.lock:
+            # if we haven't looked yet
+            if cls.mask is None:
+                # read it
+                cls.mask = os.umask(0)
+                # and restore it
+                os.umask(cls.mask)
+        # all done
+        return cls.mask
+
+
+    # meta-methods
+    def __init__(self, uri, binary=False, encoding='utf-8', buffering=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.uri = uri
+        self.binary = binary
+        self.encoding = encoding
+        self.buffering = self.BUFFER if buffering is None else buffering
+        # all done
+        return
+
+
+    def __enter__(self):
+        # open the file
+        return self.open()
+
+
+    def __exit__(self, kind, value, traceback):
+        # if all went well
+        if kind is None:
+            # make it stick
+            self.commit()
+        # otherwise
+        else:
+            # throw it away
+            self.discard()
+        # let the exception, if any, propagate
+        return False
+
+
+    # constants
+    # the size of the output buffer
+    BUFFER = 1 << 20
+    # the file creation mask, and the lock that guards looking it up
+    mask = None
+    lock = threading.Lock()
+
+
+# end of file
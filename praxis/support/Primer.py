@@ -29,6 +29,7 @@ class Primer:
         records = itertools.chain(
             self._buildEntityTypes(plexus=plexus),
             self._buildItemTypes(plexus=plexus),
+            self._buildInvoiceTypes(plexus=plexus),
             self._buildContactTypes(plexus=plexus),
             self._buildContactPurposes(plexus=plexus),
             self._buildPhoneTypes(plexus=plexus),
@@ -251,6 +252,20 @@ class Primer:
         return
 
 
+    def _buildInvoiceTypes(self, plexus):
+        """
+        Create the default invoice types
+        """
+        # get the invoice type factory
+        factory = plexus.datastore.schema.sales.invoiceType.pyre_immutable
+        # the built-in invoice types
+        yield factory(type='sale', description='a sale recorded by a register')
+        yield factory(type='void', description='a sale that was voided before it went through')
+        yield factory(type='training', description='a sale recorded in training mode')
+        # all  done
+        return
+
+
     def _buildContactTypes(self, plexus):
         """
         Create the default contact types
@@ -381,6 +396,8 @@ class Primer:
         yield factory(type='debit', description='debit card')
         yield factory(type='gift', description='gift card')
         yield factory(type='discount', description='discount')
+        yield factory(type='refund', description='refund')
+        yield factory(type='charge', description='house charge account')
         # all  done
         return
 
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import datetime, time
+
+
+# declaration
+class Progress:
+    """
+    Rate limited progress reports on a journal channel
+
+    Clients call {tick} once per unit of work; at most one report per {interval} seconds makes
+    it to the {channel}, with the processing rate and, when the {total} number of bytes is
+    known, the fraction of the input consumed and an estimate of the time remaining. The byte
+    count is retrieved from {consumed} only when a report is due, so it may be expensive. If
+    the channel is not active, ticking is all but free
+    """
+
+
+    # public data
+    count = 0 # the number of units of work done so far
+    consumed = None # a callable that returns the number of bytes consumed so far
+
+
+    # interface
+    def tick(self, count=1):
+        """
+        Record {count} more units of work, and report if it is time to do so
+        """
+        # update the count
+        self.count += count
+        # if the channel is off
+        if not self.active:
+            # nothing else to do
+            return
+        # get the time
+        now = self.clock()
+        # if it is not time to report
+        if now < self.due:
+            # nothing else to do
+            return
+        # otherwise, report
+        self.channel.log(self.render(now=now))
+        # and schedule the next one
+        self.due = now + self.interval
+        # all done
+        return
+
+
+    def done(self):
+        """
+        Report the totals
+        """
+        # if the channel is off
+        if not self.active:
+            # nothing to do
+            return
+        # get the time
+        now = self.clock()
+        # compute the elapsed time
+        elapsed = now - self.start
+        # and the rate
+        rate = self.count / elapsed if elapsed > 0 else 0
+        # report
+        self.channel.log('{}: {:,} {} in {:.2f} sec, {:,.0f} {}/sec'.format(
+            self.title, self.count, self.units, elapsed, rate, self.units))
+        # all done
+        return
+
+
+    # implementation details
+    def render(self, now):
+        """
+        Build the progress report
+        """
+        # compute the elapsed time
+        elapsed = now - self.start
+        # and the rate
+        rate = self.count / elapsed if elapsed > 0 else 0
+        # start with the counts
+        report = '{}: {:,} {}, {:,.0f} {}/sec'.format(
+            self.title, self.count, self.units, rate, self.units)
+        # if there is no way to tell how much input was consumed
+        if self.consumed is None:
+            # that's all we can say
+            return report
+        # otherwise, get the byte count
+        consumed = self.consumed()
+        # add it to the report
+        report += ', {:.1f} MB'.format(consumed / self.MB)
+        # if we don't know how much input there is
+        if not self.total:
+            # that's all we can say
+            return report
+        # otherwise, add the total and the fraction
+        report += ' of {:.1f} MB ({:.0%})'.format(self.total / self.MB, consumed / self.total)
+        # if we have consumed something
+        if consumed and elapsed > 0:
+            # estimate how long the rest will take
+            eta = elapsed * max(self.total - consumed, 0) / consumed
+            # and add it to the report
+            report += ', eta {}'.format(datetime.timedelta(seconds=round(eta)))
+        # all done
+        return report
+
+
+    # meta-methods
+    def __init__(self, channel, title, units, total=None, interval=1.0, clock=time.monotonic,
+                 **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.channel = channel
+        self.title = title
+        self.units = units
+        self.total = total
+        self.interval = interval
+        self.clock = clock
+        # check whether anybody is listening
+        self.active = channel.active
+        # start the clock
+        self.start = clock()
+        # and schedule the first report
+        self.due = self.start + interval
+        # all done
+        return
+
+
+    # constants
+    MB = 1 << 20
+
+
+# end of file
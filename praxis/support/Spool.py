@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import concurrent.futures
+# support
+from .Output import Output as output
+
+
+# declaration
+class Spool:
+    """
+    A pool of threads that write batches of output files
+
+    The caller renders the contents of each file and hands them off; a worker thread writes
+    them through an {output}, so each file appears atomically, while the caller moves on to the
+    next one. Use it as a context manager: leaving the block waits for the files in flight, and
+    raises the first error encountered while writing them
+    """
+
+
+    # interface
+    def csv(self, uri, rows, **kwds):
+        """
+        Schedule writing {rows} to {uri} as a CSV file
+        """
+        # realize the rows, so the caller is free to reuse whatever they came from
+        rows = list(rows)
+        # and submit
+        return self.submit(output.csv, uri=uri, rows=rows, **kwds)
+
+
+    def text(self, uri, text):
+        """
+        Schedule writing {text} to {uri}
+        """
+        # submit
+        return self.submit(output.text, uri=uri, text=text)
+
+
+    def wait(self):
+        """
+        Wait for the files in flight; returns the list of files written, in the order they were
+        scheduled, or raises the first error encountered while writing them
+        """
+        # grab the pending writes
+        pending, self.pending = self.pending, []
+        # wait for all of them, so that no write is abandoned half way
+        concurrent.futures.wait(pending)
+        # and collect the results; this raises the first error
+        return [ future.result() for future in pending ]
+
+
+    def close(self):
+        """
+        Wait for the files in flight and shut the pool down
+        """
+        # attempt to
+        try:
+            # wait for the files in flight
+            return self.wait()
+        # no matter what
+        finally:
+            # shut the pool down
+            self.pool.shutdown()
+
+
+    # implementation details
+    def submit(self, writer, **kwds):
+        """
+        Hand {writer} to the pool
+        """
+        # submit
+        future = self.pool.submit(writer, **kwds)
+        # add it to the pile
+        self.pending.append(future)
+        # and return it
+        return future
+
+
+    # meta-methods
+    def __init__(self, workers=4, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make a pool
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        # and a pile for the files in flight
+        self.pending = []
+        # all done
+        return
+
+
+    def __enter__(self):
+        # nothing to do
+        return self
+
+
+    def __exit__(self, kind, value, traceback):
+        # if all went well
+        if kind is None:
+            # wait for the files in flight and complain about any errors
+            self.close()
+        # otherwise
+        else:
+            # wait for the files in flight; the original exception is more interesting than
+            # anything that went wrong while writing
+            concurrent.futures.wait(self.pending)
+            # and shut down
+            self.pool.shutdown()
+        # let the exception, if any, propagate
+        return False
+
+
+# end of file
@@ -7,7 +7,10 @@
 
 
 from .Builder import Builder as builder
+from .Output import Output as output
 from .Primer import Primer as primer
+from .Progress import Progress as progress
+from .Spool import Spool as spool
 from .TypeRegistrar import TypeRegistrar as typeRegistrar
 
 
@@ -11,6 +11,7 @@ PROJECT = praxis
 PACKAGE = vendors/ecrs
 # the list of directories to visit
 RECURSE_DIRS = \
+    archive \
     model \
     reports \
 
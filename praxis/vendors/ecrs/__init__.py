@@ -12,5 +12,8 @@ from . import model
 # the report parsers
 from . import reports
 
+# persistent storage of parsed reports
+from . import archive
+
 
 # end of file
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import array, mmap, struct
+# support
+import praxis
+
+
+# declaration
+class Archive:
+    """
+    A binary punch archive, meant for moving clock punches around
+
+    The file starts with a header, followed by the employee name table and the task kind table,
+    and then the punches as fixed width records
+
+        (clock-in, clock-out, employee index, payday, task kind)
+
+    with clock-in and clock-out in seconds since the epoch, and paydays in days since the epoch,
+    just like in {store}. The file is read through a memory map, so the records are unpacked
+    directly from the file contents without reading them into memory first
+    """
+
+
+    # types
+    from .Store import Store as store
+
+
+    # public data
+    people = None # the list of (employee id, name) pairs
+    kinds = None # the list of task names
+    count = 0 # the number of punch records
+
+
+    # factories
+    @classmethod
+    def load(cls, uri):
+        """
+        Map the archive in the file at {uri} into memory
+        """
+        # open the file
+        with open(uri, mode='rb') as stream:
+            # and map it
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        # make a view
+        view = memoryview(buffer)
+
+        # attempt to
+        try:
+            # unpack the header
+            magic, version, people, kinds, count = cls.HEADER.unpack_from(view)
+        # if the file is too short
+        except struct.error:
+            # it can't be an archive
+            magic = None
+        # check the signature
+        if magic != cls.MAGIC:
+            # and complain
+            raise ValueError('{!r}: not a punch archive'.format(str(uri)))
+        # and the version
+        if version != cls.VERSION:
+            # and complain
+            raise ValueError('{!r}: unsupported punch archive version {}'.format(
+                str(uri), version))
+        # move past the header
+        offset = cls.HEADER.size
+
+        # read the employee table
+        table = []
+        # one employee at a time
+        for _ in range(people):
+            # each one is an id followed by the last and first names
+            fields = []
+            # so three strings
+            for _ in range(3):
+                # read one
+                text, offset = cls.unpackString(view=view, offset=offset)
+                # and save it
+                fields.append(text)
+            # unpack
+            eid, last, first = fields
+            # and store
+            table.append((eid, (last, first)))
+
+        # read the task kinds
+        names = []
+        # one at a time
+        for _ in range(kinds):
+            # read it
+            text, offset = cls.unpackString(view=view, offset=offset)
+            # and save it
+            names.append(text)
+
+        # the records come next, aligned on a record boundary
+        offset = -(-offset // cls.RECORD.size) * cls.RECORD.size
+        # carve them out
+        records = view[offset:offset + count*cls.RECORD.size]
+        # check that they are all there
+        if len(records) != count*cls.RECORD.size:
+            # and complain
+            raise ValueError('{!r}: truncated punch archive'.format(str(uri)))
+
+        # build the archive
+        archive = cls(people=table, kinds=names, records=records)
+        # hold on to the map
+        archive.buffer = buffer
+        # and return it
+        return archive
+
+
+    # interface
+    def punches(self):
+        """
+        Generate the punch records as (clock-in, clock-out, employee index, payday, task kind)
+        tuples
+        """
+        # unpack the records in place
+        for clockin, clockout, employee, payday, kind, _ in self.RECORD.iter_unpack(self.records):
+            # and send them off
+            yield clockin, clockout, employee, payday, kind
+        # all done
+        return
+
+
+    def restore(self):
+        """
+        Build a punch store out of my contents
+        """
+        # get the number of employees
+        people = len(self.people)
+        # make the columns
+        offsets = array.array('q', [0]*(people+1))
+        employee = array.array('i')
+        payday = array.array('i')
+        clockin = array.array('q')
+        clockout = array.array('q')
+        kind = array.array('B')
+
+        # the records must be sorted by employee and clock-in time, as {save} leaves them
+        last = (-1, None)
+        # go through them
+        for tin, tout, idx, day, code in self.punches():
+            # check the order
+            if (idx, tin) < last:
+                # and complain
+                raise ValueError('the punch records are out of order')
+            # transfer
+            clockin.append(tin)
+            clockout.append(tout)
+            employee.append(idx)
+            payday.append(day)
+            kind.append(code)
+            # count
+            offsets[idx+1] += 1
+            # and move on
+            last = (idx, tin)
+
+        # convert the counts into offsets
+        for idx in range(people):
+            # by accumulating
+            offsets[idx+1] += offsets[idx]
+
+        # build the store and return it
+        return self.store(people=list(self.people), kinds=list(self.kinds), offsets=offsets,
+                          employee=employee, payday=payday, clockin=clockin, clockout=clockout,
+                          kind=kind)
+
+
+    @classmethod
+    def save(cls, uri, store):
+        """
+        Save the contents of {store} in an archive at {uri}
+        """
+        # start with the header
+        header = cls.HEADER.pack(
+            cls.MAGIC, cls.VERSION, len(store.people), len(store.kinds), store.rows)
+        # the tables
+        tables = bytearray()
+        # go through the employees
+        for eid, (last, first) in store.people:
+            # and pack them
+            for text in (eid, last, first):
+                cls.packString(buffer=tables, text=text)
+        # go through the task kinds
+        for text in store.kinds:
+            # and pack them
+            cls.packString(buffer=tables, text=text)
+        # pad to the next record boundary
+        size = len(header) + len(tables)
+        tables.extend(bytes(-(-size // cls.RECORD.size) * cls.RECORD.size - size))
+
+        # open the file, so that a crash cannot leave a partial archive behind
+        with praxis.support.output(uri=uri, binary=True) as stream:
+            # write the header
+            stream.write(header)
+            # the tables
+            stream.write(tables)
+            # get the record packer
+            pack = cls.RECORD.pack
+            # get the columns
+            clockin, clockout = store.clockin, store.clockout
+            employee, payday, kind = store.employee, store.payday, store.kind
+            # and write the records, a batch at a time
+            for begin in range(0, store.rows, cls.BATCH):
+                # pack the batch
+                batch = b''.join(
+                    pack(clockin[row], clockout[row], employee[row], payday[row], kind[row], 0)
+                    for row in range(begin, min(begin+cls.BATCH, store.rows)))
+                # and write it
+                stream.write(batch)
+        # all done
+        return
+
+
+    def close(self):
+        """
+        Release the memory map
+        """
+        # get the map
+        buffer = self.buffer
+        # if there isn't one
+        if buffer is None:
+            # nothing to do
+            return
+        # release the view of the records
+        self.records.release()
+        # close the map
+        buffer.close()
+        # and forget it
+        self.buffer = None
+        # all done
+        return
+
+
+    # implementation details
+    @classmethod
+    def packString(cls, buffer, text):
+        """
+        Append {text} to {buffer} as a length prefixed UTF-8 string
+        """
+        # encode
+        data = text.encode('utf-8')
+        # store the length
+        buffer.extend(cls.LENGTH.pack(len(data)))
+        # and the contents
+        buffer.extend(data)
+        # all done
+        return
+
+
+    @classmethod
+    def unpackString(cls, view, offset):
+        """
+        Extract the length prefixed UTF-8 string at {offset} in {view}; return the string and the
+        offset of whatever follows it
+        """
+        # get the length
+        size, = cls.LENGTH.unpack_from(view, offset)
+        # move past it
+        offset += cls.LENGTH.size
+        # decode the contents
+        text = bytes(view[offset:offset+size]).decode('utf-8')
+        # and return
+        return text, offset + size
+
+
+    # meta-methods
+    def __init__(self, people, kinds, records, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record my info
+        self.people = people
+        self.kinds = kinds
+        self.records = records
+        self.count = len(records) // self.RECORD.size
+        # no memory map, unless {load} attaches one
+        self.buffer = None
+        # all done
+        return
+
+
+    # constants
+    MAGIC = b'PRXARCHV'
+    VERSION = 1
+    # the header: signature, version, number of employees, number of task kinds, number of
+    # punch records
+    HEADER = struct.Struct('<8sIIIq')
+    # the length of the strings in the tables
+    LENGTH = struct.Struct('<H')
+    # the punch records: clock-in, clock-out, employee index, payday, task kind, padding
+    RECORD = struct.Struct('<qqiihh')
+    # the number of records to pack at a time
+    BATCH = 1 << 16
+
+
+# end of file
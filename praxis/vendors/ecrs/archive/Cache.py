@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import hashlib, os, pickle
+# support
+import praxis
+
+
+# declaration
+class Cache:
+    """
+    An on-disk cache of parsed timecards
+
+    Each timecard file gets an entry in {folder} with a binary snapshot of its parsed contents,
+    tagged with the size, modification time and content hash of the file. An entry is used
+    only if all three still match; otherwise the file is parsed again and the entry replaced
+    """
+
+
+    # types
+    from .Timecard import Timecard as timecard
+
+
+    # public data
+    folder = None # the location of the cache entries
+    hits = 0 # the number of timecards retrieved from the cache
+    misses = 0 # the number of timecards that had to be parsed
+
+
+    # interface
+    def read(self, uri, fast=True):
+        """
+        Retrieve the parsed contents of the timecard file at {uri}, parsing it only if necessary
+        """
+        # look for a matching entry
+        fingerprint, timecard = self.lookup(uri=uri)
+        # if it's there
+        if timecard is not None:
+            # return it
+            return timecard
+        # otherwise, parse the file
+        timecard = self.timecard.read(uri=uri, fast=fast)
+        # save it
+        self.save(uri=uri, fingerprint=fingerprint, timecard=timecard)
+        # and return it
+        return timecard
+
+
+    def lookup(self, uri):
+        """
+        Look for a valid entry for the timecard file at {uri}; return the fingerprint of the file
+        and the parsed timecard, or {None} if the file must be parsed
+        """
+        # compute the fingerprint of the file
+        fingerprint = self.fingerprint(uri=uri)
+        # look for a matching entry
+        timecard = self.load(uri=uri, fingerprint=fingerprint)
+        # update the counters
+        if timecard is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        # and return
+        return fingerprint, timecard
+
+
+    @classmethod
+    def fingerprint(cls, uri):
+        """
+        Compute the size, modification time and content hash of the file at {uri}
+        """
+        # make a hash
+        sha = hashlib.sha256()
+        # open the file
+        with open(uri, mode='rb') as stream:
+            # get its metadata
+            meta = os.fstat(stream.fileno())
+            # go through its contents
+            for chunk in iter(lambda: stream.read(cls.CHUNK), b''):
+                # and hash them
+                sha.update(chunk)
+        # put it all together
+        return (meta.st_size, meta.st_mtime_ns, sha.hexdigest())
+
+
+    def load(self, uri, fingerprint):
+        """
+        Retrieve the entry for the timecard file at {uri}, provided it matches {fingerprint}
+        """
+        # attempt to
+        try:
+            # open the entry
+            with open(self.entry(uri=uri), mode='rb') as stream:
+                # and read it
+                version, stamp, state = pickle.load(stream)
+        # if anything goes wrong
+        except Exception:
+            # treat it as a miss
+            return None
+
+        # if the entry is from a different version of the cache or a different file
+        if version != self.VERSION or tuple(stamp) != fingerprint:
+            # it's stale
+            return None
+
+        # otherwise, rebuild the timecard and return it
+        return self.timecard.unpack(state=state)
+
+
+    def save(self, uri, fingerprint, timecard):
+        """
+        Store the entry for the timecard file at {uri}
+        """
+        # form the name of the entry
+        entry = self.entry(uri=uri)
+        # open it, so that a crash cannot leave a partial entry behind
+        with praxis.support.output(uri=entry, binary=True) as stream:
+            # and save the entry
+            pickle.dump((self.VERSION, fingerprint, timecard.pack()), stream,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        # all done
+        return
+
+
+    def entry(self, uri):
+        """
+        Form the name of the cache entry for the timecard file at {uri}
+        """
+        # get the absolute path of the file
+        path = os.path.abspath(str(uri))
+        # timecards in different folders may have the same name, so tag the name of the file
+        # with a hash of its location
+        tag = hashlib.sha1(path.encode('utf-8')).hexdigest()[:self.TAG]
+        # assemble the name of the entry
+        return os.path.join(
+            self.folder, '{}-{}{}'.format(os.path.basename(path), tag, self.SUFFIX))
+
+
+    # meta-methods
+    def __init__(self, folder, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record the location of the cache
+        self.folder = str(folder)
+        # make sure it exists
+        os.makedirs(self.folder, exist_ok=True)
+        # reset the counters
+        self.hits = 0
+        self.misses = 0
+        # all done
+        return
+
+
+    # constants
+    VERSION = 1
+    SUFFIX = '.timecard'
+    TAG = 16
+    CHUNK = 1 << 20
+
+
+# end of file
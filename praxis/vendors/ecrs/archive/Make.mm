@@ -0,0 +1,27 @@
+# -*- Makefile -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+# project defaults
+PROJECT = praxis
+# the package name
+PACKAGE = vendors/ecrs/archive
+
+# the list of python modules
+EXPORT_PYTHON_MODULES = \
+    Archive.py \
+    Cache.py \
+    Store.py \
+    Timecard.py \
+    Watermark.py \
+    __init__.py
+
+# the standard build targets
+all: export
+
+export:: export-package-python-modules
+
+# end of file
@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import array, bisect, datetime, json, mmap, struct, sys
+# support
+import praxis
+
+
+# declaration
+class Store:
+    """
+    A columnar store of clock punches that spans the entire timecard archive
+
+    The punches are kept in parallel columns, one row per task: the employee index, the payday
+    of the timecard it came from, the clock-in and clock-out times and the task kind. The rows
+    are sorted by employee and clock-in time, and {offsets} marks the block of rows that belongs
+    to each employee, so that date range queries are a bisection over the clock-in column
+
+    Clock-in and clock-out times are in seconds since the epoch, just like in {model.task};
+    paydays are in days since the epoch. The store can be saved to a file and mapped back into
+    memory without copying the columns
+    """
+
+
+    # types
+    from .. import model
+
+
+    # public data
+    people = None # the list of (employee id, name) pairs
+    kinds = None # the list of task names
+    offsets = None # the first row of each employee, followed by the total number of rows
+    employee = None # the employee index of each row
+    payday = None # the payday of each row
+    clockin = None # the clock-in time of each row
+    clockout = None # the clock-out time of each row
+    kind = None # the task kind of each row
+
+
+    @property
+    def rows(self):
+        """
+        The total number of punches in the store
+        """
+        # easy enough
+        return len(self.clockin)
+
+
+    # factories
+    @classmethod
+    def build(cls, dataset):
+        """
+        Build a store out of {dataset}, a sequence of (employee id, name, timecards) triples,
+        where {timecards} is the two level table payday -> date -> punch list that is generated
+        by {Payroll.punches}
+        """
+        # the name table
+        people = []
+        # the task kinds
+        kinds = []
+        kindex = {}
+        # the rows, as (clock-in, clock-out, payday, kind) tuples per employee
+        blocks = []
+        # go through the dataset
+        for eid, name, timecards in dataset:
+            # record the employee
+            people.append((eid, name))
+            # make a pile for their punches
+            block = []
+            # go through their timecards
+            for payday, dates in timecards.items():
+                # convert the payday
+                day = cls.days(payday)
+                # go through the days worked
+                for tasks in dates.values():
+                    # and the tasks
+                    for task in tasks:
+                        # look up the task kind
+                        code = kindex.get(task.name)
+                        # if this is the first time we see it
+                        if code is None:
+                            # assign it a code
+                            code = kindex[task.name] = len(kinds)
+                            # and add it to the pile
+                            kinds.append(task.name)
+                        # pack the row
+                        block.append((task.clockin, task.clockout, day, code))
+            # sort by clock-in time; the sort is stable, so tasks with the same clock-in time
+            # stay in the order they were added
+            block.sort(key=lambda row: row[0])
+            # and save
+            blocks.append(block)
+
+        # build the store and return it
+        return cls.assemble(people=people, kinds=kinds, blocks=blocks)
+
+
+    @classmethod
+    def assemble(cls, people, kinds, blocks):
+        """
+        Build a store out of the name tables and the per employee {blocks} of (clock-in,
+        clock-out, payday, kind) rows, already sorted by clock-in time
+        """
+        # make the columns
+        offsets = array.array('q', [0])
+        employee = array.array('i')
+        payday = array.array('i')
+        clockin = array.array('q')
+        clockout = array.array('q')
+        kind = array.array('B')
+        # go through the blocks
+        for idx, block in enumerate(blocks):
+            # go through the rows
+            for tin, tout, day, code in block:
+                # and transfer them
+                employee.append(idx)
+                payday.append(day)
+                clockin.append(tin)
+                clockout.append(tout)
+                kind.append(code)
+            # mark the end of the block
+            offsets.append(len(clockin))
+
+        # build the store and return it
+        return cls(people=people, kinds=kinds, offsets=offsets, employee=employee,
+                   payday=payday, clockin=clockin, clockout=clockout, kind=kind)
+
+
+    @classmethod
+    def load(cls, uri):
+        """
+        Map the store in the file at {uri} into memory
+        """
+        # open the file
+        with open(uri, mode='rb') as stream:
+            # and map it
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        # make a view
+        view = memoryview(buffer)
+
+        # unpack the header
+        magic, version, size, rows, people = cls.HEADER.unpack_from(view)
+        # check the signature
+        if magic != cls.MAGIC:
+            # and complain
+            raise ValueError('{!r}: not a punch store'.format(str(uri)))
+        # and the version
+        if version != cls.VERSION:
+            # and complain
+            raise ValueError('{!r}: unsupported punch store version {}'.format(str(uri), version))
+        # move past the header
+        offset = cls.HEADER.size
+        # read the tables
+        tables = json.loads(bytes(view[offset:offset+size]).decode('utf-8'))
+        # move past them
+        offset += cls.align(size)
+
+        # the columns, in the order they are stored
+        columns = []
+        # go through the column layout
+        for typecode, count in cls.layout(rows=rows, people=people):
+            # compute the size of the column
+            length = count * struct.calcsize(typecode)
+            # carve out its block
+            columns.append(cls.column(view=view[offset:offset+length], typecode=typecode))
+            # and move on
+            offset += cls.align(length)
+        # unpack
+        offsets, clockin, clockout, employee, payday, kind = columns
+
+        # build the store
+        store = cls(
+            people=[ (eid, tuple(name)) for eid, name in tables['people'] ], kinds=tables['kinds'],
+            offsets=offsets, employee=employee,
+            payday=payday, clockin=clockin, clockout=clockout, kind=kind)
+        # hold on to the map
+        store.buffer = buffer
+        # and return the store
+        return store
+
+
+    # interface
+    def merge(self, other, paydays=None):
+        """
+        Build a new store with my punches and the ones in {other}; my punches in the pay periods
+        with the given {paydays}, or the ones in {other} if not specified, are replaced, so that
+        merging a timecard that was exported again does not duplicate its punches
+        """
+        # the pay periods that get replaced
+        replaced = set(other.payday) if paydays is None else set(map(self.days, paydays))
+        # the name table; employees keep their position, but their names get updated
+        names = dict(self.people)
+        names.update(other.people)
+        # the task kinds
+        kinds = list(self.kinds)
+        kindex = { name: code for code, name in enumerate(kinds) }
+        # go through the task kinds of {other}
+        for name in other.kinds:
+            # if this is the first time we see it
+            if name not in kindex:
+                # assign it a code
+                kindex[name] = len(kinds)
+                # and add it to the pile
+                kinds.append(name)
+        # build the code maps
+        mine = list(range(len(self.kinds)))
+        theirs = [ kindex[name] for name in other.kinds ]
+
+        # the rows, per employee
+        blocks = []
+        # go through the employees
+        for eid in names:
+            # make a pile for their punches
+            block = []
+            # go through the two stores
+            for store, codes in ((self, mine), (other, theirs)):
+                # get the columns
+                payday, clockin, clockout, kind = (
+                    store.payday, store.clockin, store.clockout, store.kind)
+                # go through the rows of this employee
+                for row in store.select(eid=eid):
+                    # get the payday
+                    day = payday[row]
+                    # if this is one of my rows in a pay period that is being replaced
+                    if store is self and day in replaced:
+                        # skip it
+                        continue
+                    # otherwise, pack the row
+                    block.append((clockin[row], clockout[row], day, codes[kind[row]]))
+            # sort by clock-in time
+            block.sort(key=lambda row: row[0])
+            # and save
+            blocks.append(block)
+
+        # build the store and return it
+        return self.assemble(people=list(names.items()), kinds=kinds, blocks=blocks)
+
+
+    def save(self, uri):
+        """
+        Save the store in the file at {uri}
+        """
+        # encode the tables
+        tables = json.dumps({ 'people': self.people, 'kinds': self.kinds }).encode('utf-8')
+        # build the header
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, len(tables), self.rows, len(self.people))
+
+        # open the file, so that a crash cannot leave a partial store behind
+        with praxis.support.output(uri=uri, binary=True) as stream:
+            # write the header
+            stream.write(header)
+            # the tables
+            self.pad(stream=stream, data=tables)
+            # and the columns
+            for column in self.columns():
+                # convert to bytes in the byte order of the format
+                self.pad(stream=stream, data=self.serialize(column=column))
+        # all done
+        return
+
+
+    def close(self):
+        """
+        Release the memory map, if any
+        """
+        # get the map
+        buffer = self.buffer
+        # if there isn't one
+        if buffer is None:
+            # nothing to do
+            return
+        # release the views into the map
+        for column in self.columns():
+            # if it is a view
+            if isinstance(column, memoryview):
+                # release it
+                column.release()
+        # close the map
+        buffer.close()
+        # and forget it
+        self.buffer = None
+        # all done
+        return
+
+
+    def paydays(self):
+        """
+        Build the sorted list of the paydays with punches in the store
+        """
+        # convert and return
+        return [ self.date(day) for day in sorted(set(self.payday)) ]
+
+
+    def select(self, eid, start=None, end=None):
+        """
+        Compute the range of rows of employee {eid} that clocked in on or after {start} and
+        before {end}; either edge may be a date, a datetime, or seconds since the epoch
+        """
+        # get the employee index
+        idx = self.index.get(eid)
+        # if the employee is not in the store
+        if idx is None:
+            # there is nothing to select
+            return range(0)
+        # get the block of rows that belongs to this employee
+        lo, hi = self.offsets[idx], self.offsets[idx+1]
+        # get the clock-in column
+        clockin = self.clockin
+        # if there is a left edge
+        if start is not None:
+            # find the first row that is on or after it
+            lo = bisect.bisect_left(clockin, self.seconds(start), lo, hi)
+        # if there is a right edge
+        if end is not None:
+            # find the first row that is on or after it
+            hi = bisect.bisect_left(clockin, self.seconds(end), lo, hi)
+        # all done
+        return range(lo, hi)
+
+
+    def table(self, eid, first=None, last=None):
+        """
+        Build the two level table payday -> date -> punch list for employee {eid}, with the
+        timecards whose payday is between {first} and {last}, inclusive
+        """
+        # for my services
+        import praxis
+
+        # make a table
+        table = praxis.patterns.vivify(levels=2, atom=self.model.punchlist)
+        # get the columns
+        payday, clockin, clockout, kind = self.payday, self.clockin, self.clockout, self.kind
+        # and the task names
+        kinds = self.kinds
+        # go through the rows in range
+        for row in self.punches(eid=eid, first=first, last=last):
+            # get the clock-in time
+            tin = clockin[row]
+            # and store the task
+            table[self.date(payday[row])][self.date(tin // self.DAY)].newTask(
+                name=kinds[kind[row]], start=tin, finish=clockout[row])
+
+        # all done
+        return table
+
+
+    def punches(self, eid, first=None, last=None):
+        """
+        Generate the rows of employee {eid} in the timecards whose payday is between {first}
+        and {last}, inclusive
+        """
+        # units
+        day = datetime.timedelta(days=1)
+        # the punches in a timecard fall within its pay period, so bisect over the clock-in
+        # times using a generous margin and then filter by payday
+        start = None if first is None else first - 14*day
+        end = None if last is None else last + day
+        # convert the paydays
+        first = None if first is None else self.days(first)
+        last = None if last is None else self.days(last)
+
+        # get the payday column
+        payday = self.payday
+        # go through the candidate rows
+        for row in self.select(eid=eid, start=start, end=end):
+            # get the payday
+            pay = payday[row]
+            # if it's out of range
+            if (first is not None and pay < first) or (last is not None and pay > last):
+                # skip it
+                continue
+            # otherwise, send it off
+            yield row
+
+        # all done
+        return
+
+
+    def employs(self, eid, first=None, last=None):
+        """
+        Check whether employee {eid} has any punches in the timecards whose payday is between
+        {first} and {last}, inclusive
+        """
+        # look for the first one
+        return next(self.punches(eid=eid, first=first, last=last), None) is not None
+
+
+    def dataset(self, eids=None, first=None, last=None):
+        """
+        Generate (employee id, name, timecards) triples for the employees in {eids}, or everybody
+        in the store, with the timecards whose payday is between {first} and {last}; just like
+        parsing the timecards, employees with no punches in them are skipped
+        """
+        # get the name table
+        names = dict(self.people)
+        # go through the employees
+        for eid in (names if eids is None else eids):
+            # build the table
+            table = self.table(eid=eid, first=first, last=last)
+            # if there is nothing in it
+            if not table:
+                # skip this employee
+                continue
+            # otherwise, send it off
+            yield eid, names[eid], table
+        # all done
+        return
+
+
+    # implementation details
+    def columns(self):
+        """
+        Generate the columns in the order they are stored
+        """
+        # easy enough
+        yield self.offsets
+        yield self.clockin
+        yield self.clockout
+        yield self.employee
+        yield self.payday
+        yield self.kind
+        # all done
+        return
+
+
+    @classmethod
+    def layout(cls, rows, people):
+        """
+        Generate the (type code, length) pairs of the stored columns
+        """
+        # the offsets
+        yield 'q', people+1
+        # the timestamps
+        yield 'q', rows
+        yield 'q', rows
+        # the employee index and payday
+        yield 'i', rows
+        yield 'i', rows
+        # the task kind
+        yield 'B', rows
+        # all done
+        return
+
+
+    @classmethod
+    def column(cls, view, typecode):
+        """
+        Build a column of type {typecode} out of the bytes in {view}
+        """
+        # if the stored byte order is the native one
+        if sys.byteorder == cls.BYTEORDER:
+            # use the bytes in place
+            return view.cast(typecode)
+        # otherwise, make a copy
+        column = array.array(typecode, bytes(view))
+        # and fix the byte order
+        column.byteswap()
+        # all done
+        return column
+
+
+    @classmethod
+    def serialize(cls, column):
+        """
+        Convert {column} into bytes in the stored byte order
+        """
+        # if the native byte order matches the stored one
+        if sys.byteorder == cls.BYTEORDER:
+            # just grab the bytes
+            return bytes(column)
+        # otherwise, make a copy
+        column = array.array(column.typecode if isinstance(column, array.array)
+                             else column.format, column)
+        # fix the byte order
+        column.byteswap()
+        # and grab the bytes
+        return column.tobytes()
+
+
+    @classmethod
+    def pad(cls, stream, data):
+        """
+        Write {data} to {stream}, padded so that whatever follows is properly aligned
+        """
+        # write the data
+        stream.write(data)
+        # and the padding
+        stream.write(bytes(cls.align(len(data)) - len(data)))
+        # all done
+        return
+
+
+    @classmethod
+    def align(cls, size):
+        """
+        Round {size} up to the next multiple of {ALIGNMENT}
+        """
+        # easy enough
+        return -(-size // cls.ALIGNMENT) * cls.ALIGNMENT
+
+
+    @classmethod
+    def seconds(cls, timestamp):
+        """
+        Convert {timestamp}, a date, a datetime or seconds since the epoch, into seconds
+        """
+        # if it's a date, but not a datetime
+        if isinstance(timestamp, datetime.date) and not isinstance(timestamp, datetime.datetime):
+            # convert it using its day count
+            return cls.days(timestamp) * cls.DAY
+        # otherwise, let the tasks handle it
+        return cls.model.task.seconds(timestamp)
+
+
+    @classmethod
+    def days(cls, date):
+        """
+        Convert {date} into the number of days since the epoch
+        """
+        # easy enough
+        return (date - cls.EPOCH).days
+
+
+    @classmethod
+    def date(cls, days):
+        """
+        Convert the number of {days} since the epoch into a date
+        """
+        # easy enough
+        return cls.EPOCH + datetime.timedelta(days=days)
+
+
+    # meta-methods
+    def __init__(self, people, kinds, offsets, employee, payday, clockin, clockout, kind,
+                 **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record the tables
+        self.people = people
+        self.kinds = kinds
+        # and the columns
+        self.offsets = offsets
+        self.employee = employee
+        self.payday = payday
+        self.clockin = clockin
+        self.clockout = clockout
+        self.kind = kind
+        # build the employee index
+        self.index = { eid: idx for idx, (eid, _) in enumerate(people) }
+        # no memory map, unless {load} attaches one
+        self.buffer = None
+        # all done
+        return
+
+
+    # constants
+    MAGIC = b'PRXPUNCH'
+    VERSION = 1
+    # the header: signature, version, size of the tables, number of rows, number of employees
+    HEADER = struct.Struct('<8sIIqq')
+    # all blocks start at multiples of this
+    ALIGNMENT = 8
+    # the byte order of the columns
+    BYTEORDER = 'little'
+    # the epoch of the paydays
+    EPOCH = datetime.date(1970, 1, 1)
+    # the number of seconds in a day
+    DAY = 86400
+
+
+# end of file
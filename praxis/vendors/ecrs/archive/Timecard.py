@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import array
+
+
+# declaration
+class Timecard:
+    """
+    A compact snapshot of the contents of a single CATAPULT timecard file
+
+    The punches are kept as a flat array of (employee, clock-in, clock-out) triples, in the
+    order the parser produced them, with the timestamps in seconds since the epoch, just like
+    in {model.task}; the parsing events are kept as (description, line) pairs. This is enough
+    to replay the parse into the usual name and punch tables without going through the file
+    again
+    """
+
+
+    # exceptions
+    from ..exceptions import ParsingError
+    # types
+    from .. import model, reports
+
+
+    # public data
+    source = None # the name of the timecard file
+    people = None # the list of (employee id, name) pairs
+    rows = None # the flat array of (employee index, clock-in, clock-out) triples
+    warnings = None # the parsing warnings, as (description, line) pairs
+    errors = None # the parsing errors, as (description, line) pairs
+
+
+    # factories
+    @classmethod
+    def read(cls, uri, fast=True):
+        """
+        Parse the timecard file at {uri} and build a snapshot of its contents
+        """
+        # make a punch parser
+        parser = cls.reports.punches()
+        # open the file
+        with open(uri) as stream:
+            # parse it
+            names, punches, warnings, errors = parser.parse(stream=stream, fast=fast)
+        # build a snapshot and return it
+        return cls.harvest(source=uri,
+                           names=names, punches=punches, warnings=warnings, errors=errors)
+
+
+    @classmethod
+    def attempt(cls, uri, fast=True):
+        """
+        Same as {read}, except that a fatal parsing error is captured rather than raised, so
+        that the outcome can be shipped across process boundaries
+
+        Returns a pair: the snapshot, or {None} on failure, and the (description, line) of the
+        error, or {None} on success
+        """
+        # attempt to
+        try:
+            # parse the file
+            timecard = cls.read(uri=uri, fast=fast)
+        # if something went wrong
+        except cls.ParsingError as error:
+            # strip the error down to its essentials
+            return None, (error.description, error.locator.line)
+        # if all went well, send off the snapshot
+        return timecard, None
+
+
+    @classmethod
+    def harvest(cls, source, names, punches, warnings, errors):
+        """
+        Build a snapshot out of the output of the punch parser
+        """
+        # assign an index to each employee
+        index = { eid: idx for idx, eid in enumerate(names) }
+        # the name table
+        people = list(names.items())
+        # the punches
+        rows = array.array('q')
+        # go through the employees
+        for eid, dates in punches.items():
+            # get the index
+            idx = index[eid]
+            # go through their work days
+            for tasks in dates.values():
+                # and their tasks
+                for task in tasks:
+                    # pack
+                    rows.extend((idx, task.clockin, task.clockout))
+        # strip the parsing events down to their essentials
+        warnings = [ (event.description, event.locator.line) for event in warnings ]
+        errors = [ (event.description, event.locator.line) for event in errors ]
+        # build the snapshot and return it
+        return cls(source=source, people=people, rows=rows, warnings=warnings, errors=errors)
+
+
+    @classmethod
+    def unpack(cls, state):
+        """
+        Rebuild a snapshot from the output of {pack}
+        """
+        # unpack
+        source, people, raw, warnings, errors = state
+        # rebuild the punches
+        rows = array.array('q')
+        rows.frombytes(raw)
+        # build the snapshot and return it
+        return cls(source=source, people=people, rows=rows, warnings=warnings, errors=errors)
+
+
+    # interface
+    def merge(self, names=None, punches=None, warnings=None, errors=None):
+        """
+        Replay my contents into the given tables, as if the timecard file had been parsed
+        """
+        # for my services
+        import praxis
+
+        # build the payload: the name
+        names = {} if names is None else names
+        # and the time punches
+        punches = praxis.patterns.vivify(
+            levels=2, atom=self.model.punchlist) if punches is None else punches
+        # reset the pile of errors and warnings
+        errors = [] if errors is None else errors
+        warnings = [] if warnings is None else warnings
+
+        # go through the employees
+        for eid, name in self.people:
+            # and record their names
+            names[eid] = name
+
+        # get the timestamp converter
+        timestamp = self.model.task.timestamp
+        # unpack the people
+        eids = [ eid for eid, _ in self.people ]
+        # get the punches
+        rows = self.rows
+        # go through them
+        for idx in range(0, len(rows), 3):
+            # unpack
+            clockin = rows[idx+1]
+            # and store; the tasks can take the timestamps in seconds directly
+            punches[eids[rows[idx]]][timestamp(clockin).date()].newTask(
+                name='in', start=clockin, finish=rows[idx+2])
+
+        # replay the parsing events
+        for description, line in self.warnings:
+            # build a locator
+            here = praxis.tracking.file(source=self.source, line=line)
+            # and a warning
+            warnings.append(self.ParsingError(description=description, locator=here))
+        for description, line in self.errors:
+            # build a locator
+            here = praxis.tracking.file(source=self.source, line=line)
+            # and an error
+            errors.append(self.ParsingError(description=description, locator=here))
+
+        # all done
+        return names, punches, warnings, errors
+
+
+    def pack(self):
+        """
+        Build a representation of my contents that involves only built in types
+        """
+        # easy enough
+        return (self.source, self.people, self.rows.tobytes(), self.warnings, self.errors)
+
+
+    # meta-methods
+    def __init__(self, source, people, rows, warnings, errors, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record my info
+        self.source = source
+        self.people = people
+        self.rows = rows
+        self.warnings = warnings
+        self.errors = errors
+        # all done
+        return
+
+
+# end of file
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import datetime, json, os
+# support
+import praxis
+
+
+# declaration
+class Watermark:
+    """
+    The high-water mark of the incremental ingestion of timecards
+
+    It records the latest payday that was ingested, along with the fingerprints of the timecard
+    files for that pay period and any later ones. Timecards for earlier pay periods are never
+    looked at again, so the work done by each ingestion depends only on the number of new files;
+    the files at the watermark are checked again so that the latest period can be exported again
+    """
+
+
+    # types
+    from .Cache import Cache as cache
+
+
+    # public data
+    payday = None # the latest payday that was ingested
+    files = None # map: file name -> (payday, fingerprint) for the files at or after {payday}
+
+
+    # factories
+    @classmethod
+    def load(cls, uri):
+        """
+        Retrieve the watermark in the file at {uri}; a missing file means nothing was ingested
+        """
+        # if the file is not there
+        if not os.path.exists(uri):
+            # start from scratch
+            return cls(payday=None, files={})
+        # otherwise, open it
+        with open(uri) as stream:
+            # and read it
+            state = json.load(stream)
+        # get the payday
+        payday = state['payday']
+        # convert it
+        payday = None if payday is None else cls.date(payday)
+        # and the files
+        files = {
+            name: (cls.date(stamp), tuple(fingerprint))
+            for name, (stamp, fingerprint) in state['files'].items()
+            }
+        # build the watermark and return it
+        return cls(payday=payday, files=files)
+
+
+    # interface
+    def pending(self, timecards):
+        """
+        Go through the (payday, file name) pairs in {timecards} and generate (payday, file name,
+        fingerprint) triples for the ones that have not been ingested yet
+        """
+        # go through the timecards
+        for payday, uri in timecards:
+            # if they are for a pay period before the watermark
+            if self.payday is not None and payday < self.payday:
+                # skip them
+                continue
+            # compute the fingerprint
+            fingerprint = self.cache.fingerprint(uri=uri)
+            # look up the file
+            record = self.files.get(os.path.basename(uri))
+            # if it was ingested already and it hasn't changed since
+            if record is not None and record[1] == fingerprint:
+                # skip it
+                continue
+            # otherwise, send it off
+            yield payday, uri, fingerprint
+        # all done
+        return
+
+
+    def advance(self, ingested):
+        """
+        Move the watermark past the (payday, file name, fingerprint) triples in {ingested}
+        """
+        # go through the files
+        for payday, uri, fingerprint in ingested:
+            # record their fingerprints
+            self.files[os.path.basename(uri)] = (payday, fingerprint)
+        # the new watermark is the latest payday we know about
+        self.payday = max((payday for payday, _ in self.files.values()), default=self.payday)
+        # forget the files from earlier pay periods
+        self.files = {
+            name: (payday, fingerprint)
+            for name, (payday, fingerprint) in self.files.items() if payday >= self.payday
+            }
+        # all done
+        return
+
+
+    def save(self, uri):
+        """
+        Save the watermark in the file at {uri}
+        """
+        # render the state
+        state = {
+            'payday': None if self.payday is None else self.payday.strftime(self.FORMAT),
+            'files': {
+                name: (payday.strftime(self.FORMAT), fingerprint)
+                for name, (payday, fingerprint) in self.files.items()
+                },
+            }
+        # open the file, so that a crash cannot leave a partial watermark behind
+        with praxis.support.output(uri=uri) as stream:
+            # and save the state
+            json.dump(state, stream, indent=2, sort_keys=True)
+        # all done
+        return
+
+
+    # implementation details
+    @classmethod
+    def date(cls, stamp):
+        """
+        Convert {stamp} into a date
+        """
+        # easy enough
+        return datetime.datetime.strptime(stamp, cls.FORMAT).date()
+
+
+    # meta-methods
+    def __init__(self, payday, files, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record my state
+        self.payday = payday
+        self.files = files
+        # all done
+        return
+
+
+    # constants
+    FORMAT = '%Y%m%d'
+
+
+# end of file
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# compact snapshots of parsed timecards
+from .Timecard import Timecard as timecard
+# and their on-disk cache
+from .Cache import Cache as cache
+# the columnar store of the entire punch archive
+from .Store import Store as store
+# and the binary format for moving punches around
+from .Archive import Archive as archive
+# the high-water mark of incremental ingestion
+from .Watermark import Watermark as watermark
+
+
+# end of file
@@ -16,6 +16,9 @@ class Cash(Tender):
     A cash payment
     """
 
+    # storage
+    __slots__ = ()
+
     # constants
     mode = 'cash'
 
@@ -16,6 +16,9 @@ class ChargeAccount(Tender):
     A payment with a house charge account
     """
 
+    # storage
+    __slots__ = ()
+
     # constants
     mode = 'charge'
 
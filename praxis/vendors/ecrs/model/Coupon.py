@@ -11,10 +11,20 @@ class Coupon:
     Coupon redemption
     """
 
-    # public data
-    item = None
-    code = None
-    amount = 0
+    # storage
+    __slots__ = ('item', 'code', 'amount')
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.item = None
+        self.code = None
+        self.amount = 0
+        # all done
+        return
 
 
 # end of file
@@ -16,6 +16,9 @@ class CreditCard(Tender):
     A credit card payment
     """
 
+    # storage
+    __slots__ = ()
+
 
     # constants
     mode = 'credit'
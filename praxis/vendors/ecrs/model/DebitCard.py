@@ -16,6 +16,9 @@ class DebitCard(Tender):
     A debit card payment
     """
 
+    # storage
+    __slots__ = ()
+
 
     # constants
     mode = 'debit'
@@ -17,4 +17,18 @@ class Discount(Tender):
     """
 
 
+    # storage
+    __slots__ = ('mode',)
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.mode = None
+        # all done
+        return
+
+
 # end of file
@@ -16,9 +16,22 @@ class GiftCard(Tender):
     A payment with a store issued gift card
     """
 
-    # public data
-    account = None
-    amount = 0
+    # storage
+    __slots__ = ('account',)
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.account = None
+        # all done
+        return
+
+
+    # constants
+    mode = 'gift'
 
 
 # end of file
@@ -6,41 +6,43 @@
 #
 
 
+# support
+from .Pile import Pile
+
+
+# declaration
 class Invoice:
     """
     Representation of a financial transaction between two entities
-    """
-
 
-    # public data
-    tid = None
-    start = None
-    finish = None
-    receipt = None
+    A journal holds a very large number of invoices, so they are slotted, and their line items
+    are kept in piles that are only allocated when something is added to them
+    """
 
-    subtotal = 0
-    total = 0
-    tendered = 0
-    change = 0
 
-    void = False
-    training = False
+    # storage
+    __slots__ = (
+        'tid', 'start', 'finish', 'receipt',
+        'subtotal', 'total', 'tendered', 'change',
+        'void', 'training',
+        'terminal', 'cashier', 'customer',
+        '_transactions', '_returns', '_corrections', '_prompts',
+        '_tenders', '_discounts', '_taxes', '_refunds', '_cards', '_history',
+        )
 
-    terminal = None
-    cashier = None
-    customer = None
 
-    transactions = None
-    returns = None
-    corrections = None
-    prompts = None
+    # public data
+    transactions = Pile()
+    returns = Pile()
+    corrections = Pile()
+    prompts = Pile()
 
-    tenders = None
-    discounts = None
-    taxes = None
-    refunds = None
-    cards = None
-    history = None
+    tenders = Pile()
+    discounts = Pile()
+    taxes = Pile()
+    refunds = Pile()
+    cards = Pile()
+    history = Pile()
 
 
     # meta-methods
@@ -48,16 +50,26 @@ class Invoice:
         # chain up
         super().__init__(**kwds)
         # initialize
-        self.transactions = []
-        self.returns = []
-        self.corrections = []
-        self.prompts = []
-        self.tenders = []
-        self.discounts = []
-        self.refunds = []
-        self.taxes = []
-        self.cards = []
-        self.history = []
+        self.tid = None
+        self.start = None
+        self.finish = None
+        self.receipt = None
+
+        self.subtotal = 0
+        self.total = 0
+        self.tendered = 0
+        self.change = 0
+
+        self.void = False
+        self.training = False
+
+        self.terminal = None
+        self.cashier = None
+        self.customer = None
+        # none of the line item piles are allocated yet
+        self._transactions = self._returns = self._corrections = self._prompts = None
+        self._tenders = self._discounts = self._taxes = self._refunds = None
+        self._cards = self._history = None
         # all done
         return
 
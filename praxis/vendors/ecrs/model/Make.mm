@@ -20,11 +20,13 @@ EXPORT_PYTHON_MODULES = \
     Discount.py \
     GiftCard.py \
     Invoice.py \
+    Pile.py \
     Punches.py \
     Refund.py \
     Task.py \
     Tax.py \
     Tender.py \
+    Timeline.py \
     Transaction.py \
     __init__.py
 
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# declaration
+class Pile:
+    """
+    A descriptor for collections of line items that are allocated on first use
+
+    The collection is stored in a slot whose name is the name of the descriptor with a leading
+    underscore, and that starts out as {None}. Until something is added to it, access returns a
+    {Vacancy}, a stand-in that behaves like an empty list and allocates the real one as soon as
+    it is modified; most invoices use only a few of their piles, so most of them are never
+    allocated
+    """
+
+
+    # the stand-in
+    class Vacancy:
+        """
+        The empty collection of line items in a pile that hasn't been allocated yet
+        """
+
+        # storage
+        __slots__ = ('owner', 'member')
+
+        # interface
+        def allocate(self):
+            """
+            Retrieve the real collection, allocating it if necessary
+            """
+            # get the collection; it may have been allocated through a different stand-in
+            pile = self.member.__get__(self.owner)
+            # if it's not there
+            if pile is None:
+                # make one
+                pile = []
+                # and attach it
+                self.member.__set__(self.owner, pile)
+            # all done
+            return pile
+
+        def append(self, item):
+            """
+            Add {item} to the pile
+            """
+            # allocate and delegate
+            return self.allocate().append(item)
+
+        def extend(self, items):
+            """
+            Add the contents of {items} to the pile
+            """
+            # allocate and delegate
+            return self.allocate().extend(items)
+
+        def insert(self, index, item):
+            """
+            Insert {item} in the pile at {index}
+            """
+            # allocate and delegate
+            return self.allocate().insert(index, item)
+
+        # meta-methods
+        def __init__(self, owner, member):
+            # record the owner of the pile and the slot that will hold it
+            self.owner = owner
+            self.member = member
+            # all done
+            return
+
+        def __len__(self):
+            # i am empty
+            return 0
+
+        def __iter__(self):
+            # with nothing to show
+            return iter(())
+
+        def __getitem__(self, index):
+            # behave like an empty list
+            return [][index]
+
+        def __eq__(self, other):
+            # compare equal to empty collections
+            return other == [] or other == ()
+
+        def __repr__(self):
+            # render as an empty list
+            return '[]'
+
+
+    # meta-methods
+    def __set_name__(self, cls, name):
+        # get the slot that holds my collection
+        self.member = cls.__dict__['_' + name]
+        # all done
+        return
+
+
+    def __get__(self, instance, cls):
+        # when accessed through the class
+        if instance is None:
+            # return the descriptor
+            return self
+        # get the collection
+        pile = self.member.__get__(instance, cls)
+        # if it hasn't been allocated yet
+        if pile is None:
+            # return a stand-in
+            return self.Vacancy(owner=instance, member=self.member)
+        # otherwise, return it
+        return pile
+
+
+    def __set__(self, instance, pile):
+        # store the collection
+        self.member.__set__(instance, pile)
+        # all done
+        return
+
+
+# end of file
@@ -6,14 +6,14 @@
 #
 
 
-# externals
-import itertools, operator
-
-
 # declaration
 class Punches(list):
     """
     Encapsulation of the time spent on specific tasks during a work period
+
+    The totals of hours worked and breaks taken are computed on first access and cached; any
+    change to the list itself discards them, and so does any change to a task, which bumps the
+    {task.revision} the totals were computed at. Either way, checking them takes constant time
     """
 
 
@@ -21,14 +21,22 @@ class Punches(list):
     from .Task import Task as task
 
 
+    # storage
+    __slots__ = ('_hours', '_breaks', '_revision')
+
+
     # public data
     @property
     def hours(self):
         """
         Compute the total number of hours worked during this work period
         """
-        # compute the total number of hours in this work period
-        return sum(task.hours for task in self.billable)
+        # if the totals are stale
+        if self.stale():
+            # recompute them
+            self.summarize()
+        # and return the hours
+        return self._hours
 
 
     @property
@@ -37,12 +45,12 @@ class Punches(list):
         Compute the total amount of time in this work period that was not covered by the recorded
         tasks
         """
-        # double up on the billables
-        this, after = itertools.tee(self.billable)
-        # make sure after starts at the second billable task, if it exists
-        next(after, None)
-        # sum up the time in between tasks
-        return sum((t2.start - t1.finish).total_seconds()/3600 for t1,t2 in zip(this, after))
+        # if the totals are stale
+        if self.stale():
+            # recompute them
+            self.summarize()
+        # and return the breaks
+        return self._breaks
 
 
     @property
@@ -59,16 +67,211 @@ class Punches(list):
     # interface
     def newTask(self, name, start, finish):
         """
-        Create and store a new task in this work period
+        Create and store a new task in this work period; the timestamps may be given either as
+        {datetime} objects or as seconds since the epoch
         """
         # build one
         task = self.task(name=name, start=start, finish=finish)
+        # get its clock-in time
+        clockin = task.clockin
+        # tasks tend to arrive in chronological order, so if this one starts no earlier than
+        # my last one
+        if not self or self[-1].clockin <= clockin:
+            # just store it
+            self.append(task)
+            # and return it
+            return task
+
+        # otherwise, look for the insertion point that keeps me sorted by start time; tasks
+        # with the same start time stay in the order they were added
+        lo, hi = 0, len(self)
+        # bisect
+        while lo < hi:
+            # split the range
+            mid = (lo + hi) // 2
+            # and pick a side
+            if clockin < self[mid].clockin:
+                hi = mid
+            else:
+                lo = mid + 1
         # store it
-        self.append(task)
-        # sort me
-        self.sort(key=operator.attrgetter('start'))
+        self.insert(lo, task)
         # and return it
         return task
 
 
+    def summarize(self):
+        """
+        Compute the hours worked and the breaks taken in a single pass through my billable tasks
+        """
+        # note the revision of the tasks
+        revision = self.task.revision
+        # initialize the totals
+        hours = 0
+        breaks = 0
+        # the clock-out time of the previous billable task
+        last = None
+        # go through my billable tasks
+        for task in self.billable:
+            # add its duration to the time worked
+            hours += task.hours
+            # if there was a task before it
+            if last is not None:
+                # add the time in between to the breaks
+                breaks += (task.clockin - last) / 3600
+            # and move on
+            last = task.clockout
+        # cache the totals
+        self._hours = hours
+        self._breaks = breaks
+        # along with the revision they were computed at
+        self._revision = revision
+        # all done
+        return
+
+
+    def stale(self):
+        """
+        Check whether my cached totals are missing, or some task changed since they were
+        computed
+        """
+        # easy enough
+        return self._hours is None or self._revision != self.task.revision
+
+
+    def invalidate(self):
+        """
+        Discard the cached totals
+        """
+        # easy enough
+        self._hours = None
+        self._breaks = None
+        self._revision = None
+        # all done
+        return
+
+
+    # mutators; each one makes sure my totals are recomputed on the next access
+    def append(self, task):
+        # store the task
+        super().append(task)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def insert(self, index, task):
+        # store the task
+        super().insert(index, task)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def extend(self, tasks):
+        # store the tasks
+        super().extend(tasks)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def __iadd__(self, tasks):
+        # delegate
+        self.extend(tasks)
+        # and return myself
+        return self
+
+
+    def __setitem__(self, index, value):
+        # store
+        super().__setitem__(index, value)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def __delitem__(self, index):
+        # remove
+        super().__delitem__(index)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def remove(self, task):
+        # remove
+        super().remove(task)
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def pop(self, index=-1):
+        # remove
+        task = super().pop(index)
+        # discard my totals
+        self.invalidate()
+        # and return the task
+        return task
+
+
+    def clear(self):
+        # remove everything
+        super().clear()
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def sort(self, **kwds):
+        # sort
+        super().sort(**kwds)
+        # and discard my totals, since the breaks depend on the order of the tasks
+        self.invalidate()
+        # all done
+        return
+
+
+    def reverse(self):
+        # reverse
+        super().reverse()
+        # and discard my totals
+        self.invalidate()
+        # all done
+        return
+
+
+    def __imul__(self, count):
+        # replicate
+        super().__imul__(count)
+        # and discard my totals
+        self.invalidate()
+        # return myself
+        return self
+
+
+    # meta-methods
+    def __init__(self, tasks=(), **kwds):
+        # chain up
+        super().__init__(tasks, **kwds)
+        # there are no totals yet
+        self.invalidate()
+        # all done
+        return
+
+
+    def __reduce__(self):
+        # the revisions are only meaningful within a process, so leave the totals behind and
+        # let the copy compute its own
+        return type(self), (list(self),)
+
+
 # end of file
@@ -11,11 +11,23 @@ class Refund:
     Moneys returned to the customer
     """
 
+    # storage
+    __slots__ = ('description', 'amount')
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.description = None
+        self.amount = 0
+        # all done
+        return
+
+
     # constants
     mode = 'refund'
 
-    # public data
-    amount = 0
-
 
 # end of file
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+import datetime
+
+
 # declaration
 class Task:
     """
@@ -13,14 +17,124 @@ class Task:
     clock-out. The format is
 
         (task name, clock-in timestamp, clock-out timestamp)
+
+    The timestamps are stored as the number of seconds since {EPOCH}, and converted to and from
+    {datetime} objects on access; they are also available in seconds as {clockin} and
+    {clockout}
+
+    Tasks don't know which punch list holds them; instead, every change to the timestamps or
+    the billable flag of any task bumps {revision}, so punch lists can tell whether their
+    cached totals are still good with a single comparison
     """
 
 
+    # storage
+    __slots__ = ('name', '_clockin', '_clockout', '_billable')
+
+
     # public data
-    name = None
-    start = None
-    finish = None
-    billable = True
+    revision = 0 # the number of changes to the timestamps of all tasks in this process
+
+
+    @property
+    def start(self):
+        """
+        The clock-in timestamp
+        """
+        # convert and return
+        return self.timestamp(self.clockin)
+
+    @start.setter
+    def start(self, timestamp):
+        """
+        Set the clock-in timestamp
+        """
+        # convert and store
+        self.clockin = self.seconds(timestamp)
+        # all done
+        return
+
+
+    @property
+    def finish(self):
+        """
+        The clock-out timestamp
+        """
+        # convert and return
+        return self.timestamp(self.clockout)
+
+    @finish.setter
+    def finish(self, timestamp):
+        """
+        Set the clock-out timestamp
+        """
+        # convert and store
+        self.clockout = self.seconds(timestamp)
+        # all done
+        return
+
+
+    @property
+    def clockin(self):
+        """
+        The clock-in time, in seconds since {EPOCH}
+        """
+        # easy enough
+        return self._clockin
+
+    @clockin.setter
+    def clockin(self, seconds):
+        """
+        Set the clock-in time, in seconds since {EPOCH}
+        """
+        # store
+        self._clockin = seconds
+        # and record the change
+        Task.revision += 1
+        # all done
+        return
+
+
+    @property
+    def clockout(self):
+        """
+        The clock-out time, in seconds since {EPOCH}
+        """
+        # easy enough
+        return self._clockout
+
+    @clockout.setter
+    def clockout(self, seconds):
+        """
+        Set the clock-out time, in seconds since {EPOCH}
+        """
+        # store
+        self._clockout = seconds
+        # and record the change
+        Task.revision += 1
+        # all done
+        return
+
+
+    @property
+    def billable(self):
+        """
+        Whether the time spent on this task counts towards the hours worked
+        """
+        # easy enough
+        return self._billable
+
+    @billable.setter
+    def billable(self, flag):
+        """
+        Mark this task as billable or not
+        """
+        # store
+        self._billable = flag
+        # and record the change
+        Task.revision += 1
+        # all done
+        return
 
 
     @property
@@ -29,20 +143,50 @@ class Task:
         Compute the duration of this task in hours
         """
         # compute my duration and convert into hours
-        return (self.finish - self.start).total_seconds() / 3600
+        return (self._clockout - self._clockin) / 3600
+
+
+    # timestamp conversions
+    @classmethod
+    def seconds(cls, timestamp):
+        """
+        Convert {timestamp} into the number of seconds since {EPOCH}; integers are assumed to
+        be converted already
+        """
+        # if it's already in seconds
+        if isinstance(timestamp, int):
+            # leave it alone
+            return timestamp
+        # otherwise, convert
+        return (timestamp - cls.EPOCH) // cls.SECOND
+
+
+    @classmethod
+    def timestamp(cls, seconds):
+        """
+        Convert the number of {seconds} since {EPOCH} into a timestamp
+        """
+        # easy enough
+        return cls.EPOCH + datetime.timedelta(seconds=seconds)
 
 
     # meta-methods
-    def __init__(self, name, start, finish, billable=billable, **kwds):
+    def __init__(self, name, start, finish, billable=True, **kwds):
         # chain up
         super().__init__(**kwds)
         # record my info
         self.name = name
-        self.start = start
-        self.finish = finish
-        self.billable = billable
+        self._clockin = self.seconds(start)
+        self._clockout = self.seconds(finish)
+        self._billable = billable
         # all done
         return
 
 
+    # constants
+    # the timecards have no timezone information, so the epoch is naive as well
+    EPOCH = datetime.datetime(1970, 1, 1)
+    SECOND = datetime.timedelta(seconds=1)
+
+
 # end of file
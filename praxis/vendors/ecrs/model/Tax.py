@@ -17,4 +17,18 @@ class Tax(Tender):
     """
 
 
+    # storage
+    __slots__ = ('type',)
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.type = None
+        # all done
+        return
+
+
 # end of file
@@ -12,4 +12,18 @@ class Tender:
     """
 
 
+    # storage
+    __slots__ = ('amount',)
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.amount = 0
+        # all done
+        return
+
+
 # end of file
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import bisect, datetime
+
+
+# declaration
+class Timeline:
+    """
+    An interval index of the tasks of a single employee, across any number of days
+
+    The tasks are kept sorted by clock-in time, next to a parallel list of their clock-in
+    times, so that finding the tasks that touch a given time span is a bisection followed by a
+    short scan; the scan is bounded by the duration of the longest task seen so far. Tasks can
+    be inserted, trimmed, split, merged and deleted, and every edit is recorded in {changes} as
+    an (operation, before, after) triplet, where {before} and {after} are (name, clock-in,
+    clock-out) snapshots of the affected task, or {None}
+    """
+
+
+    # types
+    from .Task import Task as task
+    from .Punches import Punches as punchlist
+
+
+    # public data
+    tasks = None # the tasks, sorted by clock-in time
+    starts = None # their clock-in times, in seconds since the epoch
+    changes = None # the list of edits, as (operation, before, after) triplets
+    longest = 0 # the duration of the longest task, in seconds
+
+
+    # interface
+    def add(self, task):
+        """
+        Index {task} without recording it as a change; this is how existing tasks are loaded
+        """
+        # find the insertion point that keeps the tasks sorted; tasks with the same start time
+        # stay in the order they were added
+        index = bisect.bisect_right(self.starts, task.clockin)
+        # store the task
+        self.tasks.insert(index, task)
+        # and its clock-in time
+        self.starts.insert(index, task.clockin)
+        # update the bound on task durations
+        self.longest = max(self.longest, task.clockout - task.clockin)
+        # all done
+        return task
+
+
+    def insert(self, name, start, finish):
+        """
+        Make a new task and index it
+        """
+        # make the task and add it
+        task = self.add(task=self.task(name=name, start=start, finish=finish))
+        # record the change
+        self.changes.append(('insert', None, self.snapshot(task)))
+        # and return the task
+        return task
+
+
+    def delete(self, task):
+        """
+        Remove {task}
+        """
+        # take a picture
+        before = self.snapshot(task)
+        # remove it
+        self.remove(task)
+        # record the change
+        self.changes.append(('delete', before, None))
+        # all done
+        return
+
+
+    def trim(self, task, start=None, finish=None, name=None):
+        """
+        Move the clock-in time of {task} to {start} and its clock-out time to {finish}, and
+        rename it to {name}; the edges that are {None} are left alone
+        """
+        # if there is nothing to do
+        if start is None and finish is None:
+            # bail
+            return task
+        # take a picture
+        before = self.snapshot(task)
+        # pull it out of the index, since its clock-in time may change
+        self.remove(task)
+        # adjust the edges
+        if start is not None:
+            task.start = start
+        if finish is not None:
+            task.finish = finish
+        # and the name
+        if name is not None:
+            task.name = name
+        # put it back
+        self.add(task)
+        # record the change
+        self.changes.append(('trim', before, self.snapshot(task)))
+        # all done
+        return task
+
+
+    def split(self, task, start, finish, name=None):
+        """
+        Cut the span from {start} to {finish} out of {task}, leaving behind two tasks: {task}
+        itself up to {start}, and a new one from {finish} to the original clock-out; both are
+        renamed to {name}, if given
+        """
+        # take a picture
+        before = self.snapshot(task)
+        # make the second half
+        second = self.task(name=name or task.name, start=finish, finish=task.clockout)
+        # pull the task out of the index
+        self.remove(task)
+        # cut it short
+        task.finish = start
+        # rename it
+        if name is not None:
+            task.name = name
+        # and put both halves in the index
+        self.add(task)
+        self.add(second)
+        # record the change as a trim and an insertion
+        self.changes.append(('split', before, self.snapshot(task)))
+        self.changes.append(('split', None, self.snapshot(second)))
+        # all done
+        return task, second
+
+
+    def merge(self, first, second, name=None):
+        """
+        Replace {first} and {second} with a single task that covers both; {first} survives and
+        is renamed to {name}, if given
+        """
+        # take pictures
+        one, two = self.snapshot(first), self.snapshot(second)
+        # pull both out of the index
+        self.remove(first)
+        self.remove(second)
+        # stretch the survivor
+        first.clockin = min(first.clockin, second.clockin)
+        first.clockout = max(first.clockout, second.clockout)
+        # rename it
+        if name is not None:
+            first.name = name
+        # and put it back
+        self.add(first)
+        # record the change as a removal and a trim
+        self.changes.append(('merge', two, None))
+        self.changes.append(('merge', one, self.snapshot(first)))
+        # all done
+        return first
+
+
+    def overlapping(self, start, finish):
+        """
+        Build the list of tasks, in chronological order, that share some time with the span
+        from {start} to {finish}; the edges may be datetimes or seconds since the epoch
+        """
+        # convert the edges
+        start, finish = self.task.seconds(start), self.task.seconds(finish)
+        # get the tasks
+        tasks = self.tasks
+        # everything that clocked in before {finish} is a candidate
+        index = bisect.bisect_left(self.starts, finish)
+        # but nothing that clocked in earlier than the longest task before {start} can reach it
+        floor = bisect.bisect_left(self.starts, start - self.longest, 0, index)
+        # so scan the candidates
+        return [ task for task in tasks[floor:index] if task.clockout > start ]
+
+
+    def day(self, date):
+        """
+        Build the list of tasks, in chronological order, that clocked in on {date}
+        """
+        # get the edges of the day
+        start = self.task.seconds(datetime.datetime.combine(date, datetime.time()))
+        finish = start + self.DAY
+        # locate them
+        lo = bisect.bisect_left(self.starts, start)
+        hi = bisect.bisect_left(self.starts, finish, lo)
+        # and return the tasks in between
+        return self.tasks[lo:hi]
+
+
+    def overlaps(self):
+        """
+        Generate the pairs of tasks that share some time
+        """
+        # the task that reaches the farthest so far
+        reach = None
+        # go through the tasks in order
+        for task in self.tasks:
+            # if it starts before the farthest reaching one is over
+            if reach is not None and task.clockin < reach.clockout:
+                # we have an overlap
+                yield reach, task
+            # update the farthest reaching task
+            if reach is None or task.clockout > reach.clockout:
+                reach = task
+        # all done
+        return
+
+
+    def gaps(self, start, finish):
+        """
+        Generate the spans between {start} and {finish} that are not covered by any task, as
+        pairs of seconds since the epoch
+        """
+        # convert the edges
+        start, finish = self.task.seconds(start), self.task.seconds(finish)
+        # the first moment not covered yet
+        cursor = start
+        # go through the tasks in the span
+        for task in self.overlapping(start=start, finish=finish):
+            # if there is a hole before this one
+            if task.clockin > cursor:
+                # send it off
+                yield cursor, task.clockin
+            # move past the task
+            cursor = max(cursor, task.clockout)
+        # if there is a hole at the end
+        if cursor < finish:
+            # send it off too
+            yield cursor, finish
+        # all done
+        return
+
+
+    def table(self):
+        """
+        Build the table date -> punch list of my tasks, keyed by the date of their clock-in time
+        """
+        # make a table
+        table = {}
+        # go through the tasks
+        for task in self.tasks:
+            # get the date
+            date = task.start.date()
+            # get the punch list for that day
+            punches = table.get(date)
+            # if this is the first task of the day
+            if punches is None:
+                # make one
+                punches = table[date] = self.punchlist()
+            # add the task
+            punches.append(task)
+        # all done
+        return table
+
+
+    # implementation details
+    def remove(self, task):
+        """
+        Pull {task} out of the index
+        """
+        # get the clock-in times
+        starts = self.starts
+        # find the first task that clocked in at the same time
+        index = bisect.bisect_left(starts, task.clockin)
+        # go through the tasks that share the clock-in time
+        while self.tasks[index] is not task:
+            # until we find this one
+            index += 1
+        # remove it
+        del self.tasks[index]
+        del starts[index]
+        # all done
+        return
+
+
+    @staticmethod
+    def snapshot(task):
+        """
+        Take a picture of {task}
+        """
+        # easy enough
+        return task.name, task.clockin, task.clockout
+
+
+    # meta-methods
+    def __init__(self, tasks=(), **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize the index
+        self.tasks = []
+        self.starts = []
+        # and the list of edits
+        self.changes = []
+        # index the initial tasks
+        for task in tasks:
+            self.add(task)
+        # all done
+        return
+
+
+    def __len__(self):
+        # the number of tasks
+        return len(self.tasks)
+
+
+    def __iter__(self):
+        # the tasks in order
+        return iter(self.tasks)
+
+
+    # constants
+    DAY = 86400
+
+
+# end of file
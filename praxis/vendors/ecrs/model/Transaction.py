@@ -10,12 +10,24 @@ class Transaction:
     """
     Transaction line item details
     """
-    # public data
-    item = None
-    description = None
-    quantity = 0
-    price = 0
-    amount = 0
+
+
+    # storage
+    __slots__ = ('item', 'description', 'quantity', 'price', 'amount')
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize
+        self.item = None
+        self.description = None
+        self.quantity = 0
+        self.price = 0
+        self.amount = 0
+        # all done
+        return
 
 
 # end of file
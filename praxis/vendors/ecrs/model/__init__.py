@@ -23,5 +23,6 @@ from .Transaction import Transaction as transaction
 # timecards
 from .Punches import Punches as punchlist
 from .Task import Task as task
+from .Timeline import Timeline as timeline
 
 # end of file
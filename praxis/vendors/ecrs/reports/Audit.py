@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import datetime
+
+
+# declaration
+class Audit:
+    """
+    The per employee reports of the payroll actions, packaged so they can run on a pool of
+    processes
+
+    Each report takes an employee id, the (last, first) name and the timecards of the employee,
+    as a table payday -> date -> punch list, and returns the name of the output file, its rows,
+    and a summary for the console. If the timecards are {None}, they are pulled from the punch
+    {store}, which is mapped into memory once per {batch} of employees, so the punches never
+    have to be shipped between processes. The {jurisdiction} is a component, so it travels by
+    class and is instantiated again on the other side
+    """
+
+
+    # public data
+    jurisdiction = None # the compliant calculators
+    store = None # the file with the columnar punch store, if any
+    start = None # the first day of the period of interest
+    end = None # the last day of the period of interest
+
+
+    # interface
+    def breaks(self, eid, name, timecards):
+        """
+        Compare the hours worked in each pay period with the hours the employee would have been
+        paid for if the half hour breaks were enforced; the summary is the number of pay periods
+        with a difference and the total regular, overtime and double time differences
+        """
+        # units
+        day = datetime.timedelta(1)
+        # get the jurisdiction
+        js = self.jurisdiction
+        # get the timecards
+        timecards = self.timecards(eid=eid, timecards=timecards)
+        # unpack the name
+        last, first = name
+        # assemble the name of the output file
+        outfile = ''.join(''.join((last, first)).split()) + '-pay.csv'
+        # start the pile of rows with the employee name
+        rows = [ ("Employee:", last, first) ]
+        # add my headers
+        rows.append(("Pay Period", "", "Raw", "", "Breaks", "", "Difference", ""))
+        rows.append(("Start", "End",
+                     "Regular", "Overtime", "Regular", "Overtime", "Regular", "Overtime"))
+
+        # initialize the instance count
+        instances = 0
+        # my accumulators
+        rawRegular, rawSesqui, rawDouble = 0,0,0
+        brkRegular, brkSesqui, brkDouble = 0,0,0
+        # and for each available time card
+        for payday in sorted(timecards, reverse=True):
+            # get the tasks
+            tasks = timecards[payday]
+            # compute the start of the pay period
+            start = payday - 13*day
+            # initialize the row
+            record = [start,payday]
+            # compute the raw hours worked this date
+            raw = js.overtime(start=start, workweeks=2, timecard=tasks)
+            # sum up
+            regularR, sesquiR, doubleR = map(sum, zip(*raw))
+            # save in the current row
+            record += ["{:.2f}".format(regularR), "{:.2f}".format(sesquiR)]
+            # and update the raw accumulators
+            rawRegular += regularR
+            rawSesqui += sesquiR
+            rawDouble += doubleR
+
+            # repeat for hours adjusted for the missing breaks
+            breaks = js.breaks(start=start, workweeks=2, timecard=tasks)
+            # sum up
+            regularB, sesquiB, doubleB = map(sum, zip(*breaks))
+            # save in the current row
+            record += ["{:.2f}".format(regularB), "{:.2f}".format(sesquiB)]
+            # and update the raw accumulators
+            brkRegular += regularB
+            brkSesqui += sesquiB
+            brkDouble += doubleB
+
+            # compute the deltas
+            regularD = regularR - regularB
+            sesquiD = sesquiR - sesquiB
+            doubleD = doubleR - doubleB
+
+            # save the difference
+            record += ["{:.2f}".format(regularD), "{:.2f}".format(sesquiD)]
+
+            # update the instance count
+            if regularD > 0.1 or sesquiD > 0.1: instances += 1
+
+            # and record
+            rows.append(record)
+
+        # build the summary
+        summary = (instances,
+                   rawRegular - brkRegular, rawSesqui - brkSesqui, rawDouble - brkDouble)
+        # all done
+        return outfile, rows, summary
+
+
+    def record(self, eid, name, timecards):
+        """
+        Collect the clock punches of the employee, most recent first; there is no summary
+        """
+        # get the timecards
+        timecards = self.timecards(eid=eid, timecards=timecards)
+        # unpack the name
+        last, first = name
+        # assemble the name of the output file
+        outfile = ''.join(''.join((last, first)).split()) + '-time.csv'
+        # leave behind the employee name in the first row
+        rows = [ (last, first) ]
+
+        # focus on the paydays that are relevant for this employee
+        for payday in sorted(timecards, reverse=True):
+            # get the days worked during this pay period
+            entries = timecards[payday]
+            # and go through them in order
+            for date in sorted(entries, reverse=True):
+                # go through each task
+                for task in entries[date]:
+                    # compute the difference and convert into hours
+                    delta = (task.finish - task.start).total_seconds() / 3600
+                    # add a line to the file
+                    rows.append((date, task.start, task.finish, "{:.2f}".format(delta)))
+
+        # all done
+        return outfile, rows, None
+
+
+    def edd(self, eid, name, timecards):
+        """
+        Tabulate the hours worked by the employee in each week of the period of interest, for an
+        EDD benefits audit; there is no summary
+        """
+        # units
+        day = datetime.timedelta(1)
+        # get the jurisdiction
+        js = self.jurisdiction
+        # get the timecards
+        timecards = self.timecards(eid=eid, timecards=timecards)
+        # unpack the name
+        last, first = name
+        # figure out how many overtime tiers in this jurisdiction, hence the size of the tuple
+        # returned by the overtime calculator
+        tiers = js.overtimeTiers
+        # build a zero-hour tuple for the missing days
+        zero = (0,)*len(tiers)
+
+        # initialize the record
+        attendance = {}
+        # go through the timecards
+        for payday in sorted(timecards):
+            # back up to the first day of the period
+            paystart = payday - 13*day
+            # prime the hour classifier
+            worked = js.overtime2(start=paystart, workweeks=2, timecard=timecards[payday])
+            # go through the record
+            for date, (reg, ovr, dbl) in worked:
+                # and save it
+                attendance[date] = (reg, ovr, dbl)
+
+        # the headers for the CSV file
+        headers = [
+            "week start", "week end",
+            "reg", "ovr", "dbl", "effective",
+            "pay rate", "gross"
+        ]
+        # initialize the audit record for this employee
+        audit = [headers]
+        # go through the period of interest
+        start = self.start
+        while start < self.end:
+            # mark the beginning of the week
+            wkstart = start
+            # and the end
+            wkend = start + 6*day
+            # accumulate the hours worked this week
+            worked = (attendance.get(start+dt*day, zero) for dt in range(7))
+            # add them up
+            total = tuple(map(sum, zip(*worked)))
+            # project onto the overtime tiers to get the total effective hours worked
+            effective = sum(hours*tier for hours, tier in zip(total, tiers))
+            # build a record
+            record = (
+                (wkstart, wkend)
+                + tuple('{:.2f}'.format(category) for category in total)
+                + ('{:.2f}'.format(effective),)
+                )
+            # and add it to the audit
+            audit.append(record)
+            # move on to the next week in range
+            start += 7*day
+
+        # smoosh the name of the employee
+        outfile = '{}{}-edd.csv'.format(''.join(first.split()), ''.join(last.split()))
+        # all done
+        return outfile, audit, None
+
+
+    def batch(self, report, jobs):
+        """
+        Run {report} on each (employee id, name, timecards) triple in {jobs} and return the list
+        of its results; if the punch store is needed, it is mapped once for the whole batch and
+        released at the end
+        """
+        # get the report
+        work = getattr(self, report)
+        # attempt to
+        try:
+            # run it
+            return [
+                work(eid=eid, name=name, timecards=timecards) for eid, name, timecards in jobs ]
+        # no matter what
+        finally:
+            # release the punch store
+            self.close()
+
+
+    def close(self):
+        """
+        Release the punch store, if it is mapped
+        """
+        # if it is
+        if self._store is not None:
+            # release it
+            self._store.close()
+            # and forget it
+            self._store = None
+        # all done
+        return
+
+
+    # implementation details
+    def timecards(self, eid, timecards):
+        """
+        Retrieve the timecards of employee {eid}, from the punch store if they weren't supplied
+        """
+        # if we have them
+        if timecards is not None:
+            # use them
+            return timecards
+        # otherwise, get the store
+        store = self.punches()
+        # units
+        day = datetime.timedelta(1)
+        # and pull the timecards whose pay periods overlap the period of interest
+        return store.table(eid=eid, first=self.start, last=self.end + 13*day)
+
+
+    def punches(self):
+        """
+        Map the punch store into memory, the first time it is needed
+        """
+        # if it's not mapped yet
+        if self._store is None:
+            # for my services
+            from ..archive import store
+            # map it
+            self._store = store.load(uri=self.store)
+        # and return it
+        return self._store
+
+
+    # meta-methods
+    def __init__(self, jurisdiction, store=None, start=None, end=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.jurisdiction = jurisdiction
+        self.store = store
+        self.start = start
+        self.end = end
+        # the punch store is mapped on first use
+        self._store = None
+        # all done
+        return
+
+
+    def __getstate__(self):
+        # get my state
+        state = dict(self.__dict__)
+        # the jurisdiction travels by class
+        state['jurisdiction'] = type(self.jurisdiction)
+        # and the punch store is mapped again on the other side
+        state['_store'] = None
+        # all done
+        return state
+
+
+    def __setstate__(self, state):
+        # restore my state
+        self.__dict__.update(state)
+        # and instantiate the jurisdiction
+        self.jurisdiction = self.jurisdiction()
+        # all done
+        return
+
+
+# end of file
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import datetime
+import io
+# superclass
+from .Audit import Audit
+
+
+# declaration
+class Detail(Audit):
+    """
+    The LaTeX document with the punch clock detail of the selected employees
+
+    The document is assembled out of templates that are compiled once per process: there is a
+    template for each of the fourteen rows of a pay period and each shape of the punches of a
+    day, so every day is rendered by a single call to {str.format} and written straight into
+    the output buffer. Each employee gets an attendance table per pay period in the period of
+    interest; the tables can be collected in a single document, or wrapped in a document of
+    their own by {packet}
+    """
+
+
+    # public data
+    include = None # the folder with the LaTeX support files
+    graphics = None # the folder with the images
+
+
+    # interface
+    def document(self, stream, attendance):
+        """
+        Write a complete document to {stream}, with the {attendance} tables of the employees
+        """
+        # the preamble
+        stream.write(self.PREAMBLE.format(
+            include=self.include, graphics=self.graphics, start=self.start, end=self.end))
+        # the tables
+        for table in attendance:
+            # go in
+            stream.write(table)
+        # and the postamble
+        stream.write(self.POSTAMBLE)
+        # all done
+        return stream
+
+
+    def attendance(self, eid, name, timecards):
+        """
+        Render the attendance tables of employee {eid}; returns {None} for the file name, since
+        the tables are meant to be collected in a larger document, the tables, and the dates with
+        more punches than can fit in a row
+        """
+        # make a buffer
+        stream = io.StringIO()
+        # render the tables
+        crowded = self.render(stream=stream, eid=eid, name=name, timecards=timecards)
+        # all done
+        return None, stream.getvalue(), crowded
+
+
+    def packet(self, eid, name, timecards):
+        """
+        Render a document with the attendance tables of employee {eid} only; returns the name of
+        the file, the document, and the dates with more punches than can fit in a row
+        """
+        # unpack the name
+        last, first = name
+        # make a buffer
+        stream = io.StringIO()
+        # render the tables
+        _, tables, crowded = self.attendance(eid=eid, name=name, timecards=timecards)
+        # wrap them in a document
+        self.document(stream=stream, attendance=[tables])
+        # smoosh the name of the employee
+        smooshed = ''.join(''.join((last, first)).split())
+        # assemble the name of the output file
+        outfile = '{}-{:%Y%m%d}-detail.tex'.format(smooshed, self.end)
+        # all done
+        return outfile, stream.getvalue(), crowded
+
+
+    def render(self, stream, eid, name, timecards):
+        """
+        Write the attendance tables of employee {eid} to {stream}, one per pay period, and
+        return the dates with more than two punches
+        """
+        # units
+        day = datetime.timedelta(1)
+        # get the jurisdiction
+        js = self.jurisdiction
+        # get the timecards
+        timecards = self.timecards(eid=eid, timecards=timecards)
+        # get the compiled templates
+        rows = self.compile()
+        # and the hour formatter
+        hours = self.hours
+        # unpack the name
+        last, first = name
+        # the title of the tables mentions the pay period when there is more than one of them
+        periodic = (self.end - self.start).days >= 14
+        # the dates with too many punches
+        crowded = []
+
+        # go through the pay periods
+        for payday in sorted(timecards):
+            # get the punches
+            timecard = timecards[payday]
+            # back up to the first day of the period
+            paystart = payday - 13*day
+            # build the title
+            title = '{} {}'.format(first, last)
+            # if there is more than one pay period in the document
+            if periodic:
+                # add the pay period to it
+                title = self.PERIOD.format(title=title, start=paystart, end=payday)
+            # the attendance header
+            stream.write(self.HEADER.format(first=first, last=last, title=title))
+
+            # prime the streaming overtime calculator
+            overtime = js.overtime2(start=paystart, workweeks=2, timecard=timecard)
+            # go through the days
+            for position, (date, (reg, ovr, dbl)) in enumerate(overtime):
+                # get the tasks
+                tasks = timecard[date]
+                # get the templates for this row
+                templates = rows[position % len(rows)]
+                # get the number of tasks
+                count = len(tasks)
+                # if there are no tasks
+                if count == 0:
+                    # render the empty row
+                    stream.write(templates[0](d=date))
+                    # and move on
+                    continue
+                # if there are more than two
+                if count > 2:
+                    # make a note
+                    crowded.append(date)
+                # get the first and last task
+                head, tail = tasks[0], tasks[-1]
+                # render the row
+                stream.write(templates[min(count, 3)](
+                    d=date, ein=head.start, lin=head.finish, lout=tail.start, eout=tail.finish,
+                    reg=hours(reg), ovr=hours(ovr), dbl=hours(dbl)))
+
+            # classify the hours worked
+            worked = js.overtime(start=paystart, workweeks=2, timecard=timecard)
+            # add them up
+            reg, ovr, dbl = map(sum, zip(*worked))
+            # render the summary and the attendance footer
+            stream.write(self.FOOTER.format(reg=hours(reg), ovr=hours(ovr), dbl=hours(dbl)))
+
+        # all done
+        return crowded
+
+
+    # implementation details
+    @classmethod
+    def compile(cls):
+        """
+        Build the templates of the rows of a pay period, the first time they are needed; there is
+        one row for each day of the two work weeks, and each row has a template for days with no,
+        one, two and more than two tasks
+        """
+        # if they are available
+        if cls.rows is not None:
+            # all done
+            return cls.rows
+
+        # text that is not a replacement field must have its braces escaped
+        literal = lambda text: text.replace('{', '{{').replace('}', '}}')
+        # the date arguments of the LaTeX macros
+        date = '{{{d.day}}}{{{d.month}}}{{{d.year}}}'
+        # the cell with a clock punch
+        time = lambda field: (
+            '  \\formattime{{{' + field + '.hour}}}{{{' + field + '.minute}}}{{{' +
+            field + '.second}}} &\n')
+        # the cells with the punches for each number of tasks
+        cells = (
+            '',
+            time('ein') + '  &\n  &\n' + time('eout'),
+            time('ein') + time('lin') + time('lout') + time('eout'),
+            time('ein') + time('lin') + time('lout') + time('eout'),
+            )
+        # days with too many punches are colorized
+        markers = ('', '', '', literal('\\color{praxis@multi}'))
+
+        # make a pile
+        rows = []
+        # go through the days in a pay period
+        for workday in range(1, 15):
+            # even rows are colorized
+            stripe = literal('% colorize\n\\rowcolor[gray]{.95}\n') if workday % 2 == 0 else ''
+            # and the last day of a work week is followed by a rule
+            rule = literal('\\midrule ') if workday % 7 == 0 else ''
+            # build the templates
+            templates = tuple(
+                (stripe
+                 + '  % punches\n'
+                 + '  \\simpledate\\formatdate' + date + ' &\n'
+                 + '  {{' + marker + '\\shortdayofweekname' + date + '}} &\n'
+                 + (cell + '{reg} & {ovr} & {dbl}\n\\\\' if tasks else ' & & & & & & \\\\')
+                 + rule + '\n').format
+                for tasks, (cell, marker) in enumerate(zip(cells, markers)))
+            # and add them to the pile
+            rows.append(templates)
+
+        # save them
+        cls.rows = tuple(rows)
+        # and return them
+        return cls.rows
+
+
+    @staticmethod
+    def hours(value):
+        """
+        Format a number of hours; zero is left blank
+        """
+        # easy enough
+        return '{:.2f}'.format(value) if value else ''
+
+
+    # meta-methods
+    def __init__(self, include=None, graphics=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.include = include
+        self.graphics = graphics
+        # all done
+        return
+
+
+    # constants
+    # the compiled row templates
+    rows = None
+    # the fragments of the document
+    PREAMBLE = '\n'.join((
+        '% -*- LaTeX -*-',
+        '% -*- coding: utf-8 -*-',
+        '%',
+        '% michael a.g. aïvázis',
+        '% urban radish',
+        '% (c) 1998-2019 all rights reserved',
+        '%',
+        '% adjust the include path',
+        '\\makeatletter',
+        '\\providecommand*{{\\input@path}}{{}}',
+        '\\edef\\input@path{{{{{include}/}}\\input@path}}',
+        '\\makeatother',
+        '',
+        '% document support',
+        '\\documentclass{{praxis}}',
+        '',
+        '% adjust the graphics path',
+        '\\graphicspath{{{{{graphics}/}}}}',
+        '',
+        '% setup',
+        '\\meta{{',
+        '% pay period',
+        'payperiodStart = {{{start:%B %d, %Y}}},',
+        'payperiodEnd = {{{end:%B %d, %Y}}},',
+        '}}',
+        '',
+        '% the document',
+        '\\begin{{document}}',
+        '',
+        '% the table of contents',
+        '\\tableofcontents\\newpage',
+        '',
+        '',
+        ))
+    HEADER = '\n% attendance for {first} {last}\n\\begin{{attendance}}{{{title}}}\n'
+    PERIOD = '{title}, {start:%B %d} -- {end:%B %d, %Y}'
+    FOOTER = (
+        '\\multicolumn{{5}}{{c}}{{}} & \n'
+        '\\bfseries{{Total}}: & {reg} & {ovr} & {dbl}\n'
+        '\\end{{attendance}}\n'
+        '\n'
+        )
+    POSTAMBLE = '% all done\n\\end {document}\n\n% end of file\n'
+
+
+# end of file
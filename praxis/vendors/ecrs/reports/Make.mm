@@ -12,9 +12,14 @@ PACKAGE = vendors/ecrs/reports
 
 # the list of python modules
 EXPORT_PYTHON_MODULES = \
+    Audit.py \
     Daily.py \
+    Detail.py \
     Punches.py \
+    Reconciler.py \
+    Rollup.py \
     Staff.py \
+    Throughput.py \
     Transactions.py \
     __init__.py
 
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+import datetime, re
+
+
 # declaration
 class Punches:
     """
@@ -23,10 +27,14 @@ class Punches:
 
 
     # interface
-    def parse(self, stream, names=None, punches=None, warnings=None, errors=None, **kwds):
+    def parse(self, stream, names=None, punches=None, warnings=None, errors=None, fast=False,
+              **kwds):
         """
         Extract clock-in/clock-out punches from the given {stream}
 
+        If {fast} is on, timestamps that follow the canonical layout of {TIME_FORMAT} are
+        converted without going through {strptime}; the result is identical either way
+
         The additional {kwds} are passed to the CSV reader without any further processing
         """
         # get the csv package
@@ -36,6 +44,11 @@ class Punches:
         # for my services
         import praxis
 
+        # pick a timestamp converter
+        timestamp = self.timestamp if fast else self.strptime
+        # the employee info is repeated on every row, so cache the result of normalizing it
+        people = {}
+
         # build the payload: the name
         names = {} if names is None else names
         # and the time punches
@@ -99,16 +112,24 @@ class Punches:
                 continue
 
             # type conversions
-            # first the employee id and name
-            rawid, rawname = info.split(None, 1)
-            # normalize
-            eid = ''.join(rawid.split(',')) # the raw ids have thousands separators...
-            name = tuple(rawname.split(',  ')) # the name portion is {last,  first}
+            # first the employee id and name; attempt to
+            try:
+                # look them up
+                eid, name = people[info]
+            # if this is the first time we see this employee
+            except KeyError:
+                # split the info
+                rawid, rawname = info.split(None, 1)
+                # normalize
+                eid = ''.join(rawid.split(',')) # the raw ids have thousands separators...
+                name = tuple(rawname.split(',  ')) # the name portion is {last,  first}
+                # and remember them
+                people[info] = eid, name
             # now, attempt to
             try:
                 # parse the clock punches
-                clockin = datetime.datetime.strptime(clockin, self.TIME_FORMAT)
-                clockout = datetime.datetime.strptime(clockout, self.TIME_FORMAT)
+                clockin = timestamp(clockin)
+                clockout = timestamp(clockout)
             # if something goes wrong
             except ValueError as error:
                 # build a locator
@@ -145,6 +166,47 @@ class Punches:
         return names, punches, warnings, errors
 
 
+    def strptime(self, text):
+        """
+        Convert {text} into a timestamp using {TIME_FORMAT}
+        """
+        # easy enough
+        return datetime.datetime.strptime(text, self.TIME_FORMAT)
+
+
+    def timestamp(self, text):
+        """
+        Convert {text} into a timestamp without the overhead of {strptime}
+
+        Only the canonical layout of {TIME_FORMAT} is handled here; anything else, including
+        malformed input, is handed off to {strptime} so that the results and the error messages
+        are identical
+        """
+        # attempt to
+        match = self.TIMESTAMP.match(text)
+        # if the text looks like a timestamp
+        if match:
+            # unpack
+            month, day, year, hour, minute, second, meridian = match.groups()
+            # convert the hour
+            hour = int(hour)
+            # {strptime} insists that the hour is in [1, 12]
+            if 1 <= hour <= 12:
+                # shift to the 24 hour clock
+                hour = hour % 12 + (12 if meridian in 'Pp' else 0)
+                # attempt to
+                try:
+                    # build the timestamp
+                    return datetime.datetime(
+                        int(year), int(month), int(day), hour, int(minute), int(second))
+                # if any of the fields is out of range
+                except ValueError:
+                    # let {strptime} complain
+                    pass
+        # if all else fails, go the slow way
+        return self.strptime(text)
+
+
     def filter(self, stream, **kwds):
         """
         Throw away everything except the employee name and punch info; also keep the zeroth column
@@ -183,6 +245,9 @@ class Punches:
     OFFSET_CLOCKOUT = 11
 
     TIME_FORMAT = "%m/%d/%Y %I:%M:%S%p"
+    # the canonical layout of timestamps in {TIME_FORMAT}, for the fast converter
+    TIMESTAMP = re.compile(
+        r"(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{2}):(\d{2})([AaPp])[Mm]$", re.ASCII)
 
 
 # end of file
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import csv, datetime
+
+
+# declaration
+class Reconciler:
+    """
+    Merge mispunch corrections into the clock punches of any number of employees
+
+    The tasks of each employee are kept in a {model.timeline}, so corrections can arrive in any
+    order and span any number of pay periods; they are all applied in a single pass. Every edit
+    is recorded, so the result can be reviewed as a list of (employee id, operation, before,
+    after) changes, and the timelines can be checked for overlapping tasks afterwards
+
+    The corrections of an entire timecard file can be applied by {reconcile}, which is meant to
+    run on a pool of processes: it parses the file, applies the corrections, saves the result
+    and returns the reconciler with everything but its timelines
+    """
+
+
+    # exceptions
+    from ..exceptions import ParsingError
+    # types
+    from .. import model
+    from .Punches import Punches as punches
+
+
+    # public data
+    timelines = None # map: employee id -> timeline
+    changes = None # the list of (employee id, operation, before, after) edits
+    warnings = None # the list of (employee id, date, description) complaints
+    # filled in by {reconcile}
+    names = None # map: employee id -> (last, first)
+    conflicts = None # the overlapping tasks left behind, as (employee id, before, after)
+    missing = None # the (first, last) names of corrections without an employee id
+    parsing = None # the (errors, warnings) encountered while parsing the timecard, as strings
+    saved = False # whether the corrected timecard was saved
+
+
+    # factories
+    @classmethod
+    def reconcile(cls, uri, corrections, destination):
+        """
+        Parse the timecard file at {uri}, apply {corrections} and save the corrected timecard
+        in {destination}; the file is replaced atomically, and left alone if anything goes wrong
+
+        Each correction is an (employee id, first, last, date, start, lunch out, lunch in, end)
+        tuple; the employee id is only consulted for people without punches in the timecard
+        """
+        # make a reconciler
+        reconciler = cls()
+        # initialize the piles
+        reconciler.conflicts = []
+        reconciler.missing = []
+        # attempt to
+        try:
+            # parse the timecard
+            with open(uri) as stream:
+                # using a punch parser
+                names, punches, warnings, errors = cls.punches().parse(stream=stream, fast=True)
+        # if it can't be parsed
+        except cls.ParsingError as error:
+            # record what went wrong
+            reconciler.names = {}
+            reconciler.parsing = [str(error)], []
+            # and bail
+            return reconciler
+        # record the parsing events
+        reconciler.names = names
+        reconciler.parsing = [ str(error) for error in errors ], [ str(w) for w in warnings ]
+        # load the punches
+        reconciler.load(punches=punches)
+
+        # invert the employee index
+        people = { name: eid for eid, name in names.items() }
+        # go through the corrections
+        for eid, first, last, date, start, lunchOut, lunchIn, end in corrections:
+            # look the employee up in the timecard, and fall back to the id in the correction
+            eid = people.get((last, first), eid)
+            # if there isn't one
+            if not eid:
+                # we can't apply this one
+                reconciler.missing.append((first, last))
+                # so move on
+                continue
+            # add the employee to the index
+            names.setdefault(eid, (last, first))
+            # apply the correction
+            reconciler.apply(eid=eid, date=date,
+                             start=start, lunchOut=lunchOut, lunchIn=lunchIn, end=end)
+
+        # get the task photographer
+        snapshot = cls.model.timeline.snapshot
+        # collect the overlapping tasks
+        reconciler.conflicts = [
+            (eid, snapshot(one), snapshot(two)) for eid, one, two in reconciler.overlaps() ]
+        # unless there were corrections we could not apply
+        if not reconciler.missing:
+            # save the corrected timecard
+            reconciler.save(destination=destination)
+        # the timelines are not needed any more, and they are expensive to ship around
+        reconciler.timelines = None
+        # all done
+        return reconciler
+
+
+    # interface
+    def apply(self, eid, date, start=None, lunchOut=None, lunchIn=None, end=None):
+        """
+        Apply the correction of the punches of employee {eid} on {date}; the times of day that
+        are not {None} replace the corresponding punches. Returns the list of changes made
+        """
+        # get the timeline
+        timeline = self.timeline(eid=eid)
+        # remember where its edits end
+        mark = len(timeline.changes)
+        # turn the times into timestamps
+        start, lunchOut, lunchIn, end = (
+            datetime.datetime.combine(date, time) if time else None
+            for time in (start, lunchOut, lunchIn, end))
+        # get the tasks of the day
+        tasks = timeline.day(date=date)
+
+        # if there aren't any
+        if not tasks:
+            # the morning
+            if start and lunchOut:
+                timeline.insert(name=self.ADDITION, start=start, finish=lunchOut)
+            # the afternoon
+            if lunchIn and end:
+                timeline.insert(name=self.ADDITION, start=lunchIn, finish=end)
+            # or the whole day, when there was no lunch
+            if start and end and not lunchIn and not lunchOut:
+                timeline.insert(name=self.ADDITION, start=start, finish=end)
+        # if there is exactly one task
+        elif len(tasks) == 1:
+            # get it
+            task, = tasks
+            # fix the clock-in
+            timeline.trim(task=task, start=start, name=self.CORRECTION)
+            # if there is a lunch out
+            if lunchOut:
+                # the task ended at lunch
+                timeline.trim(task=task, finish=lunchOut, name=self.CORRECTION)
+                # and if we know when the employee came back and left
+                if lunchIn and end:
+                    # add the afternoon
+                    timeline.insert(name=self.ADDITION, start=lunchIn, finish=end)
+            # otherwise, if there is an end
+            elif end:
+                # fix the clock-out
+                timeline.trim(task=task, finish=end, name=self.CORRECTION)
+        # otherwise
+        else:
+            # if there are more than two tasks
+            if len(tasks) > 2:
+                # the lunch punches are ambiguous
+                self.warnings.append((eid, date, 'mispunch on date with more than 2 tasks'))
+            # the first task starts the day and ends at lunch
+            timeline.trim(task=tasks[0], start=start, finish=lunchOut, name=self.CORRECTION)
+            # the last one starts after lunch and ends the day
+            timeline.trim(task=tasks[-1], start=lunchIn, finish=end, name=self.CORRECTION)
+
+        # collect the new edits
+        changes = [ (eid,) + change for change in timeline.changes[mark:] ]
+        # add them to the pile
+        self.changes.extend(changes)
+        # and return them
+        return changes
+
+
+    def timeline(self, eid):
+        """
+        Retrieve the timeline of employee {eid}, making an empty one if necessary
+        """
+        # look it up
+        timeline = self.timelines.get(eid)
+        # if it's not there
+        if timeline is None:
+            # make one
+            timeline = self.timelines[eid] = self.model.timeline()
+        # all done
+        return timeline
+
+
+    def overlaps(self):
+        """
+        Generate the (employee id, task, task) triplets of tasks that share some time
+        """
+        # go through the employees
+        for eid in sorted(self.timelines):
+            # and their overlapping tasks
+            for first, second in self.timelines[eid].overlaps():
+                # send them off
+                yield eid, first, second
+        # all done
+        return
+
+
+    def table(self):
+        """
+        Build the two level table employee id -> date -> punch list of the reconciled punches
+        """
+        # easy enough
+        return { eid: timeline.table() for eid, timeline in self.timelines.items() }
+
+
+    def load(self, punches):
+        """
+        Index the tasks in {punches}, a table employee id -> date -> punch list
+        """
+        # go through it
+        for eid, dates in punches.items():
+            # get the timeline
+            timeline = self.timeline(eid=eid)
+            # and index the tasks
+            for tasks in dates.values():
+                for task in tasks:
+                    timeline.add(task)
+        # all done
+        return
+
+
+    def save(self, destination):
+        """
+        Save the reconciled punches as a timecard in {destination}; the file is replaced
+        atomically, so that a crash cannot leave a partial timecard behind
+        """
+        # for my services
+        import praxis
+
+        # open the file
+        with praxis.support.output(uri=destination) as stream:
+            # write the punches
+            self.write(stream=stream)
+        # mark
+        self.saved = True
+        # all done
+        return
+
+
+    def write(self, stream, names=None):
+        """
+        Render the reconciled punches as a timecard in {stream}; corrected tasks are marked with
+        a '!' and new ones with a '+'
+        """
+        # get the employee index
+        names = self.names if names is None else names
+        # get the layout
+        layout = self.punches
+        # the status marks
+        marks = { self.CORRECTION: '!', self.ADDITION: '+' }
+        # make a writer
+        writer = csv.writer(stream)
+        # make a record prototype
+        row = [''] * self.WIDTH
+        # go through all the employee ids
+        for eid in sorted(self.timelines):
+            # generate the employee info
+            last, first = names[eid]
+            row[layout.OFFSET_EMPLOYEE] = f"{int(eid):,}   {last},  {first}"
+            # go through the tasks in order
+            for task in self.timelines[eid]:
+                # mark the row
+                row[layout.OFFSET_STATUS] = marks.get(task.name, '')
+                # render the punch
+                row[layout.OFFSET_CLOCKIN] = task.start.strftime(layout.TIME_FORMAT)
+                row[layout.OFFSET_CLOCKOUT] = task.finish.strftime(layout.TIME_FORMAT)
+                # save the row
+                writer.writerow(row)
+        # all done
+        return
+
+
+    @classmethod
+    def render(cls, change):
+        """
+        Describe {change}
+        """
+        # unpack
+        eid, operation, before, after = change
+        # render the snapshots
+        old, new = (
+            None if shot is None else '{} {} - {}'.format(
+                shot[0], cls.stamp(shot[1]), cls.stamp(shot[2]))
+            for shot in (before, after))
+        # removals
+        if new is None:
+            # show what's gone
+            return '{}: {}: - {}'.format(eid, operation, old)
+        # additions
+        if old is None:
+            # show what's new
+            return '{}: {}: + {}'.format(eid, operation, new)
+        # and edits
+        return '{}: {}: {} -> {}'.format(eid, operation, old, new)
+
+
+    # implementation details
+    @classmethod
+    def stamp(cls, seconds):
+        """
+        Render {seconds} since the epoch as a timestamp
+        """
+        # easy enough
+        return cls.model.task.timestamp(seconds).strftime('%Y-%m-%d %H:%M')
+
+
+    # meta-methods
+    def __init__(self, punches=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize the piles
+        self.timelines = {}
+        self.changes = []
+        self.warnings = []
+        # if we were handed a table employee id -> date -> punch list
+        if punches is not None:
+            # load it
+            self.load(punches=punches)
+        # all done
+        return
+
+
+    # constants
+    # the names of the tasks that were corrected or added
+    CORRECTION = 'correction'
+    ADDITION = 'addition'
+    # the number of columns in a timecard
+    WIDTH = 18
+
+
+# end of file
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import collections
+
+
+# declaration
+class Rollup:
+    """
+    Daily sales totals by terminal, cashier, and hour of the day, accumulated one invoice at a
+    time while the transaction journal is being parsed
+
+    The totals are kept in a table indexed by (date, dimension, key) triples, where {dimension}
+    is one of {DIMENSIONS}; each entry is an [invoices, items, sales] triplet, with the sales in
+    whatever units the parser used for the invoice amounts. Training sessions and voided
+    invoices are not sales, so they are left out
+    """
+
+
+    # public data
+    totals = None # map: (date, dimension, key) -> [invoices, items, sales]
+
+
+    # interface
+    def add(self, invoice):
+        """
+        Add the contribution of {invoice} to the totals
+        """
+        # training sessions and voided invoices are not sales
+        if invoice.training or invoice.void:
+            # so skip them
+            return
+        # record the rest
+        return self.record(start=invoice.start, terminal=invoice.terminal,
+                           cashier=invoice.cashier, items=len(invoice.transactions),
+                           sales=invoice.total)
+
+
+    def record(self, start, terminal, cashier, items, sales):
+        """
+        Add a sale that started at {start} on {terminal}, rung up by {cashier}, with the given
+        number of line {items} and amount of {sales}, to the totals
+        """
+        # the day it belongs to
+        date = start.date()
+        # get the table
+        totals = self.totals
+        # go through the dimensions
+        for dimension, key in (
+                ('terminal', terminal),
+                ('cashier', cashier),
+                ('hour', '{:02}'.format(start.hour))):
+            # get the entry
+            entry = totals[(date, dimension, key)]
+            # and update it
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += sales
+        # all done
+        return
+
+
+    def merge(self, other):
+        """
+        Add the totals in the {other} rollup to mine
+        """
+        # get my table
+        totals = self.totals
+        # go through the other table
+        for index, (invoices, items, sales) in other.totals.items():
+            # get my entry
+            entry = totals[index]
+            # and update it
+            entry[0] += invoices
+            entry[1] += items
+            entry[2] += sales
+        # all done
+        return self
+
+
+    def days(self):
+        """
+        Build a sorted list of the days with sales
+        """
+        # easy enough
+        return sorted({ date for date, _, _ in self.totals })
+
+
+    def rows(self):
+        """
+        Generate the totals as (date, dimension, key, invoices, items, sales) tuples, in order
+        """
+        # go through the table in order
+        for index in sorted(self.totals):
+            # and send off the entries
+            yield index + tuple(self.totals[index])
+        # all done
+        return
+
+
+    def summary(self, dimension):
+        """
+        Collapse the totals along {dimension} over all days; returns a map from the keys of
+        {dimension} to [invoices, items, sales] triplets
+        """
+        # make a table
+        table = collections.defaultdict(self.entry)
+        # go through my totals
+        for (_, which, key), (invoices, items, sales) in self.totals.items():
+            # skip the other dimensions
+            if which != dimension:
+                continue
+            # get the entry
+            entry = table[key]
+            # and update it
+            entry[0] += invoices
+            entry[1] += items
+            entry[2] += sales
+        # all done
+        return table
+
+
+    # implementation details
+    @staticmethod
+    def entry():
+        """
+        Build an empty entry for the table of totals
+        """
+        # invoices, items, sales
+        return [0, 0, 0]
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize the table
+        self.totals = collections.defaultdict(self.entry)
+        # all done
+        return
+
+
+    def __len__(self):
+        # the number of entries
+        return len(self.totals)
+
+
+    # constants
+    DIMENSIONS = ('terminal', 'cashier', 'hour')
+
+
+# end of file
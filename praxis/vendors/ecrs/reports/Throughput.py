@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+# externals
+import bisect, collections, datetime
+
+
+# declaration
+class Throughput:
+    """
+    Cashier and lane throughput, accumulated one invoice at a time by matching the invoice
+    timestamps against the shifts in a columnar punch {store}
+
+    Cashiers are matched to employees by name, and each invoice is matched to the shift that
+    contains its start time by bisecting the clock-in column of the store, so the cost per
+    invoice does not depend on the size of the store. The labor of each cashier is the time they
+    were on the clock during the days covered by the invoices; whatever part of it was not
+    spent ringing up invoices is idle time. Lanes are open from the first invoice of the day to
+    the last one. Training sessions are not customer traffic, so they are left out; voided
+    invoices took somebody's time, so they count
+    """
+
+
+    # public data
+    store = None # the punch store
+    cashiers = None # map: cashier -> [invoices, items, busy seconds, invoices off the clock]
+    lanes = None # map: terminal -> [invoices, items, busy seconds]
+    hours = None # map: (terminal, date) -> [first start, last finish], in seconds
+    days = None # the set of days with invoices
+
+
+    # interface
+    def add(self, invoice):
+        """
+        Add the contribution of {invoice} to the totals
+        """
+        # training sessions are not traffic
+        if invoice.training:
+            # so skip them
+            return
+        # get the timestamps
+        start = self.seconds(invoice.start)
+        finish = self.seconds(invoice.finish)
+        # the time it took
+        busy = max(finish - start, 0)
+        # the number of line items
+        items = len(invoice.transactions)
+        # the day it belongs to
+        date = invoice.start.date()
+        # record it
+        self.days.add(date)
+
+        # get the cashier entry
+        entry = self.cashiers[invoice.cashier]
+        # update it
+        entry[0] += 1
+        entry[1] += items
+        entry[2] += busy
+        # if the invoice was rung up while the cashier was not on the clock
+        if self.shift(cashier=invoice.cashier, when=start) is None:
+            # count it
+            entry[3] += 1
+
+        # get the lane entry
+        entry = self.lanes[invoice.terminal]
+        # update it
+        entry[0] += 1
+        entry[1] += items
+        entry[2] += busy
+        # get the opening hours of the lane on this day
+        span = self.hours.get((invoice.terminal, date))
+        # if this is the first invoice of the day
+        if span is None:
+            # start a new one
+            self.hours[(invoice.terminal, date)] = [start, finish]
+        # otherwise
+        else:
+            # widen it
+            span[0] = min(span[0], start)
+            span[1] = max(span[1], finish)
+        # all done
+        return
+
+
+    def cashierTable(self):
+        """
+        Generate the per cashier throughput as (cashier, invoices, items, labor hours, busy
+        hours, idle hours, items per hour, invoices per labor hour, invoices off the clock)
+        tuples; the labor of cashiers that are not in the store is unknown, so their labor,
+        idle time and rates are {None}
+        """
+        # go through the cashiers
+        for cashier in sorted(self.cashiers):
+            # unpack
+            invoices, items, busy, offclock = self.cashiers[cashier]
+            # look up the employee
+            eid = self.employee(cashier=cashier)
+            # if there isn't one
+            if eid is None:
+                # we know how busy they were, but not how much they were paid for
+                yield (cashier, invoices, items, None, busy / self.HOUR, None, None, None,
+                       offclock)
+                # and move on
+                continue
+            # otherwise, get their labor
+            labor = self.labor(eid=eid)
+            # compute the rates
+            hours = labor / self.HOUR
+            itemRate = items / hours if hours else None
+            invoiceRate = invoices / hours if hours else None
+            # and send off the row
+            yield (cashier, invoices, items, hours, busy / self.HOUR,
+                   max(labor - busy, 0) / self.HOUR, itemRate, invoiceRate, offclock)
+        # all done
+        return
+
+
+    def laneTable(self):
+        """
+        Generate the per lane throughput as (terminal, invoices, items, open hours, busy hours,
+        idle hours, items per hour, utilization) tuples
+        """
+        # collect the opening hours of each lane
+        opened = collections.Counter()
+        # go through the daily spans
+        for (terminal, _), (first, last) in self.hours.items():
+            # and add them up
+            opened[terminal] += last - first
+        # go through the lanes
+        for terminal in sorted(self.lanes):
+            # unpack
+            invoices, items, busy = self.lanes[terminal]
+            # get the opening hours
+            hours = opened[terminal] / self.HOUR
+            # compute the rate
+            itemRate = items / hours if hours else None
+            # and the fraction of the time the lane was busy
+            utilization = min(busy / opened[terminal], 1) if opened[terminal] else None
+            # send off the row
+            yield (terminal, invoices, items, hours, busy / self.HOUR,
+                   max(opened[terminal] - busy, 0) / self.HOUR, itemRate, utilization)
+        # all done
+        return
+
+
+    def unmatched(self):
+        """
+        Build a sorted list of the cashiers that are not in the punch store
+        """
+        # easy enough
+        return sorted(cashier for cashier in self.cashiers if self.employee(cashier) is None)
+
+
+    # implementation details
+    def employee(self, cashier):
+        """
+        Look up the employee id of {cashier}
+        """
+        # normalize the whitespace and look it up
+        return self.roster.get(' '.join(cashier.split()))
+
+
+    def shift(self, cashier, when):
+        """
+        Find the row of the shift of {cashier} that contains {when}, in seconds since the epoch;
+        returns {None} if {cashier} was not on the clock
+        """
+        # get the last shift that matched
+        row = self.last.get(cashier)
+        # get the columns
+        clockin, clockout = self.store.clockin, self.store.clockout
+        # invoices arrive in chronological order, so most of the time it is the same one
+        if row is not None and clockin[row] <= when <= clockout[row]:
+            # done
+            return row
+        # otherwise, look up the employee
+        eid = self.employee(cashier=cashier)
+        # if there isn't one
+        if eid is None:
+            # there are no shifts to match against
+            return None
+        # get the block of rows that belongs to this employee
+        idx = self.store.index[eid]
+        lo, hi = self.store.offsets[idx], self.store.offsets[idx+1]
+        # find the last shift that started no later than {when}
+        row = bisect.bisect_right(clockin, when, lo, hi) - 1
+        # if there isn't one, or it was over by then
+        if row < lo or clockout[row] < when:
+            # the cashier was not on the clock
+            return None
+        # remember it
+        self.last[cashier] = row
+        # and return it
+        return row
+
+
+    def labor(self, eid):
+        """
+        Compute the time employee {eid} was on the clock during the days with invoices, in
+        seconds
+        """
+        # if there are no days
+        if not self.days:
+            # there is no labor
+            return 0
+        # get the store
+        store = self.store
+        # shifts may start the day before and run past midnight
+        start = min(self.days) - self.DAY
+        end = max(self.days) + self.DAY
+        # get the columns
+        clockin, clockout = store.clockin, store.clockout
+        # the total
+        total = 0
+        # go through the shifts
+        for row in store.select(eid=eid, start=start, end=end):
+            # get the edges
+            tin, tout = clockin[row], clockout[row]
+            # go through the days it touches
+            for day in range(tin // store.DAY, tout // store.DAY + 1):
+                # if it's not a day with invoices
+                if store.date(day) not in self.days:
+                    # skip it
+                    continue
+                # otherwise, add the part of the shift that falls on it
+                total += max(min(tout, (day+1) * store.DAY) - max(tin, day * store.DAY), 0)
+        # all done
+        return total
+
+
+    def seconds(self, timestamp):
+        """
+        Convert {timestamp} into seconds since the epoch of the store
+        """
+        # easy enough
+        return self.store.seconds(timestamp)
+
+
+    # meta-methods
+    def __init__(self, store, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the store
+        self.store = store
+        # map the employee names, as they appear on invoices, to their ids
+        self.roster = {
+            ' '.join(' '.join(reversed(name)).split()): eid for eid, name in store.people }
+        # the last shift that matched, by cashier
+        self.last = {}
+        # initialize the tables
+        self.cashiers = collections.defaultdict(lambda: [0, 0, 0, 0])
+        self.lanes = collections.defaultdict(lambda: [0, 0, 0])
+        self.hours = {}
+        self.days = set()
+        # all done
+        return
+
+
+    # constants
+    HOUR = 3600
+    DAY = datetime.timedelta(days=1)
+
+
+# end of file
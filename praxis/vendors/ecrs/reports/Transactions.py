@@ -7,7 +7,7 @@
 
 
 # externals
-import datetime, re
+import collections, csv, datetime, decimal, io, os, re, sys
 # support
 import praxis
 
@@ -29,193 +29,480 @@ class Transactions:
     # interface
     def parse(self, stream, invoices=None, errors=None, warnings=None, **kwds):
         """
-        Extract transactions from the given {stream}
+        Extract transactions from the given {stream} and store them in {invoices}, indexed by
+        their transaction id
 
-        The additional {kwds} are passed to the CSV reader without any further processing
+        The additional {kwds} are passed to {invoices}
         """
-        # get the csv package
-        import csv
-        # make a reader
-        reader = csv.reader(stream, **kwds)
+        # build the payload
+        invoices = {} if invoices is None else invoices
         # reset the pile of errors and warnings
         errors = [] if errors is None else errors
         warnings = [] if warnings is None else warnings
-        # the pile of discrepancies
-        discrepancies = []
         # extract invoices
-        for invoice in self.retrieveInvoices(records=reader, errors=errors, warnings=warnings):
+        for invoice in self.invoices(stream=stream, errors=errors, warnings=warnings, **kwds):
             # add them to the pile
             invoices[invoice.tid] = invoice
 
+        # all done
+        return invoices, warnings, errors
+
+
+    def invoices(self, stream, errors=None, warnings=None,
+                 tolerant=False, quarantine=None, unknown=None, **kwds):
+        """
+        Generate the invoices in the given {stream}, one at a time, as soon as all their records
+        have been processed; nothing is retained after an invoice is sent off, so the memory
+        footprint does not grow with the size of the journal
+
+        Records that cannot be processed raise a {ParsingError}. If {tolerant} is set, the
+        error is added to {errors} instead, the invoice it belongs to is moved to {quarantine},
+        and parsing resumes with the next invoice. Descriptions of metadata lines that are not
+        recognized are counted in {unknown}
+
+        The additional {kwds} are passed to the CSV reader without any further processing
+        """
+        # make a reader
+        reader = csv.reader(stream, **kwds)
+        # reset the pile of errors and warnings
+        errors = [] if errors is None else errors
+        warnings = [] if warnings is None else warnings
+        # extract invoices and send them off
+        yield from self.retrieveInvoices(
+            records=reader, source=getattr(stream, 'name', None), errors=errors,
+            warnings=warnings, tolerant=tolerant, quarantine=quarantine, unknown=unknown)
+        # all done
+        return
+
+
+    def split(self, uri, size):
+        """
+        Split the journal in the file at {uri} into shards of roughly {size} bytes that can be
+        parsed independently
+
+        The journal is sorted by invoice number, so the shards start at the first record of an
+        invoice. Returns a list of (begin, end, line) triples with the byte range of each shard
+        and the number of lines before it
+        """
+        # get the size of the file
+        total = os.path.getsize(uri)
+        # the shard boundaries
+        cuts = [0]
+        # open the file
+        with open(uri, mode='rb') as stream:
+            # go through the target boundaries
+            for target in range(size, total, size):
+                # if the last shard already extends past this one
+                if target <= cuts[-1]:
+                    # skip it
+                    continue
+                # find the start of the next invoice
+                cut = self.boundary(stream=stream, offset=target)
+                # if there isn't one
+                if cut is None:
+                    # the last shard extends to the end of the file
+                    break
+                # otherwise, save it
+                cuts.append(cut)
+            # close the last shard
+            cuts.append(total)
+
+            # now, count the lines before each shard
+            lines = [0]
+            # starting at the top of the file
+            stream.seek(0)
+            # with no lines
+            count = 0
+            # go through the shards after the first one
+            for begin in cuts[1:-1]:
+                # figure out how much to read
+                remaining = begin - stream.tell()
+                # read it in chunks
+                while remaining > 0:
+                    # read a chunk
+                    chunk = stream.read(min(remaining, self.CHUNK))
+                    # count the lines
+                    count += chunk.count(b'\n')
+                    # and update the remaining byte count
+                    remaining -= len(chunk)
+                # record the line count
+                lines.append(count)
+
+        # assemble the shards and return them
+        return list(zip(cuts[:-1], cuts[1:], lines))
+
+
+    def segment(self, uri, begin, end, line=0, tolerant=False):
+        """
+        Parse the shard of the journal in the file at {uri} that spans the byte range [{begin},
+        {end}) and starts after {line} lines
+
+        This is meant to be run in a separate process, so the parsing events are returned as
+        (description, line) pairs. Returns the list of invoices, the warnings, the errors, the
+        counts of unrecognized descriptions, and the fatal error that stopped the parser, if any
+        """
+        # open the file
+        with open(uri, mode='rb') as stream:
+            # go to the beginning of the shard
+            stream.seek(begin)
+            # and read it
+            text = stream.read(end - begin).decode(self.ENCODING)
+        # initialize the event piles
+        errors = []
+        warnings = []
+        # the table of unrecognized descriptions
+        unknown = collections.Counter()
+        # and the invoices
+        invoices = []
+        # no fatal errors, yet
+        fatal = None
+        # attempt to
+        try:
+            # parse
+            invoices.extend(self.invoices(stream=io.StringIO(text), errors=errors,
+                                          warnings=warnings, tolerant=tolerant, unknown=unknown))
+        # if this fails
+        except self.ParsingError as error:
+            # strip the error down to its essentials
+            fatal = (error.description, line + error.locator.line)
+        # strip the events down to their essentials, with line numbers relative to the file
+        warnings = [ (event.description, line + event.locator.line) for event in warnings ]
+        errors = [ (event.description, line + event.locator.line) for event in errors ]
+        # all done
+        return invoices, warnings, errors, unknown, fatal
+
+
+    def setCurrency(self, currency):
+        """
+        Represent monetary amounts as {currency}, one of the keys of {CURRENCIES}
+        """
+        # look up the converter
+        try:
+            converter = self.CURRENCIES[currency]
+        # if it's not there
+        except KeyError:
+            # complain
+            raise ValueError('unknown currency representation {!r}; pick one of {}'.format(
+                currency, ', '.join(self.CURRENCIES))) from None
+        # record the choice
+        self.currency = currency
+        # and bind the converter
+        self.money = getattr(self, converter)
         # all done
         return
 
 
     # implementation details
-    def retrieveInvoices(self, records, errors, warnings, **kwds):
+    def retrieveInvoices(self, records, errors, warnings, source=None,
+                         tolerant=False, quarantine=None, unknown=None, **kwds):
         """
         Consume all {records} pertaining to a single invoice
         """
-        # get my scanner
-        scanner = self.SCANNER
-        # the pile of amount discrepancies
-        discrepancies = []
+        # the table of unrecognized descriptions
+        unknown = collections.Counter() if unknown is None else unknown
+        # get my classifier
+        classify = self.classify
         # the current invoice
         invoice = None
         # and it's number
         cid = None
+        # the number of an invoice whose records are being skipped
+        skipping = None
 
         # start processing records
         for record in records:
-            # get the invoice number from the record
-            tid = record[self.OFFSET_INVOICE]
-            # if it corresponds to a new invoice
-            if tid != cid:
-                # and we have an existing one
-                if invoice:
-                    # close it and send it off
-                    yield self.finalizeInvoice(invoice=invoice)
-                # record the current invoice id
-                cid = tid
-                # open a new one
-                invoice = self.model.invoice()
-                # set its transaction id
-                invoice.tid = tid
-                # if it's from a training session
-                if record[self.OFFSET_MODE].startswith('TRAINING MODE'):
-                    # mark it as such
-                    invoice.training = True
-                # decorate it with the available meta-data
-                invoice.receipt = record[self.OFFSET_RECEIPT]
-                invoice.terminal = record[self.OFFSET_TERMINAL]
-                invoice.cashier = record[self.OFFSET_CASHIER]
-                invoice.customer = record[self.OFFSET_CUSTOMER_NUMBER]
-                invoice.start = datetime.datetime.strptime(
-                    record[self.OFFSET_START], self.TIME_FORMAT)
-                invoice.finish = datetime.datetime.strptime(
-                    record[self.OFFSET_FINISH], self.TIME_FORMAT)
-                # show me
-                print(f'invoice {invoice.tid}: cashier: {invoice.cashier}')
-
-            # in any case, this record contains information about this invoice
-            item = record[self.OFFSET_ITEMID].strip()
-            description = record[self.OFFSET_DESCRIPTION]
-            quantity = self.float(record[self.OFFSET_QUANTITY])
-            price = self.money(record[self.OFFSET_PRICE])
-            charge = self.money(record[self.OFFSET_CHARGE])
-
-            # do not disturb the order of the line item handling without walking through the
-            # cases carefully; there are tricky interactions among the fields that must be
-            # handled in the correct order; for example, line items don't all have item ids,
-            # item removal can have both positive and negative quantities to handle removal of
-            # returns, etc.
-
-            # the section below catches all items that have a multiplier on their price,
-            # regardless of whether they have item ids or not; this handles correctly the
-            # removal of a coupon from the transaction, which leaves behind a line that does
-            # not include the coupon id
-
-            # if we have an item count
-            if quantity != 0:
-                # make a new transaction
-                transaction = self.model.transaction()
-                # decorate
-                transaction.item = item
-                transaction.description = description
-                transaction.quantity = quantity
-                transaction.price = price
-                transaction.amount = charge
-
-                # handle item removal with higher priority than the rest: if the description
-                # indicates a correction
-                if description.startswith('Removed >>'):
-                    # quantity can be of either sign; that's how removal of returned items is
-                    # handled...
-                    # show me
-                    # print('    correction: cashier: {.cashier}'.format(invoice))
-                    # print('        {}: {}'.format(tid, item))
-                    # print('        {}'.format(description))
-                    # print('        count: {}, price: {}, charge: {}'.format(
-                        # quantity, price, charge))
-                    # add it to the corrections
-                    invoice.corrections.append(transaction)
-                    # and move on
+            # skip blank lines
+            if not record: continue
+            # attempt to
+            try:
+                # get the invoice number from the record
+                tid = record[self.OFFSET_INVOICE]
+                # if it belongs to an invoice that was quarantined
+                if tid == skipping:
+                    # skip it
                     continue
+                # if it corresponds to a new invoice
+                if tid != cid:
+                    # and we have an existing one
+                    if invoice is not None:
+                        # close it and send it off
+                        yield self.finalizeInvoice(invoice=invoice)
+                    # record the current invoice id
+                    cid = tid
+                    # forget the previous invoice
+                    invoice = None
+                    # and open a new one
+                    invoice = self.openInvoice(tid=tid, record=record)
+                # in any case, this record contains information about this invoice
+                self.processRecord(invoice=invoice, record=record, records=records,
+                                   classify=classify, unknown=unknown)
+            # if anything goes wrong
+            except (ValueError, IndexError, StopIteration) as error:
+                # get the line number
+                line = getattr(records, 'line_num', None)
+                # build a locator
+                here = praxis.tracking.file(source=source, line=line)
+                # describe the problem
+                reason = str(error) or 'unexpected end of input'
+                # and build an error
+                error = self.ParsingError(
+                    description='invoice {}: {}'.format(cid, reason), locator=here)
+                # if we are not supposed to recover
+                if not tolerant:
+                    # complain
+                    raise error from None
+                # otherwise, record the error
+                errors.append(error)
+                # if there is a quarantine
+                if quarantine is not None and invoice is not None:
+                    # move the invoice there
+                    quarantine.append(invoice)
+                # drop the invoice
+                invoice = None
+                # and skip the rest of its records
+                skipping = cid
+
+        # if there is an invoice in progress when the records run out
+        if invoice is not None:
+            # close it and send it off
+            yield self.finalizeInvoice(invoice=invoice)
 
-                # if this appears to be a return
-                if quantity < 0:
-                    # show me
-                    # print('    return: cashier: {.cashier}'.format(invoice))
-                    # print('        {}: {}'.format(tid, item))
-                    # print('        {}'.format(description))
-                    # print('        count: {}, price: {}, charge: {}'.format(
-                        # quantity, price, charge))
-                    # add it to the returns
-                    invoice.returns.append(transaction)
-                    # done with this record
-                    continue
+        # all done
+        return
 
-                # otherwise, add it to the regular items
-                invoice.transactions.append(transaction)
-                # and move on
-                continue
 
-            # if the quantity zero, this line is metadata:
-            #   the item field may be blank
-            #   the action is in the same field as the item description
-            #   the quantity is always 0
-            #   the price is always 0
-            #   the charge is negative for discounts and refunds, positive for tenders
-            #
+    def openInvoice(self, tid, record):
+        """
+        Build a new invoice out of its first {record}
+        """
+        # make one
+        invoice = self.model.invoice()
+        # set its transaction id
+        invoice.tid = tid
+        # if it's from a training session
+        if record[self.OFFSET_MODE].startswith('TRAINING MODE'):
+            # mark it as such
+            invoice.training = True
+        # decorate it with the available meta-data
+        invoice.receipt = record[self.OFFSET_RECEIPT]
+        # the terminal and cashier names repeat across invoices, so share them
+        invoice.terminal = sys.intern(record[self.OFFSET_TERMINAL])
+        invoice.cashier = sys.intern(record[self.OFFSET_CASHIER])
+        invoice.customer = record[self.OFFSET_CUSTOMER_NUMBER]
+        invoice.start = datetime.datetime.strptime(
+            record[self.OFFSET_START], self.TIME_FORMAT)
+        invoice.finish = datetime.datetime.strptime(
+            record[self.OFFSET_FINISH], self.TIME_FORMAT)
+        # all done
+        return invoice
+
 
-            if price:
+    def processRecord(self, invoice, record, records, classify, unknown):
+        """
+        Extract the information in {record} and add it to {invoice}; malformed records raise
+        {ValueError} and friends
+        """
+        # extract the line item information
+        item = record[self.OFFSET_ITEMID].strip()
+        description = record[self.OFFSET_DESCRIPTION]
+        quantity = self.float(record[self.OFFSET_QUANTITY])
+        price = self.money(record[self.OFFSET_PRICE])
+        charge = self.money(record[self.OFFSET_CHARGE])
+
+        # do not disturb the order of the line item handling without walking through the
+        # cases carefully; there are tricky interactions among the fields that must be
+        # handled in the correct order; for example, line items don't all have item ids,
+        # item removal can have both positive and negative quantities to handle removal of
+        # returns, etc.
+
+        # the section below catches all items that have a multiplier on their price,
+        # regardless of whether they have item ids or not; this handles correctly the
+        # removal of a coupon from the transaction, which leaves behind a line that does
+        # not include the coupon id
+
+        # if we have an item count
+        if quantity != 0:
+            # make a new transaction
+            transaction = self.model.transaction()
+            # decorate
+            # so do the item ids and descriptions
+            transaction.item = sys.intern(item)
+            transaction.description = sys.intern(description)
+            transaction.quantity = quantity
+            transaction.price = price
+            transaction.amount = charge
+
+            # handle item removal with higher priority than the rest: if the description
+            # indicates a correction
+            if description.startswith('Removed >>'):
+                # quantity can be of either sign; that's how removal of returned items is
+                # handled...
                 # show me
-                print('    meta with non-zero price: cashier: {.cashier}'.format(invoice))
-                print('        {}: {}'.format(tid, item))
-                print('        {}'.format(description))
-                print('        count: {}, price: {}, charge: {}'.format(
-                    quantity, price, charge))
-                # and bail
-                raise SystemExit(0)
-
-            # some lines are separators
-            if not description:
-                # skip
-                continue
-
-            # attempt to extract the meaning of this line
-            match = scanner.match(description)
-            # if we know nothing about it
-            if not match:
+                # print('    correction: cashier: {.cashier}'.format(invoice))
+                # print('        {}: {}'.format(tid, item))
+                # print('        {}'.format(description))
+                # print('        count: {}, price: {}, charge: {}'.format(
+                    # quantity, price, charge))
+                # add it to the corrections
+                invoice.corrections.append(transaction)
+                # and move on
+                return
+
+            # if this appears to be a return
+            if quantity < 0:
                 # show me
-                print(f'invoice {invoice.tid}: no match: {description!r}')
-                # and bail
-                raise SystemExit(0)
-
-            # find the handler
-            handler = getattr(self, match.lastgroup)
-            # invoke it
-            handler(
-                records=records, match=match,
-                invoice=invoice, action=description, item=item, amount=charge)
+                # print('    return: cashier: {.cashier}'.format(invoice))
+                # print('        {}: {}'.format(tid, item))
+                # print('        {}'.format(description))
+                # print('        count: {}, price: {}, charge: {}'.format(
+                    # quantity, price, charge))
+                # add it to the returns
+                invoice.returns.append(transaction)
+                # done with this record
+                return
+
+            # otherwise, add it to the regular items
+            invoice.transactions.append(transaction)
             # and move on
-            continue
-
-            # if the charge is positive
-            if charge > 0:
-                # it is a tender
-                tender = self.model.tender()
-                tender.mode = description
-                tender.amount = charge
-                # save it
-                invoice.tenders.append(tender)
-                # grab the next line
-                continue
+            return
 
-        # all done
+        # if the quantity zero, this line is metadata:
+        #   the item field may be blank
+        #   the action is in the same field as the item description
+        #   the quantity is always 0
+        #   the price is always 0
+        #   the charge is negative for discounts and refunds, positive for tenders
+        #
+
+        if price:
+            # complain
+            raise ValueError('metadata {!r} with non-zero price: count: {}, price: {}'.format(
+                description, quantity, price))
+
+        # some lines are separators
+        if not description:
+            # skip
+            return
+
+        # attempt to extract the meaning of this line
+        meaning = classify(description)
+        # if we know nothing about it
+        if meaning is None:
+            # count it
+            unknown[description] += 1
+            # and complain
+            raise ValueError('unrecognized metadata {!r}'.format(description))
+
+        # unpack
+        handler, match = meaning
+        # invoke it
+        handler(
+            records=records, match=match,
+            invoice=invoice, action=description, item=item, amount=charge)
+        # and move on
         return
 
 
+    def classify(self, description):
+        """
+        Identify the handler of a metadata line given its {description}; returns the handler and
+        the regex match with the parameters of the line, or {None} if the description is not
+        recognized
+        """
+        # look it up in the cache
+        meaning = self.descriptions.get(description, self.UNKNOWN)
+        # if it's there
+        if meaning is not self.UNKNOWN:
+            # all done
+            return meaning
+
+        # otherwise, resolve it; start with the prefixes
+        for prefix, name in self.PREFIXES:
+            # if the description starts with this one
+            if description.startswith(prefix):
+                # got it
+                meaning = getattr(self, name), None
+                # no need to look any further
+                break
+        # if that didn't work
+        else:
+            # look up the exact markers; the patterns used to be anchored at the end with a '$',
+            # which also matches right before a trailing newline, so look for that as well
+            name = self.MARKERS.get(description) or self.MARKERS.get(
+                description[:-1] if description.endswith('\n') else None)
+            # if it's there
+            if name is not None:
+                # got it
+                meaning = getattr(self, name), None
+            # otherwise
+            else:
+                # go through the patterns in order
+                for name, pattern in self.PATTERNS:
+                    # attempt to match
+                    match = pattern.match(description)
+                    # if it worked
+                    if match:
+                        # got it
+                        meaning = getattr(self, name), match
+                        # no need to look any further
+                        break
+                # if nothing matched
+                else:
+                    # we don't know what this is
+                    meaning = None
+
+        # if the cache is full
+        if len(self.descriptions) >= self.CACHE:
+            # flush it; descriptions with parameters can be unique to an invoice, so this keeps
+            # the memory footprint in check without bothering with usage statistics
+            self.descriptions.clear()
+        # save the meaning
+        self.descriptions[description] = meaning
+        # and return it
+        return meaning
+
+
+    def boundary(self, stream, offset):
+        """
+        Find the offset of the first record of the first invoice that starts after {offset} in
+        the binary {stream}, or {None} if there isn't one
+        """
+        # go to the offset
+        stream.seek(offset)
+        # skip the rest of the line we landed in
+        stream.readline()
+        # read the next one
+        line = stream.readline()
+        # if there isn't one
+        if not line:
+            # there are no more invoices
+            return None
+        # get the invoice number
+        current = self.invoiceNumber(line=line)
+        # look for the next one
+        while True:
+            # get the position of the next line
+            position = stream.tell()
+            # read it
+            line = stream.readline()
+            # if there isn't one
+            if not line:
+                # there are no more invoices
+                return None
+            # if it belongs to a different invoice
+            if self.invoiceNumber(line=line) != current:
+                # we are at the boundary
+                return position
+
+
+    def invoiceNumber(self, line):
+        """
+        Extract the invoice number from a raw {line} of the journal
+        """
+        # parse the line and pull the number
+        return next(csv.reader([line.decode(self.ENCODING)]))[self.OFFSET_INVOICE]
+
+
     # invoice life cycle management
     def finalizeInvoice(self, invoice):
         """
@@ -239,24 +526,81 @@ class Transactions:
         Parse a floating point number out of text
         """
         # detect the parentheses that indicate a negative number
-        if text[0] == '(' and text[-1] == ')':
+        if text[-1] == ')':
             # strip and parse
-            return -float(''.join(text[1:-1].split(',')))
+            return -float(text[1:-1].replace(',', ''))
         # otherwise, let float do its thing
-        return float(''.join(text.split(',')))
+        return float(text.replace(',', ''))
 
 
-    def money(self, text):
+    def extract(self, pattern, text):
         """
-        Parse a floating point number out of text
+        Match {text} against {pattern}; a record that doesn't match is malformed
+        """
+        # attempt to match
+        match = pattern.match(text)
+        # if it didn't
+        if match is None:
+            # complain
+            raise ValueError('could not parse {!r}'.format(text))
+        # otherwise, hand it back
+        return match
+
+
+    # currency converters; {money} is bound to one of these, depending on the {currency} the
+    # client asked for
+    def dollars(self, text):
+        """
+        Parse an amount out of text as a floating point number of dollars
         """
         # detect the parentheses that indicate a negative number
-        if text[0] == '(' and text[-1] == ')':
+        if text[-1] == ')':
             # strip the pair of parentheses and the dollar sign
-            return -1*float(''.join(text[2:-1].split(',')))
+            return -float(text[2:-1].replace(',', ''))
+        # otherwise, strip the dollar sign
+        return float(text[1:].replace(',', ''))
 
+
+    def cents(self, text):
+        """
+        Parse an amount out of text as an integer number of cents
+        """
+        # detect the parentheses that indicate a negative number
+        negative = text[-1] == ')'
+        # strip the dollar sign and the parentheses
+        digits = text[2:-1] if negative else text[1:]
+        # most amounts are small enough to not have thousands separators
+        if ',' in digits:
+            # but some do
+            digits = digits.replace(',', '')
+        # if the amount has exactly two decimals, as the journal renders them
+        if digits[-3:-2] == '.':
+            # drop the decimal point
+            cents = int(digits.replace('.', ''))
         # otherwise
-        return float(''.join(text[1:].split(',')))
+        else:
+            # split
+            whole, _, fraction = digits.partition('.')
+            # anything smaller than a cent cannot be represented
+            if len(fraction) > 2:
+                # so complain
+                raise ValueError('{!r}: fractional cents'.format(text))
+            # assemble
+            cents = 100 * int(whole or '0') + int(fraction.ljust(2, '0'))
+        # apply the sign and return
+        return -cents if negative else cents
+
+
+    def exact(self, text):
+        """
+        Parse an amount out of text as a {decimal.Decimal} number of dollars
+        """
+        # detect the parentheses that indicate a negative number
+        if text[-1] == ')':
+            # strip the pair of parentheses and the dollar sign
+            return -decimal.Decimal(text[2:-1].replace(',', ''))
+        # otherwise, strip the dollar sign
+        return decimal.Decimal(text[1:].replace(',', ''))
 
 
     # invoice meta data handlers
@@ -394,11 +738,8 @@ class Transactions:
 
         # if it's a removal of a refund
         if action.startswith('Removed >>'):
-            # add it to the corrections
-            print('********************************8')
-            raise SystemExit(0)
-            invoice.corrections.append(coupon)
-            return
+            # we haven't seen one of these yet, so we don't know how to handle it
+            raise ValueError('removal of coupon {!r} is not supported'.format(coupon.code))
 
         # add it to the refunds
         invoice.discounts.append(coupon)
@@ -594,23 +935,27 @@ class Transactions:
         else:
              # we have no cardholder info
             cardholder = None
+        # if we still don't have a card type
+        if not match:
+            # complain
+            raise ValueError('could not find the card type in {!r}'.format(info))
         # extract the card type and method
         kind, method = match.groups()
         # if we have a card holder
-        if cardholder:
-            # make sure the card was swiped
-            assert method == 'Swiped'
+        if cardholder and method != 'Swiped':
+            # the card must have been swiped
+            raise ValueError('card with a cardholder name was not swiped: {!r}'.format(method))
         # show me
         # print('    kind: {!r}, method: {!r}'.format(kind, method))
 
         # next, the account number
         info = next(records)[self.OFFSET_DESCRIPTION]
-        account = self.CARD_ACCOUNT.match(info).group(1)
+        account = self.extract(pattern=self.CARD_ACCOUNT, text=info).group(1)
         # print('    account: {!r}'.format(account))
 
         # expiration
         info = next(records)[self.OFFSET_DESCRIPTION]
-        expiration = self.CARD_EXPIRATION.match(info).group(1)
+        expiration = self.extract(pattern=self.CARD_EXPIRATION, text=info).group(1)
         # print('    expiration: {!r}'.format(expiration))
 
         # the next line is a blank
@@ -618,15 +963,14 @@ class Transactions:
 
         # charge amount
         info = next(records)[self.OFFSET_DESCRIPTION]
-        amount = self.float(self.CARD_AMOUNT.match(info).group(1))
+        amount = self.float(self.extract(pattern=self.CARD_AMOUNT, text=info).group(1))
         # print('    amount: {!r}'.format(amount))
 
         # approvals only for credit cards
         if kind != 'DEBIT':
             # extract the number
             info = next(records)[self.OFFSET_DESCRIPTION]
-            print(kind, info)
-            approval = self.CARD_APPROVAL.match(info).group(1)
+            approval = self.extract(pattern=self.CARD_APPROVAL, text=info).group(1)
             # print('    approval: {!r}'.format(approval))
         # otherwise
         else:
@@ -635,7 +979,7 @@ class Transactions:
 
         # date
         info = next(records)[self.OFFSET_DESCRIPTION]
-        date = self.CARD_DATE.match(info).group(1)
+        date = self.extract(pattern=self.CARD_DATE, text=info).group(1)
         # print('    date: {!r}'.format(date))
 
         # the next line is a blank
@@ -643,7 +987,7 @@ class Transactions:
 
         # reference number
         info = next(records)[self.OFFSET_DESCRIPTION]
-        reference = self.CARD_REFERENCE.match(info).group(1)
+        reference = self.extract(pattern=self.CARD_REFERENCE, text=info).group(1)
         # print('    reference: {!r}'.format(reference))
 
         # if the card type is not debit
@@ -676,11 +1020,11 @@ class Transactions:
         """
         # balance info
         info = next(records)[self.OFFSET_DESCRIPTION]
-        date, balance = self.GIFT_BALANCE.match(info).group(1,2)
+        date, balance = self.extract(pattern=self.GIFT_BALANCE, text=info).group(1,2)
 
         # authorization
         info = next(records)[self.OFFSET_DESCRIPTION]
-        authorization = self.GIFT_AUTHORIZATION.match(info).group(1)
+        authorization = self.extract(pattern=self.GIFT_AUTHORIZATION, text=info).group(1)
 
         # all done
         return
@@ -718,6 +1062,32 @@ class Transactions:
         return
 
 
+    # meta-methods
+    def __init__(self, currency='float', **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the cache of classified metadata descriptions
+        self.descriptions = {}
+        # pick the currency converter
+        self.setCurrency(currency=currency)
+        # all done
+        return
+
+
+    def __getstate__(self):
+        # the classification cache holds bound methods and regex matches, so leave it behind
+        return {'currency': self.currency}
+
+
+    def __setstate__(self, state):
+        # start with an empty classification cache
+        self.descriptions = {}
+        # and the same currency converter
+        self.setCurrency(currency=state['currency'])
+        # all done
+        return
+
+
     # constants -- for version 5.2.3 of the CATAPULT TJ-170 report
     OFFSET_START = 8
     OFFSET_FINISH = 10
@@ -738,41 +1108,61 @@ class Transactions:
 
     # the timestamp format
     TIME_FORMAT = "%m/%d/%Y %I:%M:%S%p"
-
-    # the meta data scanner
-    SCANNER = re.compile('|'.join([
-        r'(?P<void>All Void)',
-
+    # the representations of monetary amounts, and the names of their converters
+    CURRENCIES = {
+        'float': 'dollars', # floating point dollars
+        'cents': 'cents', # integer cents, for exact aggregation
+        'decimal': 'exact', # exact {decimal.Decimal} dollars
+        }
+    # the text encoding of the journal
+    ENCODING = 'utf-8'
+    # the size of the blocks to read when scanning a journal
+    CHUNK = 1 << 20
+
+    # the meta data classifier; the descriptions are checked against the prefixes first, then
+    # the exact markers, and finally the patterns, in order
+    PREFIXES = (
+        ('All Void', 'void'),
+        )
+
+    MARKERS = {
         # special items
-        r'(?P<giftadd>Gift Card Add to)$',
+        'Gift Card Add to': 'giftadd',
 
         # tenders
-        r'(?P<cash>(Removed >> )?Cash)$',
-        r'(?P<credit>(Removed >> )?Credit)$',
-        r'(?P<debit>(Removed >> )?Debit)$',
-        r'(?P<gift>(Removed >> )?GIFTCARD)$',
+        'Cash': 'cash', 'Removed >> Cash': 'cash',
+        'Credit': 'credit', 'Removed >> Credit': 'credit',
+        'Debit': 'debit', 'Removed >> Debit': 'debit',
+        'GIFTCARD': 'gift', 'Removed >> GIFTCARD': 'gift',
 
         # markers
-        r'(?P<subtotal>SUBTOTAL)$',
-        r'(?P<total>TOTAL)$',
-        r'(?P<tendered>TOTAL TENDERED)$',
-        r'(?P<change>(Change)|(CHANGE))$',
-        r'(?P<cardinfo>--- Card Information ---)$',
-        r'(?P<giftinfo>Gift Card Account #{13})$',
+        'SUBTOTAL': 'subtotal',
+        'TOTAL': 'total',
+        'TOTAL TENDERED': 'tendered',
+        'Change': 'change', 'CHANGE': 'change',
+        '--- Card Information ---': 'cardinfo',
+        'Gift Card Account #############': 'giftinfo',
+        }
+
+    PATTERNS = tuple((name, re.compile(pattern)) for name, pattern in (
         #
-        r'(?P<suspend>Suspend by\s+(?P<suspender>.+)\s+@\s+(?P<suspended>.+)\s*)$',
-        r'(?P<resume>Resumed by\s+(?P<resumer>.+)\s+@\s+(?P<resumed>.+)\s*)$',
+        ('suspend', r'Suspend by\s+(?P<suspender>.+)\s+@\s+(?P<suspended>.+)\s*$'),
+        ('resume', r'Resumed by\s+(?P<resumer>.+)\s+@\s+(?P<resumed>.+)\s*$'),
         #
-        r'(?P<prompt>Prompt (.+): (.+))$',
+        ('prompt', r'Prompt (.+): (.+)$'),
 
         # adjustments
-        r'(?P<coupon>Mfr\. Coupon (?P<code>.+))$',
-        r'(?P<refund>.* Refund|Softers Deposit Ref)',
-        r'(?P<account>.*Paid on Account)$',
-        r'(?P<discount>.*Discount)$',
-        r'(?P<taxes>.*Tax)$',
-
-        ]))
+        ('coupon', r'Mfr\. Coupon (?P<code>.+)$'),
+        ('refund', r'.* Refund|Softers Deposit Ref'),
+        ('account', r'.*Paid on Account$'),
+        ('discount', r'.*Discount$'),
+        ('taxes', r'.*Tax$'),
+        ))
+
+    # the maximum number of classified descriptions to remember
+    CACHE = 1 << 14
+    # the marker for descriptions that have not been classified yet
+    UNKNOWN = object()
 
     CARD_TYPE = re.compile('Card Type:\s+([^\s]+)\s+\((Manual|Swiped)\)')
     CARD_ACCOUNT = re.compile('Account #: (.+)')
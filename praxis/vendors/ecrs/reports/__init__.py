@@ -13,8 +13,17 @@ from .Staff import Staff as staff
 # the transaction parser
 from .Transactions import Transactions as transactions
 
+# mispunch reconciliation
+from .Reconciler import Reconciler as reconciler
+
+# the per employee payroll reports
+from .Audit import Audit as audit
+from .Detail import Detail as detail
+
 # performance reports
 from .Daily import Daily as daily
+from .Rollup import Rollup as rollup
+from .Throughput import Throughput as throughput
 
 
 # end of file
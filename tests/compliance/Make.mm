@@ -19,5 +19,7 @@ sanity:
 
 compliance:
 	${PYTHON} ./california.py
+	${PYTHON} ./california_batch.py
+	${PYTHON} ./california_timesheet.py
 
 # end of file
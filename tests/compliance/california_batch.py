@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the whole payroll overtime classifier agrees with the one employee-week at a time
+calculator on randomly generated payrolls, to the second
+"""
+
+
+# the test script
+def test(trials=200, seed=0):
+    """
+    Run the various tests
+    """
+    # externals
+    import random
+    # get {praxis}
+    import praxis
+
+    # create a calculator compliant with California laws and regulations
+    california = praxis.compliance.us.california()
+    # make a random number generator; seeded, so failures are reproducible
+    rng = random.Random(seed)
+
+    # generate payrolls
+    for trial in range(trials):
+        # pick a size
+        employees = rng.randint(1, 12)
+        weeks = rng.randint(1, 4)
+        days = 7 * weeks
+        # fill the matrix
+        hours = [ shift(rng) for _ in range(employees * days) ]
+        # classify the whole payroll
+        regular, sesqui, double = california.classify(hours=hours, days=days)
+        # check the layout
+        assert len(regular) == len(sesqui) == len(double) == employees * weeks
+
+        # now, go through the employee weeks one at a time
+        for week in range(employees * weeks):
+            # compute the tiers
+            tiers = california._overtime(hours=tuple(hours[7*week:7*week+7]))
+            # and compare; the two may round differently, so they only have to agree to the
+            # second
+            assert all(abs(expected - computed) < 1/3600 for expected, computed in zip(
+                tiers, (regular[week], sesqui[week], double[week]))), (trial, week)
+
+    # a few canonical weeks, for good measure
+    weeks = [
+        ((12, 12, 12, 12, 0, 0, 0), (32, 16, 0)),
+        ((8, 8, 8, 8, 8, 8, 0), (40, 8, 0)),
+        ((11, 15, 14, 9, 8, 14, 10), (40, 32, 9)),
+        ]
+    # classify them all at once
+    regular, sesqui, double = california.classify(
+        hours=[ hours for week, _ in weeks for hours in week ], days=7)
+    # and check
+    assert list(zip(regular, sesqui, double)) == [ tiers for _, tiers in weeks ]
+
+    # all done
+    return
+
+
+# helpers
+def shift(rng):
+    """
+    Generate the hours worked in a single day
+    """
+    # pick a kind of day
+    kind = rng.random()
+    # days off are common
+    if kind < .25: return 0
+    # as are whole hour shifts
+    if kind < .5: return rng.choice((4, 6, 8, 10, 12, 14))
+    # and, on occasion, very long ones
+    if kind < .55: return 12 + 4*rng.random()
+    # the rest are clocked to the second
+    return rng.randint(1, 13*3600) / 3600
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the single pass calculator agrees with {overtime}, {overtime2} and {breaks}, and
+that {overtime} and {overtime2} agree with each other
+"""
+
+
+# the test script
+def test(trials=100, seed=0):
+    """
+    Run the various tests
+    """
+    # externals
+    import collections, datetime, random
+    # get {praxis}
+    import praxis
+
+    # create a calculator compliant with California laws and regulations
+    california = praxis.compliance.us.california()
+    # get the punch list factory
+    punchlist = praxis.vendors.ecrs.model.punchlist
+    # make a random number generator; seeded, so failures are reproducible
+    rng = random.Random(seed)
+    # units
+    day = datetime.timedelta(days=1)
+    minute = datetime.timedelta(minutes=1)
+    # the start of the pay period
+    start = datetime.date(2017, 4, 3)
+
+    # generate timecards
+    for trial in range(trials):
+        # make one
+        timecard = collections.defaultdict(punchlist)
+        # fill a pay period
+        for offset in range(14):
+            # skip some days
+            if rng.random() < .2: continue
+            # get the date
+            date = start + offset*day
+            # pick a clock in time
+            clockin = datetime.datetime.combine(date, datetime.time(6)) + rng.randrange(240)*minute
+            # and a shift length
+            shift = rng.randrange(2*60, 15*60)
+            # some take a break
+            if rng.random() < .6:
+                # pick the split
+                split = rng.randrange(shift)
+                # and the break length
+                pause = rng.randrange(10, 45)
+                # the first half
+                timecard[date].newTask(name='in', start=clockin, finish=clockin + split*minute)
+                # and the second
+                timecard[date].newTask(name='in',
+                                       start=clockin + (split+pause)*minute,
+                                       finish=clockin + (shift+pause)*minute)
+            # others don't
+            else:
+                timecard[date].newTask(name='in', start=clockin, finish=clockin + shift*minute)
+
+        # run the single pass calculator
+        weeks = tuple(california.timesheet(start=start, workweeks=2, timecard=timecard))
+        # and the individual ones
+        raw = tuple(california.overtime(start=start, workweeks=2, timecard=timecard))
+        adjusted = tuple(california.breaks(start=start, workweeks=2, timecard=timecard))
+        daily = tuple(california.overtime2(start=start, workweeks=2, timecard=timecard))
+
+        # compare
+        assert tuple(tiers for tiers, _, _ in weeks) == raw
+        assert tuple(tiers for _, tiers, _ in weeks) == adjusted
+        assert tuple(entry for _, _, detail in weeks for entry in detail) == daily
+
+        # the weekly and daily classifications must agree to within a second
+        for week, (tiers, _, detail) in enumerate(weeks):
+            # add up the daily detail
+            totals = map(sum, zip(*(hours for _, hours in detail)))
+            # and compare
+            for weekly, summed in zip(tiers, totals):
+                assert abs(weekly - summed) < 1/3600, (trial, week)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
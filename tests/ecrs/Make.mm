@@ -12,7 +12,7 @@ PACKAGE = tests
 
 all: test
 
-test: sanity punches staff
+test: sanity punches staff journal output
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -20,8 +20,42 @@ sanity:
 punches:
 	${PYTHON} ./punch_create.py
 	${PYTHON} ./punch_parse.py
+	${PYTHON} ./punch_fast.py
+	${PYTHON} ./punch_totals.py
+	${PYTHON} ./timecard_cache.py
+	${PYTHON} ./timecard_parallel.py
+	${PYTHON} ./punch_store.py
+	${PYTHON} ./punch_archive.py
+	${PYTHON} ./punch_ingest.py
+	${PYTHON} ./punch_reconcile.py
+	${PYTHON} ./timecard_reconcile.py
+	${PYTHON} ./payroll_audit.py
+	${PYTHON} ./payroll_detail.py
+	${PYTHON} ./payroll_load.py
+	${PYTHON} ./payroll_dataset.py
 
 staff:
 	${PYTHON} ./staff.py
 
+journal:
+	${PYTHON} ./tj_stream.py
+	${PYTHON} ./tj_classify.py
+	${PYTHON} ./tj_shards.py
+	${PYTHON} ./tj_tolerant.py
+	${PYTHON} ./tj_progress.py
+	${PYTHON} ./tj_compact.py
+	${PYTHON} ./tj_money.py
+	${PYTHON} ./tj_rollup.py
+	${PYTHON} ./tj_persist.py
+	${PYTHON} ./tj_overlap.py
+	${PYTHON} ./tj_throughput.py
+
+output:
+	${PYTHON} ./report_output.py
+
+# benchmarks; not part of the regular test run
+benchmark:
+	${PYTHON} ./punch_benchmark.py
+	${PYTHON} ./tj_benchmark.py
+
 # end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the per employee payroll reports are the same whether the timecards are supplied
+or pulled from the punch store, and whether they are built serially or on a pool of processes
+"""
+
+
+# externals
+import concurrent.futures, datetime, itertools, os, pickle, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.compliance
+    # access the reports
+    reports = praxis.vendors.ecrs.reports
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, _, _ = reports.punches().parse(stream=stream, fast=True)
+
+    # units
+    day = datetime.timedelta(days=1)
+    # pretend they came from a single timecard whose payday is the last day on record
+    dates = sorted({ date for dates in punches.values() for date in dates })
+    payday = dates[-1]
+    # back up to the sunday before the first day
+    start = dates[0] - (dates[0].weekday() + 1) % 7 * day
+    # and move forward to the saturday after the last one
+    end = payday + (5 - payday.weekday()) % 7 * day
+    # build the dataset in the shape {Payroll.punches} generates
+    dataset = [ (eid, names[eid], { payday: punches[eid] }) for eid in sorted(punches) ]
+    # and the autovivified index {Payroll.punches} builds
+    index = praxis.patterns.vivify(levels=3, atom=praxis.vendors.ecrs.model.punchlist)
+    for eid in punches:
+        index[eid][payday] = punches[eid]
+
+    # pick a jurisdiction
+    js = praxis.compliance.us.california()
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # build the store
+        uri = os.path.join(scratch, "punches.store")
+        praxis.vendors.ecrs.archive.store.build(dataset=dataset).save(uri=uri)
+
+        # make an auditor
+        auditor = reports.audit(jurisdiction=js, store=uri, start=start, end=end)
+        # it survives pickling
+        clone = pickle.loads(pickle.dumps(auditor))
+        assert type(clone.jurisdiction) is type(js)
+        assert (clone.store, clone.start, clone.end) == (uri, start, end)
+
+        # go through the reports
+        for report in ('breaks', 'record', 'edd'):
+            # run them serially on the supplied timecards
+            serial = [
+                getattr(auditor, report)(eid=eid, name=name, timecards=timecards)
+                for eid, name, timecards in dataset ]
+            # pull the timecards from the store, in a single batch
+            stored = auditor.batch(
+                report=report, jobs=[ (eid, name, None) for eid, name, _ in dataset ])
+            # which releases the store when it's done
+            assert auditor._store is None
+            # spread the employees over a pool of processes, in batches, with the workers
+            # mapping the store on their own
+            mapped = run(auditor=auditor, report=report,
+                         jobs=[ (eid, name, None) for eid, name, _ in dataset ])
+            # and with the tables shipped to the workers, the way {Payroll.fanout} does when
+            # there is no store
+            shipped = run(auditor=auditor, report=report,
+                          jobs=[ (eid, name, dict(index[eid])) for eid, name, _ in dataset ])
+            # they all agree
+            assert serial == stored == mapped == shipped
+            # there is one file per employee
+            assert len({ outfile for outfile, _, _ in serial }) == len(dataset)
+
+        # the break summaries tally with the rows
+        for eid, name, timecards in dataset:
+            _, rows, summary = auditor.breaks(eid=eid, name=name, timecards=timecards)
+            instances, _, _, _ = summary
+            assert instances == sum(
+                1 for row in rows[3:] if float(row[6]) > 0.1 or float(row[7]) > 0.1)
+
+        # every employee gets the whole period in the benefits audit, not just the first one
+        weeks = ((end - start).days + 1) // 7
+        for eid, name, timecards in dataset:
+            _, audit, _ = auditor.edd(eid=eid, name=name, timecards=timecards)
+            assert len(audit) == weeks + 1
+            assert audit[1][0] == start and audit[-1][1] == end
+
+    # all done
+    return
+
+
+# helpers
+def run(auditor, report, jobs, size=2):
+    """
+    Run {report} on {jobs} on a pool of processes, in batches of {size} employees
+    """
+    # split the jobs into batches
+    batches = [ jobs[idx:idx+size] for idx in range(0, len(jobs), size) ]
+    # make a pool
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        # run the batches and flatten the results
+        return list(itertools.chain.from_iterable(
+            pool.map(auditor.batch, itertools.repeat(report), batches)))
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
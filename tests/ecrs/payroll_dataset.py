@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the payroll action picks the same employees and punches from the punch store as it
+does from the timecards, so that former employees don't show up in the reports of later pay
+periods
+"""
+
+
+# externals
+import csv, datetime, os, tempfile
+# the stand-ins for the plexus and the timecard nodes
+from payroll_load import host
+from timecard_parallel import node, flatten
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.actions
+    # units
+    day = datetime.timedelta(days=1)
+    # two pay periods
+    first = datetime.date(2014, 3, 14)
+    second = first + 14*day
+
+    # get the payroll action; it doesn't need the mispunch log
+    payroll = praxis.actions.payroll()
+    payroll.log = None
+    # make one that parses the timecards
+    parsed = payroll(name='parsed', spec='payroll', plexus=None)
+    # and one that reads the punch store
+    stored = payroll(name='stored', spec='payroll', plexus=None)
+    # a plexus
+    plexus = host(tables=[])
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the first timecard has an employee who is gone by the second one
+        early = os.path.join(scratch, 'early.csv')
+        with open(early, 'w') as stream:
+            for source in ("punches.csv", "punches-inout.csv"):
+                with open(source) as template:
+                    stream.write(template.read())
+        # the second one is the sample, two weeks later
+        late = shift(source="punches.csv", destination=os.path.join(scratch, 'late.csv'),
+                     offset=14*day)
+        # the timecards
+        timecards = [ (first, node(uri=early)), (second, node(uri=late)) ]
+        # build the punch store out of both of them
+        stored.store = os.path.join(scratch, 'punches.store')
+        praxis.vendors.ecrs.archive.store.build(dataset=parsed.dataset(
+            plexus=plexus, timecards=timecards, latest=False)).save(uri=stored.store)
+
+        # go through the ranges
+        for latest in (True, False):
+            # get the employees from the timecards
+            expected = [ (eid, name, flatten(table))
+                         for eid, name, table in parsed.dataset(
+                                 plexus=plexus, timecards=timecards, latest=latest) ]
+            # and from the store
+            computed = [ (eid, name, flatten(table))
+                         for eid, name, table in stored.dataset(plexus=plexus, latest=latest) ]
+            # release the store
+            stored.releaseStore()
+            # they agree
+            assert sorted(computed) == sorted(expected)
+            # and the former employee is only there when the first pay period is
+            assert ('1000' in { eid for eid, _, _ in computed }) == (not latest)
+
+        # the reports go through the same employees, serially and on a pool
+        expected = sorted(eid for eid, _, _ in parsed.dataset(plexus=plexus, timecards=timecards))
+        # go through the job counts
+        for jobs in (1, 2):
+            # set it
+            stored.jobs = jobs
+            # run a report
+            computed = [ eid for eid, *_ in stored.fanout(plexus=plexus, report='record') ]
+            # release the store
+            stored.releaseStore()
+            # and check
+            assert sorted(computed) == expected
+
+    # all done
+    return
+
+
+# helpers
+def shift(source, destination, offset):
+    """
+    Copy the timecard in {source} to {destination}, moving its punches by {offset}
+    """
+    # get the timestamp parser
+    import praxis.vendors.ecrs
+    parser = praxis.vendors.ecrs.reports.punches()
+    # the format of the timestamps
+    stamp = "{0.month}/{0.day}/{0.year}   {0:%I:%M:%S%p}"
+    # read the rows
+    with open(source, newline='') as stream:
+        rows = list(csv.reader(stream))
+    # go through them
+    for row in rows:
+        # and move the clock punches
+        for field in (10, 11):
+            row[field] = stamp.format(parser.timestamp(row[field]) + offset)
+    # save them
+    with open(destination, 'w', newline='') as stream:
+        csv.writer(stream, quoting=csv.QUOTE_ALL).writerows(rows)
+    # all done
+    return destination
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
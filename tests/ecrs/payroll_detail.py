@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the punch clock detail document is rendered correctly for one or more pay periods,
+in a single document or one per employee, serially and on a pool of processes
+"""
+
+
+# externals
+import concurrent.futures, datetime, io, os, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.compliance
+    # access the reports
+    reports = praxis.vendors.ecrs.reports
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, _, _ = reports.punches().parse(stream=stream, fast=True)
+
+    # units
+    day = datetime.timedelta(days=1)
+    # pretend they came from a single timecard whose payday is the last day on record
+    dates = sorted({ date for dates in punches.values() for date in dates })
+    payday = dates[-1]
+    paystart = payday - 13*day
+    # pick an employee who worked on the last day
+    eid = sorted(who for who in punches if payday in punches[who])[0]
+    # and give them a third task, after the last one
+    tasks = punches[eid][payday]
+    tasks.newTask(name=tasks[-1].name,
+                  start=tasks[-1].finish + datetime.timedelta(hours=1),
+                  finish=tasks[-1].finish + datetime.timedelta(hours=2))
+    # build the dataset in the shape {Payroll.punches} generates
+    dataset = [ (who, names[who], { payday: punches[who] }) for who in sorted(punches) ]
+
+    # pick a jurisdiction
+    js = praxis.compliance.us.california()
+    # make a renderer for the pay period
+    detail = reports.detail(jurisdiction=js, start=paystart, end=payday,
+                            include='/tex/include', graphics='/tex/graphics')
+
+    # render the tables
+    tables = [ detail.attendance(eid=who, name=name, timecards=timecards)
+               for who, name, timecards in dataset ]
+    # the crowded day was noticed
+    assert [ (who, crowded) for (who, _, _), (_, _, crowded) in zip(dataset, tables)
+             if crowded ] == [ (eid, [payday]) ]
+    # assemble the document
+    document = detail.document(
+        stream=io.StringIO(), attendance=[ table for _, table, _ in tables ]).getvalue()
+    # check the preamble
+    assert '\\edef\\input@path{{/tex/include/}\\input@path}' in document
+    assert '\\graphicspath{{/tex/graphics/}}' in document
+    assert 'payperiodEnd = {{{:%B %d, %Y}}},'.format(payday) in document
+    assert document.endswith('\\end {document}\n\n% end of file\n')
+    # there is a table per employee
+    assert document.count('\\begin{attendance}') == len(dataset)
+    # with a row per day and a rule at the end of each week
+    assert document.count('% punches') == 14 * len(dataset)
+    assert document.count('\\midrule') == 2 * len(dataset)
+    # the title is the name of the employee
+    last, first = names[eid]
+    assert '\\begin{{attendance}}{{{} {}}}\n'.format(first, last) in document
+    # and the crowded day is colorized
+    assert document.count('\\color{praxis@multi}') == 1
+
+    # a renderer for two pay periods
+    periods = reports.detail(jurisdiction=js, start=paystart - 14*day, end=payday,
+                             include='/tex/include', graphics='/tex/graphics')
+    # split the timecard of our employee in two
+    early = { payday - 14*day: punches[eid], payday: punches[eid] }
+    # render
+    _, table, crowded = periods.attendance(eid=eid, name=names[eid], timecards=early)
+    # there is a table per pay period, in chronological order, with the pay period in its title
+    assert table.count('\\begin{attendance}') == 2
+    assert table.index('{:%B %d} -- '.format(paystart - 14*day)) < table.index(
+        '{:%B %d} -- {:%B %d, %Y}'.format(paystart, payday))
+    # the crowded day only appears in the second one
+    assert crowded == [payday]
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # build the store
+        uri = os.path.join(scratch, "punches.store")
+        praxis.vendors.ecrs.archive.store.build(dataset=dataset).save(uri=uri)
+        # make a renderer that pulls the punches from the store
+        stored = reports.detail(jurisdiction=js, store=uri, start=paystart, end=payday,
+                                include='/tex/include', graphics='/tex/graphics')
+        # render the documents of each employee serially
+        serial = [ detail.packet(eid=who, name=name, timecards=timecards)
+                   for who, name, timecards in dataset ]
+        # and on a pool of processes
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+            parallel = pool.submit(
+                stored.batch, 'packet', [ (who, name, None) for who, name, _ in dataset ]).result()
+    # they agree
+    assert serial == parallel
+    # every employee has a file of their own
+    assert len({ outfile for outfile, _, _ in serial }) == len(dataset)
+    assert all(outfile.endswith('-{:%Y%m%d}-detail.tex'.format(payday))
+               for outfile, _, _ in serial)
+    # with the same table as the single document
+    for (_, table, _), (_, packet, _) in zip(tables, serial):
+        assert packet.count('\\begin{attendance}') == 1 and table in packet
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that loading clock punches into the database keeps their timestamps intact, and that
+loading a pay period again replaces it
+"""
+
+
+# externals
+import datetime, os, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.actions
+    # access the archive support
+    archive = praxis.vendors.ecrs.archive
+    # units
+    hour = datetime.timedelta(hours=1)
+
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, _, _ = praxis.vendors.ecrs.reports.punches().parse(stream=stream)
+    # pretend they came from a single timecard whose payday is the last day on record
+    payday = max(date for dates in punches.values() for date in dates)
+    # pick an employee who worked on the last day
+    eid = sorted(who for who in punches if payday in punches[who])[0]
+    # and give them a shift that runs past midnight
+    tasks = punches[eid][payday]
+    start = datetime.datetime.combine(payday, datetime.time(22))
+    tasks.newTask(name='in', start=start, finish=start + 4*hour)
+    # build the dataset
+    dataset = [ (who, names[who], { payday: punches[who] }) for who in sorted(punches) ]
+
+    # get the payroll action; it doesn't need the mispunch log
+    payroll = praxis.actions.payroll()
+    payroll.log = None
+    # make one
+    action = payroll(name='load', spec='payroll', plexus=None)
+    # make a plexus with an in-memory database
+    plexus = host(tables=[praxis.schema.hr.punch])
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # point the action to a punch store
+        action.store = os.path.join(scratch, 'punches.store')
+        # save the punches in it
+        archive.store.build(dataset=dataset).save(uri=action.store)
+        # load them
+        assert action.load(plexus=plexus) == 0
+        # everything made it, with its date intact
+        assert rows(plexus=plexus) == expected(dataset=dataset)
+        # including the overnight shift
+        assert (eid, payday.isoformat(), archive.store.seconds(start),
+                archive.store.seconds(start + 4*hour), 'in') in rows(plexus=plexus)
+
+        # export the pay period again, without the first employee
+        gone = dataset[0][0]
+        reexport = dataset[1:]
+        # save the new version
+        archive.store.build(dataset=reexport).save(uri=action.store)
+        # load it
+        assert action.load(plexus=plexus) == 0
+        # the period was replaced wholesale
+        assert rows(plexus=plexus) == expected(dataset=reexport)
+        assert gone not in { who for who, *_ in rows(plexus=plexus) }
+
+    # all done
+    return
+
+
+# helpers
+class host:
+    """
+    A stand-in for the application plexus, with an in-memory database that has the given
+    {tables}
+    """
+
+    # get the framework
+    import journal, pyre
+    # the schema
+    from praxis import schema
+    # and the queries
+    from praxis import queries
+
+    # meta-methods
+    def __init__(self, tables):
+        # make a channel for each kind of message
+        self.info, self.warning, self.error = (
+            self.journal.info('praxis.test'), self.journal.warning('praxis.test'),
+            self.journal.error('praxis.test'))
+        # keep the informational messages quiet
+        self.info.deactivate()
+        # make a server
+        server = self.pyre.db.sqlite(name='praxis.test.db')
+        # connect
+        server.attach()
+        # go through the tables
+        for table in tables:
+            # and make each one
+            server.createTable(table)
+        # and give it a datastore
+        self.datastore = type('datastore', (), {'server': server})
+        # all done
+        return
+
+
+def rows(plexus):
+    """
+    Retrieve the contents of the punch table
+    """
+    # easy enough
+    return sorted(plexus.datastore.server.execute(
+        'SELECT employee, payday, clockin, clockout, kind FROM punches').fetchall())
+
+
+def expected(dataset):
+    """
+    Build the rows the punch table should have after loading {dataset}
+    """
+    # easy enough
+    return sorted(
+        (eid, payday.isoformat(), task.clockin, task.clockout, task.name)
+        for eid, _, timecards in dataset
+        for payday, dates in timecards.items()
+        for tasks in dates.values()
+        for task in tasks)
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
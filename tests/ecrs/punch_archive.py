@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that punches survive a round trip through the binary punch archive
+"""
+
+
+# externals
+import datetime, os, stat, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the archive support
+    archive = praxis.vendors.ecrs.archive
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, warnings, errors = parser.parse(stream=stream, fast=True)
+    # pick a payday after all the punches
+    payday = max(date for dates in punches.values() for date in dates) + datetime.timedelta(1)
+    # build a store
+    store = archive.store.build(
+        dataset=((eid, names[eid], { payday: punches[eid] }) for eid in punches))
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the file
+        uri = os.path.join(scratch, "punches.archive")
+        # save the store in an archive
+        archive.archive.save(uri=uri, store=store)
+        # it has the permissions of a regular file
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(uri).st_mode) == 0o666 & ~umask
+        # load it
+        saved = archive.archive.load(uri=uri)
+        # check the tables
+        assert saved.people == store.people and saved.kinds == store.kinds
+        # and the record count
+        assert saved.count == store.rows
+        # rebuild the store
+        restored = saved.restore()
+        # and compare the columns
+        for mine, theirs in zip(restored.columns(), store.columns()):
+            assert list(mine) == list(theirs)
+        # release the map
+        saved.close()
+
+        # now, a file that is not an archive
+        bogus = os.path.join(scratch, "bogus.archive")
+        # with some random contents
+        with open(bogus, 'wb') as stream:
+            stream.write(b'not an archive')
+        # attempt to
+        try:
+            # load it
+            archive.archive.load(uri=bogus)
+        # it should fail
+        except ValueError:
+            pass
+        # if it doesn't
+        else:
+            # complain
+            assert False, "loaded a bogus archive"
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Compare the {strptime} based punch parser with the fast one on a synthetic multi-year archive
+"""
+
+
+# externals
+import datetime, io, random, time
+
+
+# the benchmark
+def benchmark(employees=60, years=3, seed=0):
+    """
+    Time the two parser modes on the same synthetic archive
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+    # build the archive
+    archive = synthesize(employees=employees, years=years, seed=seed)
+    # show me
+    print("archive: {} employees, {} years, {} punches".format(
+        employees, years, archive.count("\n")))
+
+    # time the two modes
+    results = {}
+    for fast in (False, True):
+        # wrap the archive in a stream
+        stream = io.StringIO(archive)
+        # with a name, as if it came from a file
+        stream.name = "synthetic-time.csv"
+        # start the clock
+        start = time.perf_counter()
+        # parse
+        results[fast] = parser.parse(stream=stream, fast=fast)
+        # stop the clock
+        elapsed = time.perf_counter() - start
+        # show me
+        print("  {:>8}: {:.3f} sec".format("fast" if fast else "strptime", elapsed))
+
+    # verify that the two modes agree
+    slow, fast = results[False], results[True]
+    assert slow[0] == fast[0]
+    assert {
+        (eid, date): [(t.name, t.start, t.finish) for t in tasks]
+        for eid, dates in slow[1].items() for date, tasks in dates.items()
+        } == {
+        (eid, date): [(t.name, t.start, t.finish) for t in tasks]
+        for eid, dates in fast[1].items() for date, tasks in dates.items()
+        }
+
+    # all done
+    return
+
+
+def synthesize(employees, years, seed):
+    """
+    Build a timecard archive with a split shift per employee per work day
+    """
+    # make a random number generator
+    rng = random.Random(seed)
+    # units
+    day = datetime.timedelta(days=1)
+    minute = datetime.timedelta(minutes=1)
+    # the first day of the archive
+    first = datetime.datetime(2015, 1, 1)
+    # the record prototype for version 3.2.02 of the CATAPULT report
+    row = ['Time Clock Detail Report', 'Page -1 of 1', '', '', '', '', None,
+           'Clock In', 'Clock Out', 'Hours', None, None, '', '', '', '', '', 'Report Version3.2.02']
+
+    # the pile of lines
+    lines = []
+    # go through the employees
+    for eid in range(1000, 1000+employees):
+        # render the employee info
+        row[6] = "{:,}   Last{},  First{}".format(eid, eid, eid)
+        # and their work days
+        for offset in range(365*years):
+            # some days off
+            if rng.random() < .3: continue
+            # the shift start
+            start = first + offset*day + rng.randrange(6*60, 11*60)*minute
+            # the lunch break
+            lunch = start + rng.randrange(3*60, 5*60)*minute
+            back = lunch + rng.randrange(20, 45)*minute
+            # the end of the shift
+            end = back + rng.randrange(3*60, 5*60)*minute
+            # render the two tasks
+            for clockin, clockout in ((start, lunch), (back, end)):
+                row[10] = stamp(clockin)
+                row[11] = stamp(clockout)
+                lines.append(",".join('"{}"'.format(field) for field in row))
+
+    # assemble and return
+    return "\n".join(lines) + "\n"
+
+
+def stamp(timestamp):
+    """
+    Render a timestamp the way the CATAPULT report does
+    """
+    # no leading zeroes, and lots of space between the date and the time
+    return "{0.month}/{0.day}/{0.year}   {1}:{0:%M:%S%p}".format(
+        timestamp, (timestamp.hour % 12) or 12)
+
+
+# main
+if __name__ == "__main__":
+    benchmark()
+
+
+# end of file
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the fast punch parser produces the same results as the {strptime} based one
+"""
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+
+    # parse the sample timecards both ways
+    with open("punches.csv") as stream:
+        slow = parser.parse(stream=stream)
+    with open("punches.csv") as stream:
+        fast = parser.parse(stream=stream, fast=True)
+
+    # unpack
+    slowNames, slowPunches, slowWarnings, slowErrors = slow
+    fastNames, fastPunches, fastWarnings, fastErrors = fast
+    # the employee index must be identical
+    assert slowNames == fastNames
+    # as should the events
+    assert list(map(str, slowWarnings)) == list(map(str, fastWarnings))
+    assert list(map(str, slowErrors)) == list(map(str, fastErrors))
+    # and the punches
+    assert flatten(slowPunches) == flatten(fastPunches)
+
+    # now, a few timestamps, canonical and otherwise
+    stamps = [
+        "3/11/2014   2:22:31PM", "03/01/2014 12:00:00AM", "3/1/2014 12:59:59pm",
+        "12/31/2013  11:59:59PM", "2/29/2016 1:02:03AM",
+        ]
+    # go through them
+    for stamp in stamps:
+        # and verify
+        assert parser.timestamp(stamp) == parser.strptime(stamp)
+
+    # and some bad ones that must be rejected the same way
+    bad = [
+        "2/30/2015 1:02:03AM", "3/11/2014 13:22:31PM", "3/11/2014 0:22:31PM",
+        "3/11/2014 2:61:31PM", "3/11/2014 2:22:61PM", "13/11/2014 2:22:31PM",
+        "12/31/2013  11:59:59 PM",
+        ]
+    # go through them
+    for stamp in bad:
+        # collect the complaints
+        complaints = []
+        # the slow way
+        for convert in (parser.strptime, parser.timestamp):
+            # attempt to
+            try:
+                # convert
+                convert(stamp)
+            # if it fails
+            except ValueError as error:
+                # record the reason
+                complaints.append(str(error))
+        # both must have complained the same way
+        assert len(complaints) == 2 and complaints[0] == complaints[1]
+
+    # all done
+    return
+
+
+# helpers
+def flatten(punches):
+    """
+    Convert the punch table into a comparable structure
+    """
+    # easy enough
+    return {
+        (eid, date): [(task.name, task.start, task.finish) for task in tasks]
+        for eid, dates in punches.items() for date, tasks in dates.items()
+        }
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that incremental ingestion only picks up new timecards and replaces periods that were
+exported again
+"""
+
+
+# externals
+import datetime, os, shutil, stat, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the archive support
+    archive = praxis.vendors.ecrs.archive
+    # units
+    day = datetime.timedelta(days=1)
+    # a couple of paydays
+    first = datetime.date(2014, 3, 14)
+    second = first + 14*day
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the timecards
+        timecards = []
+        # make two of them out of the sample
+        for payday in (first, second):
+            # form the file name
+            uri = os.path.join(scratch, payday.strftime('%Y%m%d') + '-time.csv')
+            # copy the sample
+            shutil.copy("punches.csv", uri)
+            # and add it to the pile
+            timecards.append((payday, uri))
+        # the location of the watermark
+        mark = os.path.join(scratch, 'punches.store.watermark')
+
+        # nothing has been ingested yet
+        watermark = archive.watermark.load(uri=mark)
+        # so everything is pending
+        pending = tuple(watermark.pending(timecards=timecards))
+        assert [ uri for _, uri, _ in pending ] == [ uri for _, uri in timecards ]
+        # ingest
+        store = ingest(store=None, pending=pending)
+        # move the watermark
+        watermark.advance(ingested=pending)
+        watermark.save(uri=mark)
+        # the watermark has the permissions of a regular file
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(mark).st_mode) == 0o666 & ~umask
+        # check
+        rows = store.rows
+        assert watermark.payday == second
+
+        # reload the watermark
+        watermark = archive.watermark.load(uri=mark)
+        # it should have remembered the payday
+        assert watermark.payday == second
+        # nothing is pending
+        assert not tuple(watermark.pending(timecards=timecards))
+
+        # export the latest period again, with one less punch
+        with open("punches.csv") as stream:
+            lines = stream.readlines()
+        with open(timecards[-1][1], 'w') as stream:
+            stream.writelines(lines[:-1])
+        # and modify an older one; it is below the watermark so it should be ignored
+        with open(timecards[0][1], 'a') as stream:
+            stream.write('\n')
+        # now the latest one is pending
+        pending = tuple(watermark.pending(timecards=timecards))
+        assert [ uri for _, uri, _ in pending ] == [ timecards[-1][1] ]
+        # ingest
+        store = ingest(store=store, pending=pending)
+        # its punches must have replaced the old ones
+        assert store.rows == rows - 1
+        # move the watermark
+        watermark.advance(ingested=pending)
+        # nothing is pending
+        assert not tuple(watermark.pending(timecards=timecards))
+
+    # all done
+    return
+
+
+# helpers
+def ingest(store, pending):
+    """
+    Parse the timecards in {pending} and merge them into {store}
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the archive support
+    archive = praxis.vendors.ecrs.archive
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+    # the names
+    names = {}
+    # and the punches per employee
+    index = {}
+    # go through the timecards
+    for payday, uri, _ in pending:
+        # parse
+        with open(uri) as stream:
+            _, punches, _, _ = parser.parse(stream=stream, names=names, fast=True)
+        # transfer
+        for eid in punches:
+            index.setdefault(eid, {})[payday] = punches[eid]
+    # package
+    fresh = archive.store.build(dataset=((eid, names[eid], index[eid]) for eid in index))
+    # merge
+    return fresh if store is None else store.merge(
+        other=fresh, paydays=[ payday for payday, _, _ in pending ])
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
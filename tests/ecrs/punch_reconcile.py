@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify the interval index of employee tasks and the reconciliation of mispunch corrections
+"""
+
+
+# externals
+import datetime
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the model
+    model = praxis.vendors.ecrs.model
+    # a day
+    day = datetime.date(2017, 4, 10)
+    # and the one before
+    yesterday = day - datetime.timedelta(days=1)
+    # and a way to make timestamps on it
+    at = lambda hour, minute=0, date=day: datetime.datetime.combine(
+        date, datetime.time(hour, minute))
+
+    # make a timeline with tasks that arrive out of order
+    timeline = model.timeline()
+    late = timeline.add(model.task(name='in', start=at(13), finish=at(17)))
+    early = timeline.add(model.task(name='in', start=at(8), finish=at(12)))
+    # they are sorted
+    assert list(timeline) == [early, late]
+    # loading is not an edit
+    assert timeline.changes == []
+    # lookups
+    assert timeline.overlapping(start=at(11), finish=at(14)) == [early, late]
+    assert timeline.overlapping(start=at(12), finish=at(13)) == []
+    assert timeline.day(date=day) == [early, late]
+    assert timeline.day(date=day + datetime.timedelta(days=1)) == []
+    # the holes in the day
+    assert list(timeline.gaps(start=at(7), finish=at(18))) == [
+        (model.task.seconds(at(7)), model.task.seconds(at(8))),
+        (model.task.seconds(at(12)), model.task.seconds(at(13))),
+        (model.task.seconds(at(17)), model.task.seconds(at(18))),
+        ]
+    assert list(timeline.overlaps()) == []
+
+    # trimming moves the task in the index
+    timeline.trim(task=late, start=at(11), name='correction')
+    assert late.start == at(11) and late.name == 'correction'
+    assert list(timeline.overlaps()) == [(early, late)]
+    # and records the edit
+    assert timeline.changes[-1] == (
+        'trim', ('in', model.task.seconds(at(13)), model.task.seconds(at(17))),
+        ('correction', model.task.seconds(at(11)), model.task.seconds(at(17))))
+    # merging removes the overlap
+    merged = timeline.merge(first=early, second=late)
+    assert list(timeline) == [merged] and merged.start == at(8) and merged.finish == at(17)
+    # splitting puts the lunch back
+    morning, afternoon = timeline.split(task=merged, start=at(12), finish=at(12, 30))
+    assert list(timeline) == [morning, afternoon]
+    assert (morning.start, morning.finish) == (at(8), at(12))
+    assert (afternoon.start, afternoon.finish) == (at(12, 30), at(17))
+    # inserting and deleting
+    extra = timeline.insert(name='addition', start=at(18), finish=at(19))
+    assert list(timeline) == [morning, afternoon, extra]
+    timeline.delete(task=extra)
+    assert list(timeline) == [morning, afternoon]
+    # the edits are all there, in order
+    assert [ operation for operation, _, _ in timeline.changes ] == [
+        'trim', 'merge', 'merge', 'split', 'split', 'insert', 'delete']
+
+    # long tasks are found from spans that start after them
+    timeline.add(model.task(name='in', start=at(0), finish=at(23)))
+    assert len(timeline.overlapping(start=at(22), finish=at(22, 30))) == 1
+
+    # now the reconciler; build a table of punches for a few employees
+    punches = {
+        # clocked in and out once, missed the lunch punches
+        '1': { day: model.punchlist([ model.task(name='in', start=at(9), finish=at(17)) ]) },
+        # took lunch, but forgot to clock out at the end of the day
+        '2': { day: model.punchlist([
+            model.task(name='in', start=at(8), finish=at(12)),
+            model.task(name='in', start=at(13), finish=at(13)),
+            ]) },
+        # nothing on the day of the correction
+        '3': { yesterday: model.punchlist([
+            model.task(name='in', start=at(8, date=yesterday), finish=at(16, date=yesterday)),
+            ]) },
+        }
+    reconciler = praxis.vendors.ecrs.reports.reconciler(punches=punches)
+    # corrections
+    t = datetime.time
+    reconciler.apply(eid='1', date=day, lunchOut=t(12), lunchIn=t(12, 30), end=t(17))
+    reconciler.apply(eid='2', date=day, end=t(17, 15))
+    reconciler.apply(eid='3', date=day, start=t(7), end=t(15))
+    # a brand new employee
+    reconciler.apply(eid='4', date=day, start=t(10), lunchOut=t(14))
+
+    # check
+    table = reconciler.table()
+    spans = lambda eid, date=day: [
+        (task.name, task.start, task.finish) for task in table[eid][date] ]
+    assert spans('1') == [
+        ('correction', at(9), at(12)), ('addition', at(12, 30), at(17)) ]
+    assert spans('2') == [ ('in', at(8), at(12)), ('correction', at(13), at(17, 15)) ]
+    assert spans('3') == [ ('addition', at(7), at(15)) ]
+    assert spans('3', yesterday) == [ ('in', at(8, date=yesterday), at(16, date=yesterday)) ]
+    assert spans('4') == [ ('addition', at(10), at(14)) ]
+    # the punch lists compute their totals
+    assert table['1'][day].hours == 7.5 and table['1'][day].breaks == 0.5
+
+    # the diff has every edit, tagged with the employee id
+    assert [ (eid, operation) for eid, operation, _, _ in reconciler.changes ] == [
+        ('1', 'trim'), ('1', 'insert'), ('2', 'trim'), ('3', 'insert'), ('4', 'insert') ]
+    # and renders
+    assert reconciler.render(reconciler.changes[0]) == (
+        '1: trim: in 2017-04-10 09:00 - 2017-04-10 17:00 -> '
+        'correction 2017-04-10 09:00 - 2017-04-10 12:00')
+    # no overlaps, no complaints
+    assert list(reconciler.overlaps()) == [] and reconciler.warnings == []
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the columnar punch store reproduces the parsed timecards and survives a round trip
+through a file
+"""
+
+
+# externals
+import datetime, os, stat, sys, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, warnings, errors = parser.parse(stream=stream, fast=True)
+
+    # pretend they came from two timecards, split at the midpoint of the date range
+    dates = sorted({ date for dates in punches.values() for date in dates })
+    cut = dates[len(dates)//2]
+    early, late = cut - datetime.timedelta(days=1), dates[-1]
+    # build the dataset in the shape {Payroll.punches} generates
+    dataset = [
+        (eid, names[eid], {
+            payday: { date: tasks for date, tasks in punches[eid].items()
+                      if (date < cut) == (payday == early) }
+            for payday in (early, late) })
+        for eid in punches
+        ]
+
+    # build the store
+    store = praxis.vendors.ecrs.archive.store.build(dataset=dataset)
+    # check the size
+    assert store.rows == sum(len(tasks) for dates in punches.values() for tasks in dates.values())
+    # and the contents
+    verify(store=store, dataset=dataset)
+
+    # save it and map it back in
+    with tempfile.TemporaryDirectory() as scratch:
+        # the file
+        uri = os.path.join(scratch, "punches.store")
+        # save
+        store.save(uri=uri)
+        # it has the permissions of a regular file
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(uri).st_mode) == 0o666 & ~umask
+        # load
+        mapped = praxis.vendors.ecrs.archive.store.load(uri=uri)
+        # the columns are views into the file
+        assert isinstance(mapped.clockin, memoryview) or sys.byteorder != 'little'
+        # check the tables
+        assert mapped.people == store.people and mapped.kinds == store.kinds
+        # and the contents
+        verify(store=mapped, dataset=dataset)
+        # release the map
+        mapped.close()
+
+    # all done
+    return
+
+
+# helpers
+def verify(store, dataset):
+    """
+    Check the contents of {store} against {dataset}
+    """
+    # go through the dataset
+    for eid, name, timecards in dataset:
+        # get the table of this employee from the store
+        table = store.table(eid=eid)
+        # it must match
+        assert flatten(table) == flatten(timecards)
+        # go through the paydays
+        for payday in timecards:
+            # restrict the table to this pay period
+            assert flatten(store.table(eid=eid, first=payday, last=payday)) == flatten(
+                { payday: timecards[payday] })
+
+        # collect all the tasks of this employee in chronological order
+        tasks = sorted((task.start for dates in timecards.values()
+                        for tasks in dates.values() for task in tasks))
+        # if there are any
+        if tasks:
+            # pick a date range in the middle
+            start = tasks[len(tasks)//4].date()
+            end = tasks[3*len(tasks)//4].date()
+            # the rows in that range
+            rows = store.select(eid=eid, start=start, end=end)
+            # must be the ones that clock in within the range
+            assert len(rows) == sum(1 for task in tasks if start <= task.date() < end)
+    # all done
+    return
+
+
+def flatten(timecards):
+    """
+    Convert a two level table of punches into a comparable structure
+    """
+    # easy enough
+    return {
+        (payday, date): [(task.name, task.start, task.finish) for task in tasks]
+        for payday, dates in timecards.items() for date, tasks in dates.items() if tasks
+        }
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the cached hours and breaks of a punch list track changes to the list and its tasks
+"""
+
+
+# externals
+import datetime, gc, pickle
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the model
+    model = praxis.vendors.ecrs.model
+
+    # the tasks are slotted
+    task = model.task(name='in', start=datetime.datetime(2017, 4, 16, 9), finish=0)
+    assert not hasattr(task, '__dict__')
+    # and keep their timestamps in seconds
+    assert task.clockin == 1492333200 and task.finish == datetime.datetime(1970, 1, 1)
+
+    # make a punch list
+    punches = model.punchlist()
+    # a work day
+    day = datetime.datetime(2017, 4, 16)
+    hour = datetime.timedelta(hours=1)
+    # with a split shift, added out of order
+    punches.newTask(name='in', start=day+13*hour, finish=day+17*hour)
+    punches.newTask(name='in', start=day+8*hour, finish=day+12*hour)
+    # check
+    assert [t.start.hour for t in punches] == [8, 13]
+    assert (punches.hours, punches.breaks) == reference(punches) == (8, 1)
+
+    # edit a task in place
+    punches[1].finish = day + 18*hour
+    assert (punches.hours, punches.breaks) == reference(punches) == (9, 1)
+    # through its epoch seconds
+    punches[0].clockin += 1800
+    assert (punches.hours, punches.breaks) == reference(punches) == (8.5, 1)
+    # mark one as not billable
+    punches[1].billable = False
+    assert (punches.hours, punches.breaks) == reference(punches) == (3.5, 0)
+    punches[1].billable = True
+
+    # list mutations
+    punches.append(model.task(name='in', start=day+19*hour, finish=day+20*hour))
+    assert (punches.hours, punches.breaks) == reference(punches) == (9.5, 2)
+    punches.pop()
+    assert (punches.hours, punches.breaks) == reference(punches) == (8.5, 1)
+    punches[0] = model.task(name='in', start=day+9*hour, finish=day+11*hour)
+    assert (punches.hours, punches.breaks) == reference(punches) == (7, 2)
+    # replace a task and then edit it; the list must still notice
+    punches[1:] = [model.task(name='in', start=day+12*hour, finish=day+14*hour)]
+    punches[1].finish = day + 15*hour
+    assert (punches.hours, punches.breaks) == reference(punches) == (5, 1)
+    punches.extend(model.task(name='in', start=day+h*hour, finish=day+(h+1)*hour) for h in (16,))
+    assert (punches.hours, punches.breaks) == reference(punches) == (6, 2)
+    del punches[0]
+    assert (punches.hours, punches.breaks) == reference(punches) == (4, 1)
+    punches.clear()
+    assert (punches.hours, punches.breaks) == reference(punches) == (0, 0)
+
+    # a punch list that is pickled must keep tracking its tasks
+    punches.newTask(name='in', start=day+8*hour, finish=day+12*hour)
+    punches.hours
+    clone = pickle.loads(pickle.dumps(punches))
+    clone[0].finish = day + 10*hour
+    assert (clone.hours, clone.breaks) == reference(clone) == (2, 0)
+
+    # repeated reads don't recompute the totals
+    counted = tally(clone)
+    for _ in range(10):
+        assert (counted.hours, counted.breaks) == (2, 0)
+    assert counted.passes == 1
+    # until one of the tasks changes, in this list or any other
+    counted[0].finish = day + 9*hour
+    assert (counted.hours, counted.breaks) == (1, 0) and counted.passes == 2
+
+    # tasks don't hold on to the lists they belong to
+    assert not any(isinstance(ref, model.punchlist) for ref in gc.get_referents(clone[0]))
+    # so a task can be shared, and every list that holds it notices when it changes
+    shared = model.punchlist(clone)
+    assert (shared.hours, clone.hours) == (1, 1)
+    shared[0].finish = day + 11*hour
+    assert (shared.hours, clone.hours) == (3, 3)
+
+    # all done
+    return
+
+
+# helpers
+def tally(tasks):
+    """
+    Build a punch list with {tasks} that counts the number of times it computes its totals
+    """
+    # get the package
+    import praxis.vendors.ecrs
+
+    # the counting punch list
+    class counted(praxis.vendors.ecrs.model.punchlist):
+        # the counter
+        passes = 0
+        # the totals
+        def summarize(self):
+            # count
+            counted.passes += 1
+            # and chain up
+            return super().summarize()
+
+    # make one and return it
+    return counted(tasks)
+
+
+def reference(punches):
+    """
+    Compute the hours and breaks from scratch
+    """
+    # get the billable tasks
+    tasks = [ task for task in punches if task.billable ]
+    # the hours worked
+    hours = sum((t.finish - t.start).total_seconds()/3600 for t in tasks)
+    # the breaks
+    breaks = sum((t2.start - t1.finish).total_seconds()/3600 for t1, t2 in zip(tasks, tasks[1:]))
+    # all done
+    return hours, breaks
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
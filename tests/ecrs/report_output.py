@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that report files are written atomically, one at a time and in batches
+"""
+
+
+# externals
+import csv, os, stat, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis
+    # access the output layer
+    output = praxis.support.output
+    spool = praxis.support.spool
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # a file
+        uri = os.path.join(scratch, 'report.csv')
+        # write it
+        output.csv(uri=uri, rows=[ ('a', 1), ('b', 2) ])
+        # read it back
+        with open(uri, newline='') as stream:
+            assert list(csv.reader(stream)) == [ ['a', '1'], ['b', '2'] ]
+        # it has the permissions of a regular file
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(uri).st_mode) == 0o666 & ~umask
+
+        # a failure half way leaves the earlier version alone
+        try:
+            with output(uri=uri) as stream:
+                stream.write('partial')
+                raise ZeroDivisionError()
+        except ZeroDivisionError:
+            pass
+        with open(uri, newline='') as stream:
+            assert list(csv.reader(stream)) == [ ['a', '1'], ['b', '2'] ]
+        # and no temporary files behind
+        assert os.listdir(scratch) == ['report.csv']
+
+        # a failure while committing doesn't leave temporary files behind either
+        os.mkdir(os.path.join(scratch, 'folder'))
+        try:
+            output.text(uri=os.path.join(scratch, 'folder'), text='lost')
+        except OSError:
+            pass
+        else:
+            assert False, 'unreachable'
+        assert sorted(os.listdir(scratch)) == ['folder', 'report.csv']
+        os.rmdir(os.path.join(scratch, 'folder'))
+
+        # a batch of files
+        names = [ os.path.join(scratch, 'employee-{}.csv'.format(idx)) for idx in range(50) ]
+        with spool(workers=4) as writers:
+            for idx, name in enumerate(names):
+                writers.csv(uri=name, rows=( (idx, row) for row in range(100) ))
+            writers.text(uri=os.path.join(scratch, 'notes.txt'), text='done\n')
+        # they are all there
+        for idx, name in enumerate(names):
+            with open(name, newline='') as stream:
+                rows = list(csv.reader(stream))
+            assert rows == [ [str(idx), str(row)] for row in range(100) ]
+        with open(os.path.join(scratch, 'notes.txt')) as stream:
+            assert stream.read() == 'done\n'
+
+        # errors while writing are reported when the batch is done
+        try:
+            with spool(workers=2) as writers:
+                writers.text(uri=os.path.join(scratch, 'nowhere', 'file.txt'), text='lost')
+                writers.text(uri=os.path.join(scratch, 'fine.txt'), text='kept')
+        except FileNotFoundError:
+            pass
+        else:
+            assert False, 'unreachable'
+        # the other files made it
+        with open(os.path.join(scratch, 'fine.txt')) as stream:
+            assert stream.read() == 'kept'
+        # and nothing was left behind
+        assert not [ name for name in os.listdir(scratch) if name.endswith('.tmp') ]
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
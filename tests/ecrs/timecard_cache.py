@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the cache of parsed timecards reproduces the parser output and notices changes
+"""
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # externals
+    import os, shutil, stat, tempfile
+    # get the package
+    import praxis.vendors.ecrs
+    # make a punch parser
+    parser = praxis.vendors.ecrs.reports.punches()
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # copy the sample timecards there
+        uri = os.path.join(scratch, "20140314-time.csv")
+        shutil.copy("punches.csv", uri)
+        # parse them directly
+        with open(uri) as stream:
+            names, punches, warnings, errors = parser.parse(stream=stream)
+
+        # make a cache
+        cache = praxis.vendors.ecrs.archive.cache(folder=os.path.join(scratch, "cache"))
+        # the first time around, the timecards must be parsed
+        first = cache.read(uri=uri).merge()
+        assert (cache.hits, cache.misses) == (0, 1)
+        # the entry has the permissions of a regular file
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(cache.entry(uri=uri)).st_mode) == 0o666 & ~umask
+        # the second time, they should come from the cache
+        second = cache.read(uri=uri).merge()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # both must match the direct parse
+        for cNames, cPunches, cWarnings, cErrors in (first, second):
+            assert cNames == names
+            assert flatten(cPunches) == flatten(punches)
+            assert list(map(str, cWarnings)) == list(map(str, warnings))
+            assert list(map(str, cErrors)) == list(map(str, errors))
+
+        # now, change the file
+        with open(uri, mode="a") as stream:
+            stream.write(open("punches-inout.csv").read())
+        # and verify the cache notices
+        cache.read(uri=uri)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # a timecard with the same name in another folder gets an entry of its own
+        os.mkdir(os.path.join(scratch, "other"))
+        twin = os.path.join(scratch, "other", "20140314-time.csv")
+        shutil.copy("punches.csv", twin)
+        cache.read(uri=twin)
+        assert (cache.hits, cache.misses) == (1, 3)
+        # so neither one evicts the other
+        cache.read(uri=uri)
+        cache.read(uri=twin)
+        assert (cache.hits, cache.misses) == (3, 3)
+
+    # all done
+    return
+
+
+# helpers
+def flatten(punches):
+    """
+    Convert the punch table into a comparable structure
+    """
+    # easy enough
+    return {
+        (eid, date): [(task.name, task.start, task.finish) for task in tasks]
+        for eid, dates in punches.items() for date, tasks in dates.items()
+        }
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that timecards parsed on a process pool match the ones parsed serially, both as
+snapshots and through the payroll action, down to the order of the parsing events and the
+location of fatal errors
+"""
+
+
+# externals
+import csv, datetime, os, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # externals
+    import concurrent.futures
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.actions
+    # get the snapshot factory
+    timecard = praxis.vendors.ecrs.archive.timecard
+
+    # the files to parse
+    uris = [ "punches.csv", "punches-inout.csv", "punches-empty.csv", "punches.csv" ]
+    # parse them serially
+    serial = [ timecard.read(uri=uri).pack() for uri in uris ]
+    # and on a pool
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        # collect the outcomes
+        outcomes = list(pool.map(timecard.attempt, uris))
+
+    # nothing should have gone wrong
+    assert all(error is None for _, error in outcomes)
+    # and the snapshots should be identical
+    assert [ snapshot.pack() for snapshot, _ in outcomes ] == serial
+
+    # get the payroll action; it doesn't need the mispunch log
+    payroll = praxis.actions.payroll()
+    payroll.log = None
+    # make two of them
+    serial = payroll(name='serial', spec='payroll', plexus=None)
+    parallel = payroll(name='parallel', spec='payroll', plexus=None)
+    # one parses the timecards in the loop, the other on a pool
+    serial.jobs = 1
+    parallel.jobs = 2
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # make timecards with a few warnings and errors in them, mixed with clean ones
+        flawed = [
+            synthesize(folder=scratch, name='flawed-{}.csv'.format(idx), hours=hours)
+            for idx, hours in enumerate(((8, 30), (-2, 9, 26, -1))) ]
+        # and one with a timestamp that can't be parsed
+        fatal = synthesize(folder=scratch, name='fatal.csv', hours=(8, 7, None, 6))
+        # the pay periods
+        paydays = [ datetime.date(2014, 3, 14) + idx * datetime.timedelta(days=14)
+                    for idx in range(4) ]
+
+        # the payroll action must report the same events in the same order, no matter how
+        # the timecards were parsed
+        timecards = list(zip(paydays, map(node, ("punches.csv", *flawed, "punches-inout.csv"))))
+        # parse them both ways
+        names, punches, warnings, errors = load(action=serial, timecards=timecards)
+        pNames, pPunches, pWarnings, pErrors = load(action=parallel, timecards=timecards)
+        # the flawed timecards left their marks
+        assert warnings and errors
+        # and the outcomes are identical
+        assert pNames == names and pPunches == punches
+        assert pWarnings == warnings and pErrors == errors
+
+        # a fatal error stops both at the same place
+        timecards = list(zip(paydays, map(node, (flawed[0], fatal, "punches.csv"))))
+        # make a pile
+        failures = []
+        # go through the actions
+        for action in (serial, parallel):
+            # attempt to
+            try:
+                # parse
+                load(action=action, timecards=timecards)
+            # if it fails as expected
+            except praxis.vendors.ecrs.archive.timecard.ParsingError as error:
+                # record the details
+                failures.append((error.description, error.locator.source, error.locator.line))
+            # otherwise
+            else:
+                # complain
+                assert False, 'unreachable'
+        # both point to the bad timestamp
+        assert failures[0] == failures[1]
+        assert failures[0][1:] == (fatal, 3)
+
+    # all done
+    return
+
+
+# helpers
+class node:
+    """
+    A stand-in for the filesystem nodes of the timecards
+    """
+
+    # meta-methods
+    def __init__(self, uri):
+        # save the location of the file
+        self.uri = uri
+        # all done
+        return
+
+    # interface
+    def open(self):
+        # easy enough
+        return open(self.uri)
+
+
+def load(action, timecards):
+    """
+    Parse the {timecards} through the payroll {action} and return everything it extracted
+    """
+    # make the piles
+    names = {}
+    warnings = []
+    errors = []
+    # load the punches
+    punches = [
+        (payday, flatten(table)) for payday, table in action.loadTimecards(
+            plexus=None, timecards=timecards, names=names, warnings=warnings, errors=errors) ]
+    # render the parsing events
+    events = lambda pile: [ (str(event), event.locator.source, event.locator.line)
+                            for event in pile ]
+    # all done
+    return names, punches, events(warnings), events(errors)
+
+
+def flatten(punches):
+    """
+    Convert the punch table into a comparable structure
+    """
+    # easy enough
+    return {
+        (eid, date): [(task.name, task.start, task.finish) for task in tasks]
+        for eid, dates in punches.items() for date, tasks in dates.items()
+        }
+
+
+def synthesize(folder, name, hours):
+    """
+    Build a timecard in {folder} with a shift for each entry in {hours}: the number of hours
+    worked, negative when the employee clocked out before clocking in, or {None} for a shift
+    with a garbled timestamp; shifts that run past midnight get flagged as well
+    """
+    # read the template
+    with open("punches-inout.csv", newline='') as stream:
+        # it has a single row
+        template, = csv.reader(stream)
+    # the format of the timestamps
+    stamp = "{0.month}/{0.day}/{0.year}   {0:%I:%M:%S%p}"
+    # the location of the file
+    uri = os.path.join(folder, name)
+    # open the file
+    with open(uri, 'w', newline='') as stream:
+        # make a writer
+        writer = csv.writer(stream, quoting=csv.QUOTE_ALL)
+        # go through the shifts
+        for day, worked in enumerate(hours):
+            # copy the template
+            row = list(template)
+            # clock in at noon on a day of its own
+            clockin = datetime.datetime(2014, 3, 1 + day, 12)
+            # render
+            row[10] = stamp.format(clockin)
+            # if this shift has a garbled timestamp
+            if worked is None:
+                # make one up
+                row[11] = '2/30/2014   1:00:00PM'
+            # otherwise
+            else:
+                # compute the clock out time
+                row[11] = stamp.format(clockin + datetime.timedelta(hours=worked))
+            # save
+            writer.writerow(row)
+    # all done
+    return uri
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that mispunch corrections are merged into whole timecard files, serially and on a pool
+of processes, and that the corrected files are replaced atomically
+"""
+
+
+# externals
+import concurrent.futures, datetime, os, tempfile
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the reports
+    reports = praxis.vendors.ecrs.reports
+    # parse the sample timecards
+    with open("punches.csv") as stream:
+        names, punches, _, _ = reports.punches().parse(stream=stream, fast=True)
+    # pick an employee and a day
+    eid = sorted(punches)[0]
+    last, first = names[eid]
+    day = sorted(punches[eid])[0]
+
+    # the corrections: an early start for someone in the timecard, and a whole day for
+    # somebody who is not in it
+    corrections = [
+        (None, first, last, day, datetime.time(6), None, None, None),
+        ('77', 'New', 'Person', day, datetime.time(9), None, None, datetime.time(17)),
+        ]
+    # the same, plus one for somebody we can't identify
+    unknown = corrections + [ (None, 'Nobody', 'Known', day, datetime.time(8), None, None, None) ]
+
+    # work in a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the destinations
+        serial, parallel, untouched = (
+            os.path.join(scratch, name) for name in ('serial.csv', 'parallel.csv', 'keep.csv'))
+        # something to protect
+        with open(untouched, 'w') as stream:
+            stream.write('original')
+
+        # correct serially
+        outcome = reports.reconciler.reconcile(
+            uri='punches.csv', corrections=corrections, destination=serial)
+        # and on a pool of processes
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+            outcomes = list(pool.map(
+                reports.reconciler.reconcile,
+                ('punches.csv', 'punches.csv'), (corrections, unknown), (parallel, untouched)))
+
+        # the serial run saved the timecard
+        assert outcome.saved and not outcome.missing and not outcome.conflicts
+        # and recorded the changes
+        assert [ (who, operation) for who, operation, _, _ in outcome.changes ] == [
+            (eid, 'trim'), ('77', 'insert') ]
+        # the timelines stayed behind
+        assert outcome.timelines is None
+        # the parallel run did the same
+        assert outcomes[0].saved and outcomes[0].changes == outcome.changes
+        # and produced the same file
+        with open(serial) as one, open(parallel) as two:
+            assert one.read() == two.read()
+        # the correction for the unknown employee left its destination alone
+        assert not outcomes[1].saved and outcomes[1].missing == [('Nobody', 'Known')]
+        with open(untouched) as stream:
+            assert stream.read() == 'original'
+        # and no temporary files were left behind
+        assert sorted(os.listdir(scratch)) == ['keep.csv', 'parallel.csv', 'serial.csv']
+
+        # parse the corrected timecard
+        with open(serial) as stream:
+            fixed, corrected, _, errors = reports.punches().parse(stream=stream, fast=True)
+    # it is clean
+    assert not errors
+    # it has the new employee
+    assert fixed['77'] == ('Person', 'New')
+    assert [ (task.start, task.finish) for task in corrected['77'][day] ] == [
+        (datetime.datetime.combine(day, datetime.time(9)),
+         datetime.datetime.combine(day, datetime.time(17))) ]
+    # the early start
+    assert corrected[eid][day][0].start == datetime.datetime.combine(day, datetime.time(6))
+    # and everything else is as before
+    spans = lambda tasks: [ (task.clockin, task.clockout) for task in tasks ]
+    assert spans(corrected[eid][day][1:]) == spans(punches[eid][day][1:])
+    for who in punches:
+        for date in punches[who]:
+            if (who, date) != (eid, day):
+                assert spans(corrected[who][date]) == spans(punches[who][date])
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
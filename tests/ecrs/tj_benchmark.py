@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Compare the throughput of the journal parser with the metadata classifier and with the single
+regex it replaced, on a large synthetic journal
+"""
+
+
+# externals
+import contextlib, io, os, time
+# the synthetic journal
+from tj_stream import synthesize
+# the old classifier
+from tj_classify import LEGACY
+
+
+# the benchmark
+def benchmark(invoices=50000, seed=0):
+    """
+    Time the parser with the two classifiers on the same synthetic journal
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # build the journal
+    journal, _ = synthesize(invoices=invoices, seed=seed)
+    # show me
+    print("journal: {} invoices, {} lines, {:.1f} MB".format(
+        invoices, journal.count("\n"), len(journal)/2**20))
+
+    # make a parser that classifies the old way
+    legacy = praxis.vendors.ecrs.reports.transactions()
+    legacy.classify = lambda description: classify(parser=legacy, description=description)
+    # and one that uses the current classifier
+    current = praxis.vendors.ecrs.reports.transactions()
+
+    # time the two
+    for name, parser in (("regex", legacy), ("dispatch", current)):
+        # start the clock
+        start = time.perf_counter()
+        # parse, ignoring any chatter on the way
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            count = sum(1 for _ in parser.invoices(stream=io.StringIO(journal)))
+        # stop the clock
+        elapsed = time.perf_counter() - start
+        # show me
+        print("  {:>8}: {:.3f} sec, {:,.0f} invoices/sec".format(name, elapsed, count/elapsed))
+
+    # all done
+    return
+
+
+# helpers
+def classify(parser, description):
+    """
+    Classify {description} using the single regex
+    """
+    # match
+    match = LEGACY.match(description)
+    # if it failed
+    if match is None:
+        # we don't know what this is
+        return None
+    # otherwise, look up the handler
+    return getattr(parser, match.lastgroup), match
+
+
+# main
+if __name__ == "__main__":
+    benchmark()
+
+
+# end of file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the metadata classifier of the journal parser agrees with the regex it replaced
+"""
+
+
+# externals
+import re
+
+
+# the single regex that used to classify the metadata lines
+LEGACY = re.compile('|'.join([
+    r'(?P<void>All Void)',
+    r'(?P<giftadd>Gift Card Add to)$',
+    r'(?P<cash>(Removed >> )?Cash)$',
+    r'(?P<credit>(Removed >> )?Credit)$',
+    r'(?P<debit>(Removed >> )?Debit)$',
+    r'(?P<gift>(Removed >> )?GIFTCARD)$',
+    r'(?P<subtotal>SUBTOTAL)$',
+    r'(?P<total>TOTAL)$',
+    r'(?P<tendered>TOTAL TENDERED)$',
+    r'(?P<change>(Change)|(CHANGE))$',
+    r'(?P<cardinfo>--- Card Information ---)$',
+    r'(?P<giftinfo>Gift Card Account #{13})$',
+    r'(?P<suspend>Suspend by\s+(?P<suspender>.+)\s+@\s+(?P<suspended>.+)\s*)$',
+    r'(?P<resume>Resumed by\s+(?P<resumer>.+)\s+@\s+(?P<resumed>.+)\s*)$',
+    r'(?P<prompt>Prompt (.+): (.+))$',
+    r'(?P<coupon>Mfr\. Coupon (?P<code>.+))$',
+    r'(?P<refund>.* Refund|Softers Deposit Ref)',
+    r'(?P<account>.*Paid on Account)$',
+    r'(?P<discount>.*Discount)$',
+    r'(?P<taxes>.*Tax)$',
+    ]))
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a journal parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+
+    # a sample of descriptions
+    descriptions = [
+        "All Void", "All Void Transaction", "Gift Card Add to", "Gift Card Add to more",
+        "Cash", "Removed >> Cash", "Cash\n", "Cash Back", "Credit", "Removed >> Credit",
+        "Debit", "Removed >> Debit", "GIFTCARD", "Removed >> GIFTCARD",
+        "SUBTOTAL", "TOTAL", "TOTAL TENDERED", "Change", "CHANGE", "change",
+        "--- Card Information ---", "Gift Card Account #############",
+        "Gift Card Account ############",
+        "Suspend by Jane Doe @ 04/10/2017 08:00:00AM", "Resumed by John Smith @ today  ",
+        "Prompt 4011: 1.25 lb", "Prompt nothing",
+        "Mfr. Coupon 12345", "Bottle Refund", "Softers Deposit Refund", "Deposit Refund Tax",
+        "Charge Paid on Account", "Member Discount", "Sales Tax", "Sales Tax\n", "Removed >> Tax",
+        "Mystery", "", "TOTAL Discount",
+        ]
+
+    # go through them
+    for description in descriptions:
+        # classify the old way
+        legacy = LEGACY.match(description)
+        # and the new way
+        meaning = parser.classify(description)
+        # if the old way failed
+        if legacy is None:
+            # so should the new way
+            assert meaning is None, description
+            # and move on
+            continue
+        # otherwise, unpack
+        handler, match = meaning
+        # the handlers must agree
+        assert handler.__name__ == legacy.lastgroup, description
+        # and so must the parameters the handlers rely on
+        if match is not None and handler.__name__ != 'prompt':
+            # compare the named groups
+            assert all(match.group(group) == legacy.group(group)
+                       for group in match.re.groupindex), description
+        # ask again
+        again = parser.classify(description)
+        # the answer must come from the cache
+        assert again is meaning
+
+    # the prompt parameters are now the ones in the description
+    handler, match = parser.classify("Prompt 4011: 1.25 lb")
+    assert match.group(1, 2) == ('4011', '1.25 lb')
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that invoices allocate their line item piles only when something is added to them
+"""
+
+
+# externals
+import io, pickle, tracemalloc
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the model
+    model = praxis.vendors.ecrs.model
+
+    # make an invoice
+    invoice = model.invoice()
+    # it has no instance dictionary
+    assert not hasattr(invoice, '__dict__')
+    # its piles look empty
+    assert len(invoice.tenders) == 0 and not invoice.tenders
+    assert list(invoice.tenders) == [] and invoice.tenders == []
+    # but they haven't been allocated
+    assert type(invoice.tenders) is not list
+
+    # make a tender
+    cash = model.cash()
+    cash.amount = 10
+    # hold on to the stand-in and add the tender to it
+    tenders = invoice.tenders
+    tenders.append(cash)
+    # add another one through a fresh stand-in
+    gift = model.giftcard()
+    gift.account = '1234'
+    gift.amount = 5
+    invoice.tenders.append(gift)
+    # and a third one through the original stand-in
+    tenders.append(cash)
+    # they are all there
+    assert invoice.tenders == [cash, gift, cash]
+    # the pile is a real list now
+    assert type(invoice.tenders) is list
+    # and it is the only one that was allocated
+    assert type(invoice.transactions) is not list and type(invoice.taxes) is not list
+
+    # the line items are slotted too
+    for item in (model.transaction(), cash, gift, model.coupon(), model.refund(),
+                 model.discount(), model.tax()):
+        assert not hasattr(item, '__dict__')
+    # and keep their class level constants
+    assert cash.mode == 'cash' and model.refund().mode == 'refund'
+
+    # invoices survive the trip to a worker process and back
+    clone = pickle.loads(pickle.dumps(invoice))
+    assert [ tender.amount for tender in clone.tenders ] == [10, 5, 10]
+    assert clone.tenders[1].account == '1234'
+    assert not clone.taxes
+
+    # parse a journal
+    journal, expected = synthesize(invoices=2000, seed=4)
+    # make a parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+    # measure the footprint of holding on to all the invoices
+    tracemalloc.start()
+    invoices = list(parser.invoices(stream=io.StringIO(journal)))
+    footprint, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ten empty lists per invoice, as the eager layout allocated, would take more than this
+    assert footprint / len(invoices) < 2048, footprint / len(invoices)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
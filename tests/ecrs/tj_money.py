@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify the conversions of monetary amounts in the transaction journal
+"""
+
+
+# externals
+import decimal, io, pickle
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # get the parser factory
+    transactions = praxis.vendors.ecrs.reports.transactions
+
+    # make one parser for each representation
+    dollars = transactions()
+    cents = transactions(currency='cents')
+    exact = transactions(currency='decimal')
+    # some amounts, as the journal renders them, and their values in cents
+    amounts = [
+        ('$0.00', 0), ('$0.05', 5), ('$1.10', 110), ('$12.34', 1234), ('$1,234.56', 123456),
+        ('($0.50)', -50), ('($1,000.01)', -100001), ('$7', 700), ('$7.5', 750),
+        ]
+    # go through them
+    for text, value in amounts:
+        # check the representations
+        assert cents.money(text) == value
+        assert exact.money(text) == decimal.Decimal(value).scaleb(-2)
+        assert abs(dollars.money(text) - value/100) < 1e-9
+    # amounts smaller than a cent are rejected
+    try:
+        cents.money('$0.125')
+        assert False, 'unreachable'
+    except ValueError:
+        pass
+    # as are unknown representations
+    try:
+        transactions(currency='yen')
+        assert False, 'unreachable'
+    except ValueError:
+        pass
+    # quantities
+    assert dollars.float('1,234.5') == 1234.5 and dollars.float('(2.00)') == -2
+
+    # the parser remembers its choice on the way to a worker process
+    assert pickle.loads(pickle.dumps(cents)).money('$1.23') == 123
+
+    # parse a journal in cents and as decimals
+    journal, expected = synthesize(invoices=500, seed=5)
+    inCents = list(cents.invoices(stream=io.StringIO(journal)))
+    inDecimal = list(exact.invoices(stream=io.StringIO(journal)))
+    # go through the invoices
+    for one, other, (tid, items, total, void, training) in zip(inCents, inDecimal, expected):
+        # the totals are integers
+        assert isinstance(one.total, int)
+        # that agree with the decimal ones exactly
+        assert one.total == 100 * other.total
+        # and with the journal
+        assert void or one.total == round(total * 100)
+        # so do the line items
+        for item, match in zip(one.transactions, other.transactions):
+            assert item.amount == 100 * match.amount
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that loading transaction journals that overlap, or cover only part of a day, leaves the
+daily sales totals of every day they touch intact
+"""
+
+
+# externals
+import io
+# the synthetic journal
+from tj_stream import synthesize
+# the stand-in for the plexus
+from payroll_load import host
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.actions
+    # make a parser that works in cents, the way {tj load} does
+    parser = praxis.vendors.ecrs.reports.transactions(currency='cents')
+    # build a journal
+    journal, _ = synthesize(invoices=400, seed=7)
+    # parse it
+    invoices = list(parser.invoices(stream=io.StringIO(journal)))
+    # the totals of all of them
+    expected = [ (day.isoformat(), *rest) for day, *rest in rollup(invoices=invoices).rows() ]
+    # make sure there is more than one day
+    assert len({ day for day, *_ in expected }) > 1
+
+    # get the journal action
+    action = praxis.actions.tj()(name='tj', spec='tj', plexus=None)
+    # make a plexus with an in-memory database
+    plexus = host(tables=praxis.schema.tables)
+
+    # split the invoices in two journals that overlap, and load them in both orders
+    for journals in ((invoices[:250], invoices[150:]), (invoices[150:], invoices[:250])):
+        # go through them
+        for pile in journals:
+            # save the invoices, the way {tj load} does
+            action.persist(plexus=plexus, invoices=pile)
+            # and update the days they touch
+            action.persistRollup(plexus=plexus, days=rollup(invoices=pile).days())
+        # the totals account for every invoice exactly once
+        assert rows(plexus=plexus) == expected
+
+    # all done
+    return
+
+
+# helpers
+def rollup(invoices):
+    """
+    Compute the daily totals of {invoices}
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a rollup
+    totals = praxis.vendors.ecrs.reports.rollup()
+    # go through the invoices
+    for invoice in invoices:
+        # and add each one
+        totals.add(invoice)
+    # all done
+    return totals
+
+
+def rows(plexus):
+    """
+    Retrieve the contents of the rollup table, with the sales in cents
+    """
+    # easy enough
+    return plexus.datastore.server.execute(
+        'SELECT day, dimension, label, invoices, items, CAST(ROUND(100*sales) AS INTEGER) '
+        'FROM sales_rollups ORDER BY day, dimension, label').fetchall()
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the invoices of a transaction journal are saved in the sales tables with their
+contents, amounts and timestamps intact, and that loading a journal again replaces them
+"""
+
+
+# externals
+import io, itertools
+# the synthetic journal
+from tj_stream import synthesize
+# the stand-in for the plexus
+from payroll_load import host
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    import praxis.actions
+    # access the model
+    model = praxis.vendors.ecrs.model
+    # make a parser that works in cents, the way {tj load} does
+    parser = praxis.vendors.ecrs.reports.transactions(currency='cents')
+    # build a journal
+    journal, _ = synthesize(invoices=400, seed=5)
+    # parse it
+    invoices = list(parser.invoices(stream=io.StringIO(journal)))
+
+    # get the journal action
+    action = praxis.actions.tj()(name='tj', spec='tj', plexus=None)
+    # make a plexus with an in-memory database
+    plexus = host(tables=praxis.schema.tables)
+
+    # load the journal twice
+    for _ in range(2):
+        # in batches, the way {tj load} does
+        for idx in range(0, len(invoices), 64):
+            # save one
+            action.persist(plexus=plexus, invoices=invoices[idx:idx+64])
+        # every invoice is there exactly once
+        assert count(plexus=plexus, table='invoices') == len(invoices)
+        # along with its line items
+        assert count(plexus=plexus, table='invoice_items') == sum(
+            isinstance(entry, model.transaction)
+            for invoice in invoices
+            for entry in itertools.chain(
+                invoice.transactions, invoice.returns, invoice.corrections))
+        # and its tenders
+        assert count(plexus=plexus, table='invoice_tenders') == sum(
+            len(invoice.tenders) + len(invoice.refunds) + len(invoice.discounts)
+            for invoice in invoices)
+
+    # get the saved invoices
+    saved = {
+        tid: (kind, cents, opened, closed, day)
+        for tid, kind, cents, opened, closed, day in plexus.datastore.server.execute(
+            'SELECT id, kind, CAST(ROUND(100*total) AS INTEGER), opened, closed, day '
+            'FROM invoices').fetchall()
+        }
+    # the seconds since the epoch of a timestamp
+    seconds = model.task.seconds
+    # go through the parsed ones
+    for invoice in invoices:
+        # the amounts and the timestamps, with their date, made it
+        assert saved[invoice.tid] == (
+            action.invoiceKind(invoice=invoice), invoice.total,
+            seconds(invoice.start), seconds(invoice.finish), invoice.start.date().isoformat())
+    # the journal spans more than one day, and the invoices can be grouped by it
+    assert len({ day for *_, day in saved.values() }) > 1
+
+    # all done
+    return
+
+
+# helpers
+def count(plexus, table):
+    """
+    Count the rows in {table}
+    """
+    # easy enough
+    (rows,), = plexus.datastore.server.execute('SELECT COUNT(*) FROM {}'.format(table))
+    # all done
+    return rows
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the journal parser is quiet, and that progress reports are rate limited
+"""
+
+
+# externals
+import contextlib, io
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.support
+    import praxis.vendors.ecrs
+    # make a journal parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+    # build a journal
+    journal, expected = synthesize(invoices=200, seed=3)
+
+    # parse it while watching the output
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        invoices = list(parser.invoices(stream=io.StringIO(journal)))
+    # check that we got everything
+    assert len(invoices) == len(expected)
+    # without a peep
+    assert output.getvalue() == ''
+
+    # make a channel
+    channel = Channel()
+    # and a clock that advances a tenth of a second every time it is read
+    ticks = iter(range(10**6))
+    clock = lambda: next(ticks) / 10
+    # make a progress monitor
+    progress = praxis.support.progress(channel=channel, title='progress', units='invoices',
+                                       total=1000, interval=1.0, clock=clock)
+    # that knows how much of the input has been consumed
+    progress.consumed = lambda: 10 * progress.count
+    # do some work
+    for _ in range(50):
+        progress.tick()
+    # check the count
+    assert progress.count == 50
+    # there should be one report for every ten ticks
+    assert len(channel.messages) == 5
+    # check the contents of the last one
+    assert channel.messages[-1] == (
+        'progress: 50 invoices, 10 invoices/sec, 0.0 MB of 0.0 MB (50%), eta 0:00:05')
+    # the summary
+    progress.done()
+    assert channel.messages[-1] == 'progress: 50 invoices in 5.10 sec, 10 invoices/sec'
+
+    # a monitor on an inactive channel
+    channel = Channel(active=False)
+    progress = praxis.support.progress(channel=channel, title='progress', units='invoices')
+    # keeps count
+    for _ in range(50):
+        progress.tick()
+    progress.done()
+    assert progress.count == 50
+    # but says nothing
+    assert channel.messages == []
+
+    # all done
+    return
+
+
+# a channel that remembers what it was told
+class Channel:
+
+    def log(self, message):
+        self.messages.append(message)
+
+    def __init__(self, active=True):
+        self.active = active
+        self.messages = []
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify the daily sales rollups of the transaction journal
+"""
+
+
+# externals
+import collections, io
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the reports
+    reports = praxis.vendors.ecrs.reports
+    # make a parser that works in cents
+    parser = reports.transactions(currency='cents')
+    # build a long enough journal to span a couple of days
+    journal, expected = synthesize(invoices=800, seed=7)
+    # parse it
+    invoices = list(parser.invoices(stream=io.StringIO(journal)))
+
+    # roll it up in one pass
+    rollup = reports.rollup()
+    for invoice in invoices:
+        rollup.add(invoice)
+
+    # the sales that went through, by invoice id
+    sales = {
+        tid: round(100 * total)
+        for tid, _, total, void, training in expected if not void and not training
+        }
+    # compute the totals by terminal directly
+    terminals = collections.Counter()
+    for invoice in invoices:
+        if invoice.tid in sales:
+            terminals[invoice.terminal] += sales[invoice.tid]
+
+    # every dimension accounts for all the sales
+    for dimension in rollup.DIMENSIONS:
+        summary = rollup.summary(dimension=dimension)
+        assert sum(invoices for invoices, _, _ in summary.values()) == len(sales)
+        assert sum(total for _, _, total in summary.values()) == sum(sales.values())
+    # the terminal totals match
+    assert {
+        key: total for key, (_, _, total) in rollup.summary(dimension='terminal').items()
+        } == terminals
+    # the hours are two digit strings
+    assert all(len(key) == 2 for key in rollup.summary(dimension='hour'))
+
+    # the journal spans more than one day
+    days = rollup.days()
+    assert len(days) > 1
+    # and the rows come out in order
+    rows = list(rollup.rows())
+    assert rows == sorted(rows)
+    assert { row[0] for row in rows } == set(days)
+
+    # rolling up the two halves separately and merging gives the same answer
+    first, second = reports.rollup(), reports.rollup()
+    for invoice in invoices[:300]:
+        first.add(invoice)
+    for invoice in invoices[300:]:
+        second.add(invoice)
+    assert list(first.merge(second).rows()) == rows
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that a journal split into shards at invoice boundaries parses to the same invoices
+"""
+
+
+# externals
+import concurrent.futures, os, tempfile
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a journal parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+    # build a journal
+    journal, expected = synthesize(invoices=500, seed=1)
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the file
+        uri = os.path.join(scratch, "synthetic-tj.csv")
+        # save the journal
+        with open(uri, 'w') as stream:
+            stream.write(journal)
+        # get its contents as bytes
+        with open(uri, 'rb') as stream:
+            raw = stream.read()
+
+        # split it
+        shards = parser.split(uri=uri, size=16*1024)
+        # there should be more than one shard
+        assert len(shards) > 1
+        # they must cover the file without gaps
+        assert shards[0][0] == 0 and shards[-1][1] == len(raw)
+        assert all(left[1] == right[0] for left, right in zip(shards, shards[1:]))
+        # go through them
+        for begin, end, line in shards:
+            # the line count must be right
+            assert line == raw.count(b'\n', 0, begin)
+            # and every shard after the first must start a new invoice
+            if begin:
+                # get the last line of the previous shard and the first line of this one
+                before = raw[:begin].splitlines()[-1] + b'\n'
+                after = raw[begin:].splitlines()[0] + b'\n'
+                # compare
+                assert parser.invoiceNumber(before) != parser.invoiceNumber(after)
+
+        # parse the shards on a pool of processes
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+            # submit the shards
+            futures = [
+                pool.submit(parser.segment, uri=uri, begin=begin, end=end, line=line)
+                for begin, end, line in shards
+                ]
+            # collect the invoices
+            invoices = [ invoice for future in futures for invoice in future.result()[0] ]
+
+    # they must be the same ones, in the same order
+    assert [ invoice.tid for invoice in invoices ] == [ tid for tid, *_ in expected ]
+    # with the same contents
+    for invoice, (tid, items, total, void, training) in zip(invoices, expected):
+        assert len(invoice.transactions) == items
+        assert invoice.void == void and invoice.training == training
+        assert void or abs(invoice.total - total) < 0.005
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that the transaction journal parser generates every invoice, one at a time
+"""
+
+
+# externals
+import datetime, io, random
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a journal parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+    # build a journal
+    journal, expected = synthesize(invoices=200, seed=0)
+
+    # wrap it in a stream
+    stream = io.StringIO(journal)
+    # make the invoice generator
+    invoices = parser.invoices(stream=stream)
+    # get the first invoice
+    first = next(invoices)
+    # it should be available long before the journal is exhausted
+    assert stream.tell() < len(journal) // 10
+    # collect the rest
+    parsed = [first] + list(invoices)
+    # all of them must be there, including the last one
+    assert [ invoice.tid for invoice in parsed ] == [ tid for tid, *_ in expected ]
+    # check their contents
+    for invoice, (tid, items, total, void, training) in zip(parsed, expected):
+        # the line items
+        assert len(invoice.transactions) == items
+        # the status
+        assert invoice.void == void and invoice.training == training
+        # and the total, for the ones that went through
+        assert void or abs(invoice.total - total) < 0.005
+
+    # the dictionary interface must agree
+    table, warnings, errors = parser.parse(stream=io.StringIO(journal))
+    assert list(table) == [ tid for tid, *_ in expected ]
+    # an empty journal has no invoices
+    assert list(parser.invoices(stream=io.StringIO(''))) == []
+
+    # all done
+    return
+
+
+# the synthesizer
+def synthesize(invoices, seed=0):
+    """
+    Build a transaction journal with the given number of {invoices}; return the text of the
+    journal and a list of (invoice id, number of line items, total, void, training) tuples
+    """
+    # make a random number generator
+    rng = random.Random(seed)
+    # the first invoice
+    when = datetime.datetime(2017, 4, 10, 8)
+    # the names of the cashiers
+    cashiers = [ "Jane Doe", "John Smith", "Mary Major" ]
+
+    # the pile of lines
+    lines = []
+    # and the expectations
+    expected = []
+    # go through the invoices
+    for idx in range(invoices):
+        # build the invoice id
+        tid = str(100000 + idx)
+        # the time span
+        start = when + datetime.timedelta(minutes=3*idx)
+        finish = start + datetime.timedelta(seconds=rng.randrange(30, 300))
+        # the mode
+        training = rng.random() < .02
+        # the cashier
+        cashier = rng.choice(cashiers)
+        # the record prototype
+        row = [''] * 37
+        row[8] = stamp(start)
+        row[10] = stamp(finish)
+        row[12] = tid
+        row[14] = str(1 + idx % 3)
+        row[16] = str(rng.randrange(1000))
+        row[18] = str(idx)
+        row[22] = cashier
+        row[23] = 'TRAINING MODE' if training else 'REGULAR'
+
+        # make a line renderer
+        def emit(item='', description='', quantity=0, price=0, charge=0):
+            row[31] = item
+            row[32] = description
+            row[33] = number(quantity)
+            row[34] = money(price)
+            row[35] = money(charge)
+            lines.append(','.join('"{}"'.format(field) for field in row))
+
+        # the line items
+        items = rng.randrange(1, 7)
+        subtotal = 0
+        for item in range(items):
+            quantity = rng.randrange(1, 3)
+            price = rng.randrange(99, 1999) / 100
+            subtotal += quantity * price
+            emit(item='{:06}'.format(item), description='Item {}'.format(item),
+                 quantity=quantity, price=price, charge=quantity*price)
+        # some parametrized metadata
+        if rng.random() < .1:
+            emit(description='Prompt 4011: {:.2f} lb'.format(rng.random()*3))
+        if rng.random() < .05:
+            emit(description='Suspend by {} @ {}'.format(cashier, stamp(start)))
+            emit(description='Resumed by {} @ {}'.format(cashier, stamp(finish)))
+        if rng.random() < .1:
+            emit(description='Mfr. Coupon {}'.format(rng.randrange(10**5)), charge=-0.5)
+            subtotal -= 0.5
+        if rng.random() < .2:
+            emit(description='Member Discount', charge=-1)
+            subtotal -= 1
+        # a separator
+        emit()
+
+        # some invoices are voided
+        void = rng.random() < .05
+        # if this one is
+        if void:
+            # mark it
+            emit(description='All Void')
+            # record the expectations
+            expected.append((tid, items, 0, True, training))
+            # and move on
+            continue
+
+        # the markers
+        tax = round(subtotal * .0875, 2)
+        total = subtotal + tax
+        emit(description='SUBTOTAL', charge=subtotal)
+        emit(description='Sales Tax', charge=tax)
+        emit(description='TOTAL', charge=total)
+        # the tender
+        kind = rng.choice(('Cash', 'Cash', 'Credit', 'Debit'))
+        emit(description=kind, charge=total)
+        # card payments come with some details
+        if kind != 'Cash':
+            card = 'VISA' if kind == 'Credit' else 'DEBIT'
+            emit(description='--- Card Information ---')
+            emit()
+            emit(description='Card Type: {} (Swiped)'.format(card))
+            emit(description='Account #: XXXXXXXXXXXX{:04}'.format(rng.randrange(10**4)))
+            emit(description='Exp Date : 0419')
+            emit()
+            emit(description='Amount: {:.2f}'.format(total))
+            if card != 'DEBIT':
+                emit(description='Approval #: {:06}'.format(rng.randrange(10**6)))
+            emit(description='Date: {}'.format(stamp(finish)))
+            emit()
+            emit(description='Reference #: {}'.format(rng.randrange(10**6)))
+            if card != 'DEBIT':
+                emit(description='Signature Captured')
+        emit(description='TOTAL TENDERED', charge=total)
+        emit(description='Change', charge=0)
+        # record the expectations
+        expected.append((tid, items, total, False, training))
+
+    # assemble and return
+    return '\n'.join(lines) + '\n', expected
+
+
+# helpers
+def stamp(timestamp):
+    """
+    Render a timestamp the way the journal does
+    """
+    # easy enough
+    return timestamp.strftime('%m/%d/%Y %I:%M:%S%p')
+
+
+def number(value):
+    """
+    Render a quantity the way the journal does
+    """
+    # negative numbers are in parentheses
+    return '({:,.2f})'.format(-value) if value < 0 else '{:,.2f}'.format(value)
+
+
+def money(value):
+    """
+    Render an amount the way the journal does
+    """
+    # negative amounts are in parentheses
+    return '(${:,.2f})'.format(-value) if value < 0 else '${:,.2f}'.format(value)
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify the cashier and lane throughput computed by matching invoices against the punch store
+"""
+
+
+# externals
+import datetime, io
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # access the reports
+    reports = praxis.vendors.ecrs.reports
+    # and the store
+    store = praxis.vendors.ecrs.archive.store
+    # parse a journal that spans a couple of days
+    journal, _ = synthesize(invoices=800, seed=11)
+    invoices = list(reports.transactions().invoices(stream=io.StringIO(journal)))
+
+    # two of the three cashiers work a morning and an evening shift every day; the evening one
+    # runs past midnight
+    hours = ((7, 13), (15, 24+1))
+    # build their shifts, in seconds since the epoch
+    shifts = {
+        eid: [
+            (store.seconds(datetime.datetime(2017, 4, day, start)),
+             store.seconds(datetime.datetime(2017, 4, day, 0) +
+                           datetime.timedelta(hours=finish)))
+            for day in range(8, 14) for start, finish in hours
+            ]
+        for eid in ('1', '2')
+        }
+    # the third one is not in the store
+    punches = store.assemble(
+        people=[ ('1', ('Doe', 'Jane')), ('2', ('Smith', 'John')) ], kinds=['in'],
+        blocks=[ [ (tin, tout, 0, 0) for tin, tout in shifts[eid] ] for eid in ('1', '2') ])
+
+    # accumulate
+    throughput = reports.throughput(store=punches)
+    for invoice in invoices:
+        throughput.add(invoice)
+
+    # the invoices that count
+    traffic = [ invoice for invoice in invoices if not invoice.training ]
+    # the days they cover
+    days = { invoice.start.date() for invoice in traffic }
+    # the cashier that is not in the store
+    assert throughput.unmatched() == ['Mary Major']
+
+    # check the cashier table
+    rows = { row[0]: row for row in throughput.cashierTable() }
+    assert sum(row[1] for row in rows.values()) == len(traffic)
+    for eid, cashier in (('1', 'Jane Doe'), ('2', 'John Smith')):
+        # unpack
+        _, count, items, labor, busy, idle, itemRate, invoiceRate, offclock = rows[cashier]
+        # their invoices
+        mine = [ invoice for invoice in traffic if invoice.cashier == cashier ]
+        assert count == len(mine)
+        assert items == sum(len(invoice.transactions) for invoice in mine)
+        # the ones rung up off the clock
+        assert offclock == sum(
+            not any(tin <= store.seconds(invoice.start) <= tout for tin, tout in shifts[eid])
+            for invoice in mine)
+        # the time on the clock during the days with invoices, a second at a time
+        seconds = sum(
+            min(tout, edge + 86400) - max(tin, edge)
+            for tin, tout in shifts[eid]
+            for edge in (store.seconds(day) for day in days)
+            if tin < edge + 86400 and tout > edge)
+        assert round(labor * 3600) == seconds
+        assert abs(busy + idle - labor) < 1e-9
+        assert abs(invoiceRate * labor - count) < 1e-9
+        assert abs(itemRate * labor - items) < 1e-9
+    # the cashier without punches has no labor
+    assert rows['Mary Major'][3] is None and rows['Mary Major'][6] is None
+
+    # check the lane table
+    lanes = { row[0]: row for row in throughput.laneTable() }
+    assert set(lanes) == { invoice.terminal for invoice in traffic }
+    for terminal, count, items, opened, busy, idle, itemRate, utilization in lanes.values():
+        # its invoices
+        mine = [ invoice for invoice in traffic if invoice.terminal == terminal ]
+        assert count == len(mine)
+        # the lane is open from the first invoice of each day to the last one
+        expected = sum((
+            max(invoice.finish for invoice in mine if invoice.start.date() == day) -
+            min(invoice.start for invoice in mine if invoice.start.date() == day)
+            for day in days if any(invoice.start.date() == day for invoice in mine)),
+            datetime.timedelta())
+        assert round(opened * 3600) == expected.total_seconds()
+        assert 0 < utilization <= 1
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2019 all rights reserved
+#
+
+
+"""
+Verify that malformed journal records stop the strict parser at the right line, and that the
+tolerant parser sets aside the invoices they belong to and keeps going
+"""
+
+
+# externals
+import collections, csv, io
+# the synthetic journal
+from tj_stream import synthesize
+
+
+# the test script
+def test():
+    """
+    Run the various tests
+    """
+    # get the package
+    import praxis.vendors.ecrs
+    # make a journal parser
+    parser = praxis.vendors.ecrs.reports.transactions()
+    # build a journal
+    journal, expected = synthesize(invoices=100, seed=2)
+    # split it into records
+    lines = journal.splitlines()
+    # save a clean copy
+    pristine = list(lines)
+    # pick two invoices that went through
+    survivors = [ tid for tid, _, _, void, _ in expected if not void ]
+    first, second = survivors[10], survivors[20]
+
+    # give the first one an unrecognized metadata line
+    unknownLine = corrupt(lines=lines, tid=first, description='SUBTOTAL',
+                          field=32, value='Mystery Line')
+    # and a metadata line with a non-zero price to the second one
+    priceLine = corrupt(lines=lines, tid=second, description='Sales Tax', field=34, value='$1.00')
+    # put it back together
+    journal = '\n'.join(lines) + '\n'
+
+    # the strict parser must stop at the first bad record
+    try:
+        list(parser.invoices(stream=io.StringIO(journal)))
+        assert False, 'unreachable'
+    except parser.ParsingError as error:
+        assert error.locator.line == unknownLine
+        assert first in error.description
+
+    # the tolerant one keeps going
+    errors = []
+    quarantine = []
+    unknown = collections.Counter()
+    invoices = list(parser.invoices(stream=io.StringIO(journal), errors=errors, tolerant=True,
+                                    quarantine=quarantine, unknown=unknown))
+    # both errors are recorded, at the right lines
+    assert [ error.locator.line for error in errors ] == [ unknownLine, priceLine ]
+    # the bad invoices are in quarantine
+    assert [ invoice.tid for invoice in quarantine ] == [ first, second ]
+    # and all the others made it through, intact
+    good = [ record for record in expected if record[0] not in (first, second) ]
+    assert [ invoice.tid for invoice in invoices ] == [ tid for tid, *_ in good ]
+    for invoice, (tid, items, total, void, training) in zip(invoices, good):
+        assert len(invoice.transactions) == items
+        assert void or abs(invoice.total - total) < 0.005
+    # the unrecognized description is counted
+    assert unknown == {'Mystery Line': 1}
+
+    # now, cut the clean journal short in the middle of the last card information block
+    cut = max(idx for idx, line in enumerate(pristine) if 'Card Information' in line) + 2
+    truncated = '\n'.join(pristine[:cut]) + '\n'
+    # find the invoice
+    last = fields(pristine[cut-1])[12]
+    # the strict parser must complain about the end of the input
+    try:
+        list(parser.invoices(stream=io.StringIO(truncated)))
+        assert False, 'unreachable'
+    except parser.ParsingError as error:
+        assert error.locator.line == cut
+        assert 'unexpected end of input' in error.description
+    # the tolerant one drops the unfinished invoice and keeps all the others
+    errors = []
+    invoices = list(parser.invoices(stream=io.StringIO(truncated), errors=errors, tolerant=True))
+    assert len(errors) == 1 and last in errors[0].description
+    assert [ invoice.tid for invoice in invoices ] == [
+        tid for tid, *_ in expected if tid < last ]
+
+    # garble the account number of the last card
+    lines = list(pristine)
+    account = max(idx for idx, line in enumerate(lines) if 'Account #:' in line)
+    row = fields(lines[account])
+    row[32] = 'Account number unavailable'
+    lines[account] = ','.join('"{}"'.format(entry) for entry in row)
+    # the tolerant parser reports it as a malformed invoice
+    errors = []
+    invoices = list(parser.invoices(
+        stream=io.StringIO('\n'.join(lines) + '\n'), errors=errors, tolerant=True))
+    assert len(errors) == 1 and row[12] in errors[0].description
+    assert len(invoices) == len(expected) - 1
+
+    # but bugs in the parser are not mistaken for bad records, even when tolerant
+    broken = praxis.vendors.ecrs.reports.transactions()
+    broken.cardinfo = lambda **kwds: kwds['invoice'].nonexistent
+    try:
+        list(broken.invoices(stream=io.StringIO(journal), errors=[], tolerant=True))
+        assert False, 'unreachable'
+    except AttributeError:
+        pass
+
+    # all done
+    return
+
+
+# helpers
+def fields(line):
+    """
+    Split a journal {line} into its fields
+    """
+    # easy enough
+    return next(csv.reader([line]))
+
+
+def corrupt(lines, tid, description, field, value):
+    """
+    Find the line of invoice {tid} with the given {description}, replace its {field} with
+    {value}, and return its line number
+    """
+    # go through the lines
+    for idx, line in enumerate(lines):
+        # split
+        row = fields(line)
+        # if this is the one
+        if row[12] == tid and row[32] == description:
+            # replace the field
+            row[field] = value
+            # render
+            lines[idx] = ','.join('"{}"'.format(entry) for entry in row)
+            # and return the line number
+            return idx + 1
+    # if we get this far, the invoice is not there
+    raise KeyError(tid)
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file